@@ -37,6 +37,10 @@ ON pattern_detections(confidence DESC);
 CREATE INDEX IF NOT EXISTS idx_pattern_detections_symbol_pattern_time 
 ON pattern_detections(symbol, pattern_type, detected_at DESC);
 
+-- Time-range index backing the pattern_stats_24h refresh (index-only scan)
+CREATE INDEX IF NOT EXISTS pattern_detections_time_type_idx
+ON pattern_detections(detected_at, pattern_type) INCLUDE (confidence);
+
 -- JSONB index for metadata queries (if you query metadata often)
 CREATE INDEX IF NOT EXISTS idx_pattern_detections_metadata 
 ON pattern_detections USING GIN(metadata);
@@ -45,9 +49,10 @@ ON pattern_detections USING GIN(metadata);
 -- ALERTS TABLE INDEXES
 -- ============================================
 
--- Index for active alerts (most common query)
-CREATE INDEX IF NOT EXISTS idx_alerts_is_active 
-ON alerts(is_active) WHERE is_active = true;
+-- Index for active alerts (most common query): matches get_active_alerts'
+-- WHERE is_active ORDER BY created_at DESC LIMIT 50, so no sort is needed
+CREATE INDEX IF NOT EXISTS alerts_active_created_idx
+ON alerts(created_at DESC) WHERE is_active = true;
 
 -- Index for symbol queries
 CREATE INDEX IF NOT EXISTS idx_alerts_symbol 
@@ -62,6 +67,10 @@ CREATE INDEX IF NOT EXISTS idx_alerts_active_symbol
 ON alerts(symbol, is_active, created_at DESC) 
 WHERE is_active = true;
 
+-- Unique alert per (symbol, type, minute); alert INSERTs use ON CONFLICT DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS alerts_dedupe_ux
+ON alerts(symbol, alert_type, date_trunc('minute', created_at));
+
 -- Index for alert type filtering
 CREATE INDEX IF NOT EXISTS idx_alerts_alert_type 
 ON alerts(alert_type);
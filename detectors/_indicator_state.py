@@ -0,0 +1,173 @@
+"""
+_indicator_state.py
+
+Per-symbol streaming state for the daily indicator scan. The state covers
+the closed bars of a history; the live (still-forming) last bar is applied
+on read, so a poll that only moves the last bar costs O(1) instead of
+recomputing SMA/RSI/Bollinger/ATR over the whole history. Values match
+ta/pandas (Wilder RSI/ATR, population-std Bollinger Bands).
+"""
+
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+SMA_FAST = 20
+SMA_SLOW = 50
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+BB_WINDOW = 20
+BB_NDEV = 2.0
+VOL_WINDOW = 20
+
+
+class IndicatorState:
+    """Indicator accumulators over the closed bars of one symbol's history
+
+    key is the index label of the last closed bar; a history whose
+    second-to-last label differs from it needs advance() or a rebuild.
+    close_tail holds the closes folded into the window sums, so a refetch
+    with revised or split-adjusted bars under the same labels is detected.
+    """
+
+    def __init__(self, key: Any):
+        self.key = key
+        self.count = 0
+        self.prev_close = np.nan
+        # Last closes/volumes; windows never exceed SMA_SLOW bars
+        self.closes: deque = deque(maxlen=SMA_SLOW)
+        self.volumes: deque = deque(maxlen=VOL_WINDOW)
+        # Wilder RSI averages (EWM alpha=1/window, seeded at zero like ta)
+        self.avg_up = 0.0
+        self.avg_down = 0.0
+        # Sum of the first ATR_WINDOW true ranges, then the Wilder ATR
+        self.tr_sum = 0.0
+        self.atr = np.nan
+        self._tails: Dict[str, float] = {}
+        self.close_tail = np.empty(0)
+
+    @classmethod
+    def from_ohlcv(cls, ohlcv: np.ndarray, key: Any) -> 'IndicatorState':
+        """Build the state from closed bars (rows of Open, High, Low, Close, Volume)"""
+        state = cls(key)
+        for row in ohlcv:
+            state._push(float(row[1]), float(row[2]), float(row[3]), float(row[4]))
+        state._refresh_tails()
+        return state
+
+    def advance(self, bar: np.ndarray, key: Any) -> 'IndicatorState':
+        """New state with one more closed bar; self is left untouched for concurrent readers"""
+        state = IndicatorState(key)
+        state.count = self.count
+        state.prev_close = self.prev_close
+        state.closes = deque(self.closes, maxlen=SMA_SLOW)
+        state.volumes = deque(self.volumes, maxlen=VOL_WINDOW)
+        state.avg_up, state.avg_down = self.avg_up, self.avg_down
+        state.tr_sum, state.atr = self.tr_sum, self.atr
+        state._push(float(bar[1]), float(bar[2]), float(bar[3]), float(bar[4]))
+        state._refresh_tails()
+        return state
+
+    def _push(self, high: float, low: float, close: float, volume: float) -> None:
+        if self.count == 0:
+            tr = high - low
+            up = down = 0.0
+        else:
+            prev = self.prev_close
+            tr = max(high - low, abs(high - prev), abs(low - prev))
+            d = close - prev
+            up = d if d > 0 else 0.0
+            down = -d if d < 0 else 0.0
+        alpha = 1.0 / RSI_WINDOW
+        if self.count == 0:
+            self.avg_up, self.avg_down = up, down
+        else:
+            self.avg_up = (1.0 - alpha) * self.avg_up + alpha * up
+            self.avg_down = (1.0 - alpha) * self.avg_down + alpha * down
+        if self.count < ATR_WINDOW:
+            self.tr_sum += tr
+            if self.count == ATR_WINDOW - 1:
+                self.atr = self.tr_sum / ATR_WINDOW
+        else:
+            self.atr = (self.atr * (ATR_WINDOW - 1) + tr) / ATR_WINDOW
+        self.count += 1
+        self.prev_close = close
+        self.closes.append(close)
+        self.volumes.append(volume)
+
+    def _refresh_tails(self) -> None:
+        """Window sums over the closed tail that the live bar completes (recomputed once per closed bar)"""
+        closes = np.fromiter(self.closes, dtype=np.float64, count=len(self.closes))
+        volumes = np.fromiter(self.volumes, dtype=np.float64, count=len(self.volumes))
+        self.close_tail = closes
+        fast = closes[-(SMA_FAST - 1):]
+        self._tails = {
+            'fast_sum': float(fast.sum()),
+            'fast_sq_sum': float((fast * fast).sum()),
+            'slow_sum': float(closes[-(SMA_SLOW - 1):].sum()),
+            'vol_sum': float(volumes[-(VOL_WINDOW - 1):].sum()),
+            'sma_fast_prev': float(closes[-SMA_FAST:].mean()) if len(closes) >= SMA_FAST else np.nan,
+            'sma_slow_prev': float(closes.mean()) if len(closes) >= SMA_SLOW else np.nan,
+        }
+
+    def covers(self, closes: np.ndarray) -> bool:
+        """True if closes (ending at this state's last closed bar) ends with the closes it was built from"""
+        k = self.close_tail.shape[0]
+        return closes.shape[0] >= k and np.array_equal(closes[closes.shape[0] - k:], self.close_tail)
+
+    def live(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Indicator values with the live bar appended (NaN where a window has not filled)"""
+        t = self._tails
+        n = self.count + 1
+        sma_fast = (t['fast_sum'] + close) / SMA_FAST if n >= SMA_FAST else np.nan
+        sma_slow = (t['slow_sum'] + close) / SMA_SLOW if n >= SMA_SLOW else np.nan
+        bb_upper = np.nan
+        if n >= BB_WINDOW:
+            mean_sq = (t['fast_sq_sum'] + close * close) / BB_WINDOW
+            bb_upper = sma_fast + BB_NDEV * np.sqrt(max(mean_sq - sma_fast * sma_fast, 0.0))
+
+        rsi = np.nan
+        if self.count and n >= RSI_WINDOW:
+            d = close - self.prev_close
+            alpha = 1.0 / RSI_WINDOW
+            avg_up = (1.0 - alpha) * self.avg_up + alpha * (d if d > 0 else 0.0)
+            avg_down = (1.0 - alpha) * self.avg_down + alpha * (-d if d < 0 else 0.0)
+            rsi = 100.0 if avg_down == 0.0 else 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+        atr = np.nan
+        if self.count:
+            prev = self.prev_close
+            tr = max(high - low, abs(high - prev), abs(low - prev))
+            if self.count >= ATR_WINDOW:
+                atr = (self.atr * (ATR_WINDOW - 1) + tr) / ATR_WINDOW
+            elif n == ATR_WINDOW:
+                atr = (self.tr_sum + tr) / ATR_WINDOW
+
+        return {
+            'sma_fast': sma_fast,
+            'sma_fast_prev': t['sma_fast_prev'],
+            'sma_slow': sma_slow,
+            'sma_slow_prev': t['sma_slow_prev'],
+            'rsi': rsi,
+            'bb_upper': bb_upper,
+            'atr': atr,
+            'vol_ma': (t['vol_sum'] + volume) / VOL_WINDOW if n >= VOL_WINDOW else np.nan,
+        }
+
+
+def sync_state(state: Optional[IndicatorState], ohlcv: np.ndarray, index) -> IndicatorState:
+    """State for ohlcv[:-1]: reuse it, advance it by one closed bar, or rebuild from the batch
+
+    index holds the bar labels of ohlcv. Anything other than the same closed
+    bar or exactly one newer one (a gap, a different history), or closes that
+    no longer match the state's window (revised/adjusted bars), rebuilds.
+    """
+    closed_key = index[-2]
+    closes = ohlcv[:, 3]
+    if state is not None:
+        if state.key == closed_key and state.covers(closes[:-1]):
+            return state
+        if len(index) >= 3 and state.key == index[-3] and state.covers(closes[:-2]):
+            return state.advance(ohlcv[-2], closed_key)
+    return IndicatorState.from_ohlcv(ohlcv[:-1], closed_key)
@@ -0,0 +1,105 @@
+"""
+_pattern_njit.py
+
+Numba-compiled kernels for the daily indicator pattern scan, the SMA
+series used by the backtester and the final Wilder ATR. The daily scan's
+other indicators are maintained incrementally in _indicator_state.
+numba is optional: without it the decorator is a no-op and the kernels
+run as regular Python over NumPy arrays. Kernels are compiled nogil,
+which only matters when they are called from real OS threads (not under
+the gevent worker).
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and parameterized use)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Indexes into the flag array returned by scan_last_bar
+GOLDEN_CROSS = 0
+RSI_OVERSOLD = 1
+RSI_OVERBOUGHT = 2
+BOLLINGER_BREAKOUT = 3
+
+
+@njit(cache=True, nogil=True)
+def scan_last_bar(close, sma20, sma50, rsi, bb_upper):
+    """
+    Evaluate the indicator patterns on the most recent bar.
+
+    All inputs are float64 arrays of equal length (NaN where an indicator
+    has not warmed up; NaN comparisons are False). Returns a boolean array
+    indexed by GOLDEN_CROSS, RSI_OVERSOLD, RSI_OVERBOUGHT, BOLLINGER_BREAKOUT.
+    """
+    flags = np.zeros(4, dtype=np.bool_)
+    n = close.shape[0]
+    if n == 0:
+        return flags
+    i = n - 1
+    j = i - 1 if n > 1 else i
+
+    if sma20[i] > sma50[i] and sma20[j] <= sma50[j]:
+        flags[GOLDEN_CROSS] = True
+    if rsi[i] < 30.0:
+        flags[RSI_OVERSOLD] = True
+    elif rsi[i] > 70.0:
+        flags[RSI_OVERBOUGHT] = True
+    if close[i] > bb_upper[i]:
+        flags[BOLLINGER_BREAKOUT] = True
+    return flags
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(x, window):
+    """Simple moving average; NaN until `window` values (or if any is NaN), like pandas rolling().mean()
+
+    O(n) boxcar over cumulative sums; NaNs are zeroed in the sum and counted separately
+    so a window containing one is still reported as NaN.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    nan_mask = np.isnan(x)
+    csum = np.zeros(n + 1)
+    csum[1:] = np.cumsum(np.where(nan_mask, 0.0, x))
+    nan_count = np.zeros(n + 1, dtype=np.int64)
+    nan_count[1:] = np.cumsum(nan_mask.astype(np.int64))
+    means = (csum[window:] - csum[:-window]) / window
+    means[(nan_count[window:] - nan_count[:-window]) > 0] = np.nan
+    out[window - 1:] = means
+    return out
+
+
+@njit(cache=True, nogil=True)
+def atr_last(high, low, close, window):
+    """Final Wilder ATR (ta.volatility.AverageTrueRange) in one pass without the true-range/ATR arrays
+
+    Like ta, the first true range is high - low. NaN when there are fewer than `window` bars.
+    """
+    n = close.shape[0]
+    if n < window:
+        return np.nan
+    total = high[0] - low[0]
+    for i in range(1, window):
+        prev_close = close[i - 1]
+        total += max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+    atr = total / window
+    for i in range(window, n):
+        prev_close = close[i - 1]
+        tr = max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+        atr = (atr * (window - 1) + tr) / window
+    return atr
@@ -5,6 +5,20 @@ Production-ready Flask backend with real data integration
 """
 
 import os
+
+# Cooperative I/O must patch the stdlib before any socket/threading imports.
+# gunicorn's gevent worker patches on its own; `python main.py` defaults to gevent when installed.
+_ASYNC_MODE = os.getenv('SOCKETIO_ASYNC_MODE', '').lower()
+if _ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif _ASYNC_MODE == 'gevent' or (not _ASYNC_MODE and __name__ == '__main__'):
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError:
+        pass
+
 import sys
 import json
 import time
@@ -12,12 +26,16 @@ import random
 import logging
 import asyncio
 import threading
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict
-from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import traceback
+import itertools
+from collections import OrderedDict, deque
 import hmac
+import gzip
 import hashlib
 import base64
 import uuid
@@ -27,7 +45,7 @@ import uuid
 from flask import Flask, request, jsonify, render_template, Response
 import re
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
@@ -50,17 +68,23 @@ except ImportError:
 
 import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
-from textblob import TextBlob
 import ta
 import csv
 from io import StringIO
 from zoneinfo import ZoneInfo
 from services.sentiment_analyzer import sentiment_analyzer as tx_sentiment_analyzer
 from services.backtesting_engine import backtest_engine
-from services.http_resilience import resilient_http_get, CircuitBreaker
+from services.http_resilience import resilient_http_get, CircuitBreaker, TokenBucket
 from services.outcome_logging import summarize_outcomes, log_outcome, ensure_tables
+from services import json_codec
+from services.json_codec import ORJSONProvider
+from services.response_cache import response_cache
+from services.market_data_async import AsyncQuoteFetcher
+from services.provider_quotes import finnhub_quote_from_json, polygon_quote_from_agg, polygon_results
 
 
 from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
@@ -80,14 +104,60 @@ except ImportError:
     SENTRY_AVAILABLE = False
     logger.warning("Sentry SDK not available. Install with: pip install sentry-sdk[flask]")
 
+# Response compression (optional)
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Incremental JSON parsing of large Polygon aggregate bodies (optional). The pure-Python
+# backend is slower than json.loads, so streaming is only used with a compiled one.
+try:
+    import ijson
+    IJSON_AVAILABLE = ijson.backend in ('yajl2_c', 'yajl2_cffi', 'yajl2')
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+# Bounded TTL cache for market data (optional; falls back to a pruned dict)
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
 # Modular pattern detection (AI + registry)
 from detectors.ai_pattern_logic import detect_all_patterns
+from detectors._pattern_njit import (
+    scan_last_bar, rolling_mean, atr_last,
+    GOLDEN_CROSS, RSI_OVERSOLD, RSI_OVERBOUGHT, BOLLINGER_BREAKOUT
+)
+from detectors._indicator_state import IndicatorState, sync_state
 try:
     from pattern_watchlist import prioritized_patterns
 except Exception:
     # Fallback if watchlist module is missing
     prioritized_patterns = []
 
+# Watchlist lowercased once; the per-pattern boosts test these instead of re-lowering every entry
+_PRIORITY_LOWER = tuple(p.lower() for p in prioritized_patterns)
+PRIORITY_GOLDEN = any('golden' in p for p in _PRIORITY_LOWER)
+PRIORITY_RSI_OVERSOLD = any('rsi' in p and 'oversold' in p for p in _PRIORITY_LOWER)
+PRIORITY_RSI_OVERBOUGHT = any('rsi' in p and 'overbought' in p for p in _PRIORITY_LOWER)
+PRIORITY_BOLLINGER = any('bollinger' in p for p in _PRIORITY_LOWER)
+
+
+@lru_cache(maxsize=256)
+def is_prioritized(name: str) -> bool:
+    """True if the pattern name is part of a watchlist entry (case-insensitive)"""
+    name = (name or '').lower()
+    return any(name in p for p in _PRIORITY_LOWER)
+
 # Environment and configuration
 from dotenv import load_dotenv
 load_dotenv()
@@ -112,12 +182,40 @@ try:
 except Exception:
     pass
 
-# Timezone helper (Uganda/EAT)
-def to_eat_iso(dt: datetime) -> str:
-    try:
-        return dt.astimezone(ZoneInfo("Africa/Kampala")).isoformat()
-    except Exception:
-        return dt.isoformat()
+# Response timestamps: formatted at most once per second and shared by all requests
+_now_iso_cache: Tuple[int, str] = (0, '')
+
+def now_iso() -> str:
+    """Current local time as an ISO string at second resolution"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, text = _now_iso_cache
+    if cached_second != second:
+        text = datetime.fromtimestamp(second).isoformat()
+        _now_iso_cache = (second, text)
+    return text
+
+_utcnow_iso_cache: Tuple[int, str] = (0, '')
+
+def utcnow_iso() -> str:
+    """Current naive UTC time as an ISO string at second resolution (provider quote timestamps)"""
+    global _utcnow_iso_cache
+    second = int(time.time())
+    cached_second, text = _utcnow_iso_cache
+    if cached_second != second:
+        text = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        _utcnow_iso_cache = (second, text)
+    return text
+
+# Timezone helper (Uganda/EAT); resolved once. EAT has no DST, so a fixed +03:00 offset is the fallback
+try:
+    EAT = ZoneInfo("Africa/Kampala")
+except Exception:
+    EAT = timezone(timedelta(hours=3))
+
+def eat_now_iso() -> str:
+    """Current time in EAT as an ISO string (aware now(), no naive-to-local conversion)"""
+    return datetime.now(EAT).isoformat()
 
 # Configuration
 class Config:
@@ -141,12 +239,34 @@ class Config:
     DEBUG = FLASK_ENV == 'development'
     # Assume PgBouncer on Render; can disable explicitly if needed
     USE_PGBOUNCER = os.getenv('USE_PGBOUNCER', 'true').lower() == 'true'
+    # SQLAlchemy pool sizing when connecting directly (USE_PGBOUNCER=false)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '300'))
+    # Let psycopg prepare repeated statements (plan caching). Safe on direct connections and on
+    # PgBouncer >= 1.21 with max_prepared_statements set; off by default for older poolers.
+    DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'false').lower() == 'true'
+    # Gunicorn worker processes (gunicorn.conf.py reads the same variable)
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+    # Shared rate-limit store; only consulted when more than one worker serves requests
+    RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
     
     # Background workers
     ENABLE_BACKGROUND_WORKERS = os.getenv('ENABLE_BACKGROUND_WORKERS', 'true').lower() == 'true'
+    # Run the market scanner in this process; disable on web replicas when worker.py runs it
+    RUN_SCANNER = os.getenv('RUN_SCANNER', 'true').lower() in ('1', 'true')
     # Reduce default scan frequency to ease provider pressure
     BACKEND_SCAN_INTERVAL = int(os.getenv('BACKEND_SCAN_INTERVAL', '300'))  # 5 minutes default
     CACHE_DURATION = int(os.getenv('CACHE_DURATION', '60'))  # 1 minute
+    # Fetch market scan Finnhub/Polygon quotes on an asyncio loop (services/market_data_async.py);
+    # only honoured in 'threading' mode, not under gevent/eventlet workers
+    ASYNC_PROVIDERS = os.getenv('ASYNC_PROVIDERS', 'false').lower() in ('1', 'true')
+    # Daily history is re-fetched after this many seconds; in between only the last bar is updated
+    HISTORY_REFRESH_SECONDS = int(os.getenv('HISTORY_REFRESH_SECONDS', '1800'))
+    # Refresh interval of the pattern_stats_24h materialized view (scanner loop and stale reads)
+    PATTERN_STATS_REFRESH_SECONDS = int(os.getenv('PATTERN_STATS_REFRESH_SECONDS', '60'))
+    # Detected daily patterns are reused for this many seconds per symbol
+    PATTERN_CACHE_SECONDS = int(os.getenv('PATTERN_CACHE_SECONDS', '30'))
     # Comma-separated list of symbols to scan (supports stocks, crypto, forex)
     SCAN_SYMBOLS = os.getenv(
         'SCAN_SYMBOLS',
@@ -173,8 +293,19 @@ class Config:
     # Trading settings
     PAPER_TRADING_ENABLED = os.getenv('ENABLE_PAPER_TRADING', 'true').lower() == 'true'
     ALERT_CONFIDENCE_THRESHOLD = float(os.getenv('ALERT_CONFIDENCE_THRESHOLD', '0.85'))
+    # In-memory alert fallback kept when the DB is unavailable (oldest evicted first)
+    ACTIVE_ALERTS_MAX = int(os.getenv('ACTIVE_ALERTS_MAX', '1000'))
     # Risk confirmation gating for executions
     REQUIRE_RISK_CONFIRMATION = os.getenv('REQUIRE_RISK_CONFIRMATION', 'false').lower() == 'true'
+    # Realtime: 'threading', 'eventlet' or 'gevent'; unset follows the stdlib patching done at import
+    SOCKETIO_ASYNC_MODE = _ASYNC_MODE or None
+    # Redis URL used as Socket.IO message queue so emits reach clients on every worker.
+    # Explicit opt-in: REDIS_URL (caching/rate limits) does not enable it
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE') or None
+    # Migration switch: also emit the per-alert 'new_alert'/'pattern_alert' and 'market_scan_update'
+    # frames alongside the batched 'scan_tick'/'pattern_alerts'. Off by default; enable only until
+    # clients still listening for the old events are migrated
+    EMIT_LEGACY_SOCKET_EVENTS = os.getenv('EMIT_LEGACY_SOCKET_EVENTS', 'false').lower() == 'true'
     # Observability & Docs
     ENABLE_METRICS = os.getenv('ENABLE_METRICS', 'true').lower() == 'true'
     ENABLE_OPENAPI = os.getenv('ENABLE_OPENAPI', 'true').lower() == 'true'
@@ -186,6 +317,9 @@ class Config:
     SENTRY_ENVIRONMENT = os.getenv('SENTRY_ENVIRONMENT', 'production')
     SENTRY_TRACES_SAMPLE_RATE = float(os.getenv('SENTRY_TRACES_SAMPLE_RATE', '0.1'))
 
+# Scan universe parsed once from Config.SCAN_SYMBOLS (order kept, blanks and duplicates dropped)
+SCAN_SYMBOLS: Tuple[str, ...] = tuple(dict.fromkeys(s.strip() for s in Config.SCAN_SYMBOLS.split(',') if s.strip()))
+
 # --------------------------------------
 # Prometheus metrics
 # --------------------------------------
@@ -212,6 +346,14 @@ if SENTRY_AVAILABLE and Config.SENTRY_DSN:
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = ORJSONProvider(app)
+if COMPRESS_AVAILABLE:
+    # Brotli-4 is cheaper than gzip-6 at a similar ratio on JSON; tiny bodies are not worth it
+    app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+    app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+    app.config.setdefault('COMPRESS_LEVEL', 4)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 512)
+    Compress(app)
 
 # Note: All API endpoints are defined directly in main.py (no separate routes/ folder)
 # See below for all @app.route('/api/*') definitions
@@ -234,23 +376,70 @@ else:
     ]
     socketio_origins = cors_origins
 
+def _compile_cors_origins(origins: List[str]) -> List[Any]:
+    """Compile regex-style CORS entries once, anchored at both ends.
+    flask-cors would otherwise re.match() the raw string on every request, which only
+    anchors the start (https://.*[.]example[.]com also matched https://x.example.com.evil.net).
+    Literal origins and the '*' wildcard are passed through unchanged.
+    """
+    compiled = []
+    for origin in origins:
+        if origin != '*' and any(c in origin for c in '*\\]?$^[()'):
+            origin = re.compile(rf"(?:{origin})\Z", re.IGNORECASE)
+        compiled.append(origin)
+    return compiled
+
 cors = CORS(
     app,
-    origins=cors_origins,
+    origins=_compile_cors_origins(cors_origins),
     supports_credentials=True,
     allow_headers=["Content-Type", "Authorization"],
     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
 )
+def _socketio_async_mode() -> str:
+    """Pick the Socket.IO async mode matching the server we run under"""
+    if Config.SOCKETIO_ASYNC_MODE:
+        return Config.SOCKETIO_ASYNC_MODE
+    try:
+        from gevent import monkey
+        # gunicorn's gevent workers patch the stdlib; use real WebSocket transport there
+        if monkey.is_module_patched('socket'):
+            return 'gevent'
+    except ImportError:
+        pass
+    return 'threading'
+
 socketio = SocketIO(
     app, 
     cors_allowed_origins=socketio_origins, 
-    async_mode='threading',
+    async_mode=_socketio_async_mode(),
+    message_queue=Config.SOCKETIO_MESSAGE_QUEUE,
+    json=json_codec,
     logger=True,
     engineio_logger=True
 )
+# Socket.IO rooms joined by the subscribe_* events; pushes go only to subscribers
+ALERTS_ROOM = 'alerts'
+SCAN_RESULTS_ROOM = 'scan_results'
+PORTFOLIO_ROOM = 'portfolio'
+POSITIONS_ROOM = 'positions'
+
+def _ratelimit_storage_uri() -> str:
+    """In-process counters for a single worker, the configured shared store otherwise"""
+    if Config.WEB_CONCURRENCY <= 1:
+        return 'memory://'
+    return Config.RATELIMIT_STORAGE_URI
+
+
+_RATELIMIT_STORAGE = _ratelimit_storage_uri()
 limiter = Limiter(
     key_func=get_remote_address,
-    storage_uri=os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
+    storage_uri=_RATELIMIT_STORAGE,
+    # moving-window is cheap in memory but costs a sorted-set update per hit on Redis;
+    # shared stores keep the fixed-window counter
+    strategy='moving-window' if _RATELIMIT_STORAGE.startswith('memory://') else 'fixed-window',
+    # Keep serving with per-process limits if the shared store is unreachable
+    in_memory_fallback_enabled=True
 )
 limiter.init_app(app)
 
@@ -306,25 +495,29 @@ def init_database():
                 db_url = db_url.replace('postgresql://', 'postgresql+psycopg://')
             if db_url.startswith('postgres://'):
                 db_url = db_url.replace('postgres://', 'postgresql+psycopg://', 1)
-            # Ensure prepare_threshold=0 in URL for PgBouncer compatibility
-            if 'postgresql+psycopg://' in db_url and 'prepare_threshold=' not in db_url:
+            # Disable server-side prepared statements unless the pooler supports them
+            prepare = Config.DB_PREPARED_STATEMENTS
+            if not prepare and 'postgresql+psycopg://' in db_url and 'prepare_threshold=' not in db_url:
                 sep = '&' if '?' in db_url else '?'
                 db_url = f"{db_url}{sep}prepare_threshold=0"
 
             _connect_args = {"sslmode": "require"} if db_url.startswith('postgresql') else {}
-            if '+psycopg' in db_url:
+            if '+psycopg' in db_url and not prepare:
                 _connect_args["prepare_threshold"] = None
 
             _poolclass = NullPool if Config.USE_PGBOUNCER else QueuePool
+            # No pre-ping: it costs a SELECT 1 round trip on every checkout. NullPool connections
+            # are always fresh (PgBouncer validates its server connections via server_check_query),
+            # and pooled ones are recycled before server/proxy idle timeouts.
             engine_kwargs = {
                 'poolclass': _poolclass,
-                'pool_pre_ping': True,
-                'pool_recycle': 1800,
+                'pool_pre_ping': False,
                 'connect_args': _connect_args
             }
             if _poolclass is QueuePool:
-                engine_kwargs['pool_size'] = 2
-                engine_kwargs['max_overflow'] = 0
+                engine_kwargs['pool_size'] = Config.DB_POOL_SIZE
+                engine_kwargs['max_overflow'] = Config.DB_MAX_OVERFLOW
+                engine_kwargs['pool_recycle'] = Config.DB_POOL_RECYCLE
 
             engine = create_engine(db_url, **engine_kwargs)
             with engine.connect() as conn:
@@ -408,44 +601,206 @@ def verify_supabase_jwt(auth_header: Optional[str]) -> Optional[Dict[str, Any]]:
 # --------------------------------------
 # Helper utilities (symbol normalization)
 # --------------------------------------
+_CRYPTO_SYMBOLS = frozenset({"BTC", "BTC-USD", "X:BTCUSD", "BITCOIN", "ETH", "ETH-USD", "X:ETHUSD", "ETHEREUM"})
+
+# User symbol (upper-cased) -> yfinance ticker, built once instead of per call
+_YF_SYMBOL_ALIASES = {
+    # --- Crypto mappings ---
+    **dict.fromkeys(("BTC", "BTC-USD", "X:BTCUSD", "BITCOIN", "BTCUSD"), "BTC-USD"),
+    **dict.fromkeys(("ETH", "ETH-USD", "X:ETHUSD", "ETHEREUM", "ETHUSD"), "ETH-USD"),
+    **dict.fromkeys(("SOL", "SOL-USD", "X:SOLUSD", "SOLUSD"), "SOL-USD"),
+    **dict.fromkeys(("ADA", "ADA-USD", "X:ADAUSD", "ADAUSD"), "ADA-USD"),
+    # --- Forex mappings (Yahoo format uses =X) ---
+    **dict.fromkeys(("EUR/USD", "EURUSD", "FX:EURUSD"), "EURUSD=X"),
+    **dict.fromkeys(("GBP/USD", "GBPUSD", "FX:GBPUSD"), "GBPUSD=X"),
+    **dict.fromkeys(("USD/JPY", "USDJPY", "FX:USDJPY"), "USDJPY=X"),
+    **dict.fromkeys(("USD/CHF", "USDCHF", "FX:USDCHF"), "USDCHF=X"),
+}
+
+def candles_from_frame(hist: pd.DataFrame, time_key: str = 'time') -> List[Dict[str, Any]]:
+    """OHLCV frame -> candle dicts for the detectors registry and /api/candles (column arrays, no per-row Series)"""
+    ohlc = hist[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64).tolist()
+    volumes = np.nan_to_num(hist['Volume'].to_numpy(dtype=np.float64)).astype(np.int64).tolist()
+    if isinstance(hist.index, pd.DatetimeIndex):
+        # datetime.isoformat is C-level; Timestamp.isoformat formats each field in Python
+        times = [dt.isoformat() for dt in hist.index.to_pydatetime()]
+    else:
+        times = [ts.isoformat() if hasattr(ts, 'isoformat') else str(ts) for ts in hist.index]
+    return [
+        {time_key: t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+        for t, (o, h, l, c), v in zip(times, ohlc, volumes)
+    ]
+
+def frame_atr_last(hist: pd.DataFrame, window: int = 14) -> float:
+    """Final Wilder ATR of an OHLC frame from per-column views (no frame copy, no ATR series)"""
+    high, low, close = (hist[c].to_numpy(dtype=np.float64, copy=False) for c in ('High', 'Low', 'Close'))
+    return float(atr_last(high, low, close, window))
+
+def _risk_suggestions(entry: float, atr: Optional[float], side: str, conf: float,
+                      hi: float = 2.0, lo: float = 1.5) -> Dict[str, Any]:
+    """ATR-based stop/target for a daily pattern: stop 1.5 ATR away, target `hi` ATR when conf >= 0.8 else `lo`"""
+    if not atr or np.isnan(atr):
+        return {'entry': entry, 'stop_loss': None, 'take_profit': None, 'rr': None}
+    mult = hi if conf >= 0.8 else lo
+    sign = 1.0 if side == 'BUY' else -1.0
+    return {
+        'entry': entry,
+        'stop_loss': round(entry - sign * 1.5 * atr, 6),
+        'take_profit': round(entry + sign * mult * atr, 6),
+        'rr': round(mult / 1.5, 2)
+    }
+
+def _intraday_risk_suggestions(entry: float, atr: Optional[float], side: str) -> Optional[Dict[str, Any]]:
+    """ATR-based stop/target for an intraday pattern: stop 1 ATR away, target 1.5 ATR (None without ATR)"""
+    if atr is None or np.isnan(atr):
+        return None
+    sign = 1.0 if side == 'BUY' else -1.0
+    return {
+        'entry': entry,
+        'stop_loss': round(entry - sign * atr, 6),
+        'take_profit': round(entry + sign * 1.5 * atr, 6),
+        'rr': 1.5
+    }
+
+# Symbols come from a small closed set (scan list, watchlists), so results are memoized
+@lru_cache(maxsize=1024)
 def is_crypto_symbol(symbol: str) -> bool:
-    s = (symbol or '').upper()
-    return s in {"BTC", "BTC-USD", "X:BTCUSD", "BITCOIN", "ETH", "ETH-USD", "X:ETHUSD", "ETHEREUM"}
+    return (symbol or '').upper() in _CRYPTO_SYMBOLS
 
+@lru_cache(maxsize=1024)
 def normalize_symbol_for_yf(symbol: str) -> str:
     """Map user symbol to yfinance-compatible ticker, supporting crypto and forex pairs."""
     s = (symbol or '').upper()
-    # --- Crypto mappings ---
-    if s in {"BTC", "BTC-USD", "X:BTCUSD", "BITCOIN", "BTCUSD"}:
-        return "BTC-USD"
-    if s in {"ETH", "ETH-USD", "X:ETHUSD", "ETHEREUM", "ETHUSD"}:
-        return "ETH-USD"
-    if s in {"SOL", "SOL-USD", "X:SOLUSD", "SOLUSD"}:
-        return "SOL-USD"
-    if s in {"ADA", "ADA-USD", "X:ADAUSD", "ADAUSD"}:
-        return "ADA-USD"
-
-    # --- Forex mappings (Yahoo format uses =X) ---
-    forex_map = {
-        "EUR/USD": "EURUSD=X",
-        "EURUSD": "EURUSD=X",
-        "FX:EURUSD": "EURUSD=X",
-        "GBP/USD": "GBPUSD=X",
-        "GBPUSD": "GBPUSD=X",
-        "FX:GBPUSD": "GBPUSD=X",
-        "USD/JPY": "USDJPY=X",
-        "USDJPY": "USDJPY=X",
-        "FX:USDJPY": "USDJPY=X",
-        "USD/CHF": "USDCHF=X",
-        "USDCHF": "USDCHF=X",
-        "FX:USDCHF": "USDCHF=X",
-    }
-    if s in forex_map:
-        return forex_map[s]
-    return s
+    return _YF_SYMBOL_ALIASES.get(s, s)
 
  
 
+# Schema bootstrap run by create_tables, in order
+_SCHEMA_DDL = (
+    # Create tables for pattern detections
+    """
+        CREATE TABLE IF NOT EXISTS pattern_detections (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(10) NOT NULL,
+            pattern_type VARCHAR(50) NOT NULL,
+            confidence FLOAT NOT NULL,
+            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            price FLOAT,
+            volume BIGINT,
+            metadata JSONB
+        )
+    """,
+
+    # Create tables for paper trades
+    """
+        CREATE TABLE IF NOT EXISTS paper_trades (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(10) NOT NULL,
+            side VARCHAR(10) NOT NULL,
+            quantity FLOAT NOT NULL,
+            price FLOAT NOT NULL,
+            executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status VARCHAR(20) DEFAULT 'open',
+            pnl FLOAT DEFAULT 0,
+            pattern VARCHAR(50),
+            confidence FLOAT
+        )
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS paper_trades_status_symbol_idx
+        ON paper_trades (status, symbol)
+    """,
+
+    # Create tables for alerts
+    """
+        CREATE TABLE IF NOT EXISTS alerts (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(10) NOT NULL,
+            alert_type VARCHAR(50) NOT NULL,
+            message TEXT NOT NULL,
+            confidence FLOAT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT true,
+            metadata JSONB
+        )
+    """,
+    # Ensure processed flag exists for auto-labeling idempotency
+    """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='alerts' AND column_name='processed'
+            ) THEN
+                ALTER TABLE alerts ADD COLUMN processed BOOLEAN DEFAULT false;
+            END IF;
+        END$$;
+    """,
+    # Partial index matching get_active_alerts (WHERE is_active ORDER BY created_at DESC);
+    # fillfactor leaves room for HOT updates when alerts are dismissed
+    """
+        CREATE INDEX IF NOT EXISTS alerts_active_created_idx
+        ON alerts (created_at DESC) WHERE is_active = true
+    """,
+    # Only when not already set: ALTER TABLE takes a table lock and this runs at every process start
+    """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_class
+                WHERE oid = 'alerts'::regclass AND 'fillfactor=90' = ANY(reloptions)
+            ) THEN
+                ALTER TABLE alerts SET (fillfactor = 90);
+            END IF;
+        END$$;
+    """,
+    # One alert per (symbol, type, minute); alert INSERTs use ON CONFLICT DO NOTHING against it.
+    # Skipped (not fatal) on databases that already hold duplicates
+    """
+        DO $$
+        BEGIN
+            CREATE UNIQUE INDEX IF NOT EXISTS alerts_dedupe_ux
+            ON alerts (symbol, alert_type, date_trunc('minute', created_at));
+        EXCEPTION WHEN unique_violation THEN
+            RAISE NOTICE 'alerts_dedupe_ux not created: existing duplicate alerts';
+        END$$;
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS pattern_detections_symbol_time_idx
+        ON pattern_detections (symbol, detected_at DESC)
+    """,
+    # 24h per-pattern stats, refreshed by the scanner process and on read when stale
+    # (see refresh_pattern_stats_view).
+    # The unique index is required for REFRESH ... CONCURRENTLY; the time index keeps the
+    # refresh an index-only range scan (NOW() cannot appear in a partial index predicate).
+    """
+        CREATE INDEX IF NOT EXISTS pattern_detections_time_type_idx
+        ON pattern_detections (detected_at, pattern_type) INCLUDE (confidence)
+    """,
+    """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS pattern_stats_24h AS
+        SELECT pattern_type, COUNT(*) AS count, AVG(confidence) AS avg_confidence
+        FROM pattern_detections
+        WHERE detected_at > NOW() - INTERVAL '24 hours'
+        GROUP BY pattern_type
+    """,
+    """
+        CREATE UNIQUE INDEX IF NOT EXISTS pattern_stats_24h_type_idx
+        ON pattern_stats_24h (pattern_type)
+    """,
+
+    # Create table for ML predictions logging used by services.ml_patterns
+    """
+        CREATE TABLE IF NOT EXISTS model_predictions (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(32) NOT NULL,
+            prediction FLOAT NOT NULL,
+            actual INT NULL,
+            predicted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+)
+
 def create_tables():
     """Create necessary database tables"""
     if not db_available:
@@ -453,80 +808,92 @@ def create_tables():
         
     try:
         with engine.connect() as conn:
-            # Create tables for pattern detections
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS pattern_detections (
-                    id SERIAL PRIMARY KEY,
-                    symbol VARCHAR(10) NOT NULL,
-                    pattern_type VARCHAR(50) NOT NULL,
-                    confidence FLOAT NOT NULL,
-                    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    price FLOAT,
-                    volume BIGINT,
-                    metadata JSONB
-                )
-            """))
-            
-            # Create tables for paper trades
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS paper_trades (
-                    id SERIAL PRIMARY KEY,
-                    symbol VARCHAR(10) NOT NULL,
-                    side VARCHAR(10) NOT NULL,
-                    quantity FLOAT NOT NULL,
-                    price FLOAT NOT NULL,
-                    executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status VARCHAR(20) DEFAULT 'open',
-                    pnl FLOAT DEFAULT 0,
-                    pattern VARCHAR(50),
-                    confidence FLOAT
-                )
-            """))
-            
-            # Create tables for alerts
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS alerts (
-                    id SERIAL PRIMARY KEY,
-                    symbol VARCHAR(10) NOT NULL,
-                    alert_type VARCHAR(50) NOT NULL,
-                    message TEXT NOT NULL,
-                    confidence FLOAT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT true,
-                    metadata JSONB
-                )
-            """))
-            # Ensure processed flag exists for auto-labeling idempotency
-            conn.execute(text("""
-                DO $$
-                BEGIN
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns
-                        WHERE table_name='alerts' AND column_name='processed'
-                    ) THEN
-                        ALTER TABLE alerts ADD COLUMN processed BOOLEAN DEFAULT false;
-                    END IF;
-                END$$;
-            """))
-
-            # Create table for ML predictions logging used by services.ml_patterns
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS model_predictions (
-                    id SERIAL PRIMARY KEY,
-                    symbol VARCHAR(32) NOT NULL,
-                    prediction FLOAT NOT NULL,
-                    actual INT NULL,
-                    predicted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-
-            conn.commit()
+            raw = conn.connection.driver_connection
+            if hasattr(raw, 'pipeline'):
+                # psycopg 3: send every statement in one pipeline instead of a round trip each
+                with raw.pipeline():
+                    for statement in _SCHEMA_DDL:
+                        raw.execute(statement)
+                raw.commit()
+            else:
+                for statement in _SCHEMA_DDL:
+                    conn.execute(text(statement))
+                conn.commit()
             logger.info("Database tables created/verified successfully")
         
     except Exception as e:
         logger.error(f"Failed to create tables: {e}")
+# Prepared SQL statements used by the services below (built once at import)
+SELECT_PORTFOLIO = text("""
+    SELECT symbol,
+           SUM(CASE WHEN side = 'BUY' THEN quantity ELSE -quantity END) AS quantity,
+           SUM(price * quantity * CASE WHEN side = 'BUY' THEN 1 ELSE -1 END)
+               / NULLIF(SUM(CASE WHEN side = 'BUY' THEN quantity ELSE -quantity END), 0) AS avg_entry,
+           SUM(pnl) AS pnl,
+           (ARRAY_AGG(pattern ORDER BY executed_at))[1] AS pattern,
+           (ARRAY_AGG(confidence ORDER BY executed_at))[1] AS confidence,
+           MAX(executed_at) AS last_update
+    FROM paper_trades WHERE status = 'open'
+    GROUP BY symbol
+""")
+INSERT_TRADE = text("""
+    INSERT INTO tx.paper_trades (symbol, side, quantity, entry_price, executed_at, pattern_type, confidence, status)
+    VALUES (:symbol, :side, :quantity, :price, :executed_at, :pattern, :confidence, 'OPEN')
+""")
+SELECT_OPEN_TRADE = text("""
+    SELECT symbol, entry_price, executed_at, pattern_type
+    FROM tx.paper_trades
+    WHERE symbol = :symbol AND status = 'OPEN'
+    LIMIT 1
+""")
+CLOSE_TRADE = text("""
+    UPDATE tx.paper_trades
+    SET status = 'CLOSED', pnl = :pnl, exit_price = :price, closed_at = NOW()
+    WHERE symbol = :symbol AND status = 'OPEN'
+""")
+INSERT_TRADE_OUTCOME = text("""
+    INSERT INTO trade_outcomes
+    (symbol, pattern, entry_price, exit_price, pnl, quantity,
+     timeframe, opened_at, closed_at, metadata)
+    VALUES (:symbol, :pattern, :entry_price, :exit_price, :pnl, :quantity,
+            :timeframe, :opened_at, NOW(), :metadata)
+""")
+INSERT_MODEL_PREDICTION = text("""
+    INSERT INTO model_predictions (symbol, prediction)
+    VALUES (:symbol, :prediction)
+""")
+INSERT_PATTERN_DETECTION = text("""
+    INSERT INTO pattern_detections (symbol, pattern_type, confidence, detected_at, metadata)
+    VALUES (:symbol, :pattern_type, :confidence, :detected_at, :metadata)
+""")
+INSERT_ALERT = text("""
+    INSERT INTO alerts (symbol, alert_type, message, confidence, created_at, metadata)
+    VALUES (:symbol, :alert_type, :message, :confidence, :created_at, :metadata)
+    ON CONFLICT DO NOTHING
+""")
+SELECT_ACTIVE_ALERTS = text("""
+    SELECT id, symbol, alert_type, message, confidence, created_at, metadata
+    FROM alerts WHERE is_active = true
+    ORDER BY created_at DESC LIMIT 50
+""")
+INSERT_SCANNER_ALERT = text("""
+    INSERT INTO alerts (symbol, alert_type, confidence, is_active, created_at, metadata)
+    VALUES (:symbol, :atype, :conf, true, NOW(), :metadata::jsonb)
+    ON CONFLICT DO NOTHING
+""")
+MARK_ALERT_PROCESSED = text("UPDATE alerts SET processed = true WHERE id = :id")
+DISMISS_ALERTS = text("""
+    UPDATE alerts SET is_active = false WHERE id = ANY(:ids)
+""")
+SELECT_PATTERN_STATS = text("""
+    SELECT pattern_type, count, avg_confidence FROM pattern_stats_24h
+""")
+REFRESH_PATTERN_STATS = text("REFRESH MATERIALIZED VIEW CONCURRENTLY pattern_stats_24h")
+
 # Data Models and Classes
-@dataclass
+# API payloads use the hand-built to_dict() below rather than dataclasses.asdict,
+# which deep-copies every field value on each call
+@dataclass(slots=True)
 class PatternDetection:
     symbol: str
     pattern_type: str
@@ -534,9 +901,26 @@ class PatternDetection:
     price: float
     volume: int
     timestamp: str
-    metadata: Dict[str, Any] = None
+    metadata: Optional[Dict[str, Any]] = None
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'symbol': self.symbol,
+            'pattern_type': self.pattern_type,
+            'confidence': self.confidence,
+            'price': self.price,
+            'volume': self.volume,
+            'timestamp': self.timestamp,
+            'metadata': self.metadata
+        }
+
+def with_confidence_pct(item: Any) -> Dict[str, Any]:
+    """item.to_dict() plus confidence_pct (PatternDetection/Alert API and socket payloads)"""
+    data = item.to_dict()
+    data['confidence_pct'] = round(float(item.confidence or 0) * 100.0, 1)
+    return data
+
+@dataclass(slots=True)
 class Alert:
     id: int
     symbol: str
@@ -547,7 +931,19 @@ class Alert:
     is_active: bool = True
     metadata: Dict[str, Any] = None
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'alert_type': self.alert_type,
+            'message': self.message,
+            'confidence': self.confidence,
+            'timestamp': self.timestamp,
+            'is_active': self.is_active,
+            'metadata': self.metadata
+        }
+
+@dataclass(slots=True)
 class PaperTrade:
     id: int
     symbol: str
@@ -560,27 +956,160 @@ class PaperTrade:
     pattern: str = None
     confidence: float = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'quantity': self.quantity,
+            'price': self.price,
+            'executed_at': self.executed_at,
+            'status': self.status,
+            'pnl': self.pnl,
+            'pattern': self.pattern,
+            'confidence': self.confidence
+        }
+
+@dataclass
+class TradeRequest:
+    """Validated body of a paper trade request"""
+    symbol: str
+    side: str
+    quantity: float
+    price: Optional[float] = None
+    pattern: Optional[str] = None
+    confidence: Optional[float] = None
+
+    @classmethod
+    def from_json(cls, data: Any) -> 'TradeRequest':
+        """Normalize and validate in one pass; raises ValueError with a client-facing message"""
+        if not isinstance(data, dict):
+            raise ValueError('JSON object body required')
+        try:
+            symbol = str(data.get('symbol') or '').strip().upper()
+            side = str(data.get('side') or '').upper()
+            quantity = float(data.get('quantity') or 0)
+            price = data.get('price')
+            price = float(price) if price is not None else None
+            confidence = data.get('confidence')
+            confidence = float(confidence) if confidence is not None else None
+        except (TypeError, ValueError):
+            raise ValueError('Invalid trade parameters')
+        if not symbol or not side or not quantity > 0:
+            raise ValueError('Invalid trade parameters')
+        if side not in ('BUY', 'SELL'):
+            raise ValueError('Side must be BUY or SELL')
+        return cls(symbol, side, quantity, price, data.get('pattern'), confidence)
+
 # Market Data Service
+# yfinance crypto pairs (BTC-USD style) that MarketDataService routes to Polygon's X: tickers
+_POLYGON_CRYPTO_PREFIXES = ('BTC', 'ETH', 'SOL')
+
+# Polygon aggregate bars parsed straight into typed columns (volume is fractional for crypto)
+_POLY_DTYPE = np.dtype([('Open', 'f8'), ('High', 'f8'), ('Low', 'f8'), ('Close', 'f8'), ('Volume', 'f8'), ('Time', 'i8')])
+_POLY_OHLCV = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+def epoch_index(values: Any, unit: str) -> pd.DatetimeIndex:
+    """UTC 'Time' index from integer epoch values ('s' or 'ms') as a datetime64 view, no per-element parsing"""
+    return pd.DatetimeIndex(np.asarray(values, dtype='i8').view(f'datetime64[{unit}]'), tz='UTC', name='Time')
+
+# Shared pool for concurrent quote fetches in get_market_scan
+_quote_pool = ThreadPoolExecutor(max_workers=int(os.getenv('MARKET_SCAN_WORKERS', '8')),
+                                 thread_name_prefix='market-scan')
+
+
 class MarketDataService:
+    # Upper bound on cached quotes/history frames
+    CACHE_MAX_ENTRIES = 4096
+    # Rate-limit cooldown writes between sweeps of expired entries
+    COOLDOWN_SWEEP_EVERY = 256
+    # Longest a request waits for provider quota before falling through to the next provider
+    RATE_LIMIT_MAX_WAIT = 2.0
+
     def __init__(self):
-        self.cache = {}
-        self.cache_timestamps = {}
-        # cooldowns when rate-limited: symbol -> earliest_next_ts
-        self.cooldowns = {}
+        # cache_key -> (monotonic deadline, data); accessed from _quote_pool threads under _cache_lock
+        if CACHETOOLS_AVAILABLE:
+            self.cache = TTLCache(maxsize=self.CACHE_MAX_ENTRIES, ttl=Config.CACHE_DURATION, timer=time.monotonic)
+        else:
+            self.cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        # Concurrent in-flight requests allowed per provider (quote fan-out runs in _quote_pool)
+        provider_limits = {
+            'finnhub': int(os.getenv('FINNHUB_MAX_CONCURRENCY', '4')),
+            'polygon': int(os.getenv('POLYGON_MAX_CONCURRENCY', '2')),
+            'yfinance': int(os.getenv('YFINANCE_MAX_CONCURRENCY', '2')),
+        }
+        self._provider_slots = {name: threading.BoundedSemaphore(limit) for name, limit in provider_limits.items()}
+        # Requests per minute allowed by each provider's plan (0 disables). Finnhub defaults to its
+        # free tier; Polygon plans range from 5/min to unlimited, so it is unthrottled unless set
+        provider_rates = {
+            'finnhub': float(os.getenv('FINNHUB_RATE_PER_MIN', '60')),
+            'polygon': float(os.getenv('POLYGON_RATE_PER_MIN', '0')),
+        }
+        self._rate_limits = {name: TokenBucket(per_min / 60.0, capacity=per_min)
+                             for name, per_min in provider_rates.items()}
+        # cooldowns when rate-limited: symbol -> monotonic earliest retry time
+        self.cooldowns: Dict[str, float] = {}
+        self._cooldown_writes = 0
         self.polygon_key = os.getenv('POLYGON_API_KEY')
         self.finnhub_key = os.getenv('FINNHUB_API_KEY')
+        # The fetcher's event loop needs a real OS thread; under the gevent/eventlet workers
+        # (Procfile, render.yaml, Dockerfile) that thread is a greenlet and would block the hub
+        async_quotes = Config.ASYNC_PROVIDERS and _socketio_async_mode() == 'threading'
+        if Config.ASYNC_PROVIDERS and not async_quotes:
+            logger.warning("ASYNC_PROVIDERS ignored under a green-thread server; using the pooled sync quote path")
+        self._async_quotes = (AsyncQuoteFetcher(self.finnhub_key, self.polygon_key, provider_limits,
+                                                self._rate_limits, self.RATE_LIMIT_MAX_WAIT)
+                              if async_quotes else None)
+        # Keep-alive session for Polygon/Finnhub; 429s are not retried here so the caller
+        # can fall through to the next provider immediately
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      allowed_methods=['GET'], raise_on_status=False)
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry))
+
+    def _cache_get(self, key: str) -> Any:
+        with self._cache_lock:
+            entry = self.cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _cache_put(self, key: str, data: Any) -> None:
+        now = time.monotonic()
+        with self._cache_lock:
+            self.cache[key] = (now + Config.CACHE_DURATION, data)
+            if len(self.cache) > self.CACHE_MAX_ENTRIES:
+                # dict fallback only; TTLCache evicts on its own
+                self.cache = {k: v for k, v in self.cache.items() if v[0] > now}
+
+    def _spend_quota(self, provider: str) -> None:
+        """Wait for one request of provider quota; raises like a 429 when it is not available soon"""
+        if not self._rate_limits[provider].acquire(self.RATE_LIMIT_MAX_WAIT):
+            raise Exception('Too Many Requests')
+
+    def _set_cooldown(self, key: str, seconds: float) -> None:
+        now = time.monotonic()
+        self.cooldowns[key] = now + seconds
+        self._cooldown_writes += 1
+        # Expired entries are never read again; sweep them every COOLDOWN_SWEEP_EVERY writes
+        if self._cooldown_writes % self.COOLDOWN_SWEEP_EVERY == 0:
+            self.cooldowns = {k: until for k, until in list(self.cooldowns.items()) if until > now}
 
     # --- Provider helpers ---
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _is_crypto(symbol: str) -> bool:
         s = symbol.upper()
-        return s.endswith('-USD') and any(s.startswith(p) for p in ['BTC', 'ETH', 'SOL'])
+        return s.endswith('-USD') and s.startswith(_POLYGON_CRYPTO_PREFIXES)
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _is_forex(symbol: str) -> bool:
         return symbol.upper().endswith('=X') and len(symbol) >= 7
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _to_polygon_ticker(symbol: str) -> Optional[str]:
         # Crypto: X:BTC-USD format
         if MarketDataService._is_crypto(symbol):
@@ -601,7 +1130,7 @@ class MarketDataService:
         try:
             # Respect cooldown
             cd_until = self.cooldowns.get(yf_symbol)
-            if cd_until and time.time() < cd_until:
+            if cd_until and time.monotonic() < cd_until:
                 return None
             backoff_base = 0.6
             last_err: Optional[Exception] = None
@@ -619,12 +1148,12 @@ class MarketDataService:
                     if any(tok in msg for tok in ['401', 'unauthorized', 'invalid crumb', 'forbidden', '403']):
                         # Longer cooldown for auth errors
                         cooldown = 300 + int(random.uniform(0, 120))
-                        self.cooldowns[yf_symbol] = time.time() + cooldown
+                        self._set_cooldown(yf_symbol, cooldown)
                         logger.info(f"yfinance auth blocked for {yf_symbol}. Cooldown {cooldown}s")
                         return None
                     if 'rate limit' in msg or 'too many requests' in msg or '999' in msg:
                         cooldown = 90 + int(random.uniform(0, 60))
-                        self.cooldowns[yf_symbol] = time.time() + cooldown
+                        self._set_cooldown(yf_symbol, cooldown)
                         logger.info(f"yfinance rate-limited for {yf_symbol}. Cooldown {cooldown}s")
                         return None
                     if attempt < max_attempts:
@@ -642,7 +1171,7 @@ class MarketDataService:
         try:
             # Respect cooldown
             cd_until = self.cooldowns.get(yf_symbol)
-            if cd_until and time.time() < cd_until:
+            if cd_until and time.monotonic() < cd_until:
                 return None
             backoff_base = 0.6
             last_err: Optional[Exception] = None
@@ -658,12 +1187,12 @@ class MarketDataService:
                     msg = str(e).lower()
                     if any(tok in msg for tok in ['401', 'unauthorized', 'invalid crumb', 'forbidden', '403']):
                         cooldown = 300 + int(random.uniform(0, 120))
-                        self.cooldowns[yf_symbol] = time.time() + cooldown
+                        self._set_cooldown(yf_symbol, cooldown)
                         logger.info(f"yfinance auth blocked for {yf_symbol}. Cooldown {cooldown}s")
                         return None
                     if 'rate limit' in msg or 'too many requests' in msg or '999' in msg:
                         cooldown = 90 + int(random.uniform(0, 60))
-                        self.cooldowns[yf_symbol] = time.time() + cooldown
+                        self._set_cooldown(yf_symbol, cooldown)
                         logger.info(f"yfinance rate-limited for {yf_symbol}. Cooldown {cooldown}s")
                         return None
                     if attempt < max_attempts:
@@ -675,7 +1204,43 @@ class MarketDataService:
             logger.debug(f"_safe_yf_download unexpected error for {yf_symbol}: {e}")
             return None
 
+    def _safe_yf_download_many(self, yf_symbols: List[str], period: str = '3mo',
+                               interval: str = '1d') -> Dict[str, pd.DataFrame]:
+        """Fetch history (daily by default) for several tickers with one yf.download call.
+        Returns {yf_symbol: OHLCV frame}; tickers in cooldown or without data are omitted.
+        """
+        now = time.monotonic()
+        tickers = [t for t in dict.fromkeys(yf_symbols) if not ((until := self.cooldowns.get(t)) and now < until)]
+        if not tickers:
+            return {}
+        try:
+            df = yf.download(' '.join(tickers), period=period, interval=interval, group_by='ticker',
+                             threads=True, auto_adjust=True, progress=False)
+        except Exception as e:
+            msg = str(e).lower()
+            if 'rate limit' in msg or 'too many requests' in msg:
+                cooldown = 90 + int(random.uniform(0, 60))
+                for t in tickers:
+                    self._set_cooldown(t, cooldown)
+                logger.info(f"yfinance rate-limited for batch of {len(tickers)}. Cooldown {cooldown}s")
+            else:
+                logger.debug(f"yfinance batch download failed for {tickers}: {e}")
+            return {}
+        if df is None or df.empty:
+            return {}
+        frames: Dict[str, pd.DataFrame] = {}
+        for t in tickers:
+            try:
+                sub = df[t] if isinstance(df.columns, pd.MultiIndex) else df
+                sub = sub.dropna(how='all')
+                if not sub.empty:
+                    frames[t] = sub
+            except KeyError:
+                continue
+        return frames
+
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _is_stock(symbol: str) -> bool:
         return (not MarketDataService._is_crypto(symbol)) and (not MarketDataService._is_forex(symbol))
 
@@ -684,7 +1249,7 @@ class MarketDataService:
             return None
         try:
             base = 'https://api.polygon.io'
-            today = datetime.utcnow().strftime('%Y-%m-%d')
+            today = utcnow_iso()[:10]
             url = f"{base}/v2/aggs/ticker/{poly_ticker}/range/1/minute/{today}/{today}"
             params = {
                 'adjusted': 'true',
@@ -692,39 +1257,55 @@ class MarketDataService:
                 'limit': 50000,
                 'apiKey': self.polygon_key
             }
-            r = requests.get(url, params=params, timeout=8)
+            self._spend_quota('polygon')
+            r = self._session.get(url, params=params, timeout=8)
             if r.status_code == 429:
                 raise Exception('Too Many Requests')
             r.raise_for_status()
-            j = r.json()
-            results = j.get('results') or []
+            results = polygon_results(r.json())
             if not results:
                 # fallback to previous close
-                prev = requests.get(f"{base}/v2/aggs/ticker/{poly_ticker}/prev", params={'adjusted': 'true', 'apiKey': self.polygon_key}, timeout=8)
+                self._spend_quota('polygon')
+                prev = self._session.get(f"{base}/v2/aggs/ticker/{poly_ticker}/prev", params={'adjusted': 'true', 'apiKey': self.polygon_key}, timeout=8)
                 if prev.status_code == 429:
                     raise Exception('Too Many Requests')
                 prev.raise_for_status()
-                pj = prev.json()
-                pres = (pj.get('results') or [])
-                if not pres:
+                results = polygon_results(prev.json())
+                if not results:
                     return None
-                agg = pres[0]
+                agg = results[0]
             else:
                 agg = results[-1]
-            # Map polygon fields
-            data = {
-                'price': float(agg.get('c', 0.0)),
-                'open': float(agg.get('o', 0.0)),
-                'high': float(agg.get('h', 0.0)),
-                'low': float(agg.get('l', 0.0)),
-                'volume': int(agg.get('v', 0) or 0),
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            return data
+            return polygon_quote_from_agg(agg, utcnow_iso())
         except Exception as e:
             logger.debug(f"Polygon latest minute fetch failed for {poly_ticker}: {e}")
             return None
 
+    @staticmethod
+    def _polygon_frame(results: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+        """OHLCV frame indexed by UTC bar time from Polygon aggregate results (list or stream)"""
+        count = len(results) if isinstance(results, list) else -1
+        arr = np.fromiter(((r['o'], r['h'], r['l'], r['c'], r.get('v', 0.0), r['t']) for r in results),
+                          dtype=_POLY_DTYPE, count=count)
+        return pd.DataFrame({name: arr[name] for name in _POLY_OHLCV}, index=epoch_index(arr['Time'], 'ms'))
+
+    def _polygon_aggregates(self, url: str, params: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """GET a Polygon aggregates endpoint and parse `results` into an OHLCV frame.
+        With ijson the body is streamed into the typed array row by row instead of
+        materializing up to 50k result dicts first.
+        """
+        self._spend_quota('polygon')
+        with self._session.get(url, params=params, timeout=10, stream=IJSON_AVAILABLE) as r:
+            if r.status_code == 429:
+                raise Exception('Too Many Requests')
+            r.raise_for_status()
+            if IJSON_AVAILABLE:
+                r.raw.decode_content = True
+                frame = self._polygon_frame(ijson.items(r.raw, 'results.item', use_float=True))
+            else:
+                frame = self._polygon_frame(r.json().get('results') or [])
+        return frame if not frame.empty else None
+
     def _polygon_history_daily(self, poly_ticker: str, days: int = 90) -> Optional[pd.DataFrame]:
         if not self.polygon_key:
             return None
@@ -734,20 +1315,7 @@ class MarketDataService:
             from_date = to_date - timedelta(days=max(7, days + 5))
             url = f"{base}/v2/aggs/ticker/{poly_ticker}/range/1/day/{from_date}/{to_date}"
             params = {'adjusted': 'true', 'sort': 'asc', 'limit': 50000, 'apiKey': self.polygon_key}
-            r = requests.get(url, params=params, timeout=10)
-            if r.status_code == 429:
-                raise Exception('Too Many Requests')
-            r.raise_for_status()
-            j = r.json()
-            results = j.get('results') or []
-            if not results:
-                return None
-            df = pd.DataFrame(results)
-            # Map to OHLCV
-            df.rename(columns={'o': 'Open', 'h': 'High', 'l': 'Low', 'c': 'Close', 'v': 'Volume', 't': 'Time'}, inplace=True)
-            df['Time'] = pd.to_datetime(df['Time'], unit='ms', utc=True)
-            df.set_index('Time', inplace=True)
-            return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            return self._polygon_aggregates(url, params)
         except Exception as e:
             logger.debug(f"Polygon daily history failed for {poly_ticker}: {e}")
             return None
@@ -768,19 +1336,7 @@ class MarketDataService:
                 # default to 1 minute
                 url = f"{base}/v2/aggs/ticker/{poly_ticker}/range/1/minute/{from_date}/{to_date}"
             params = {'adjusted': 'true', 'sort': 'asc', 'limit': 50000, 'apiKey': self.polygon_key}
-            r = requests.get(url, params=params, timeout=10)
-            if r.status_code == 429:
-                raise Exception('Too Many Requests')
-            r.raise_for_status()
-            j = r.json()
-            results = j.get('results') or []
-            if not results:
-                return None
-            df = pd.DataFrame(results)
-            df.rename(columns={'o': 'Open', 'h': 'High', 'l': 'Low', 'c': 'Close', 'v': 'Volume', 't': 'Time'}, inplace=True)
-            df['Time'] = pd.to_datetime(df['Time'], unit='ms', utc=True)
-            df.set_index('Time', inplace=True)
-            return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            return self._polygon_aggregates(url, params)
         except Exception as e:
             logger.debug(f"Polygon intraday history failed for {poly_ticker}: {e}")
             return None
@@ -791,21 +1347,12 @@ class MarketDataService:
             return None
         try:
             url = 'https://finnhub.io/api/v1/quote'
-            r = requests.get(url, params={'symbol': symbol.upper(), 'token': self.finnhub_key}, timeout=8)
+            self._spend_quota('finnhub')
+            r = self._session.get(url, params={'symbol': symbol.upper(), 'token': self.finnhub_key}, timeout=8)
             if r.status_code == 429:
                 raise Exception('Too Many Requests')
             r.raise_for_status()
-            j = r.json() or {}
-            if not j or j.get('c') in (None, 0):
-                return None
-            return {
-                'price': float(j.get('c', 0.0)),
-                'open': float(j.get('o', 0.0) or 0.0),
-                'high': float(j.get('h', 0.0) or 0.0),
-                'low': float(j.get('l', 0.0) or 0.0),
-                'prev_close': float(j.get('pc', 0.0) or 0.0),
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            return finnhub_quote_from_json(r.json(), utcnow_iso())
         except Exception as e:
             logger.debug(f"Finnhub quote failed for {symbol}: {e}")
             return None
@@ -818,7 +1365,8 @@ class MarketDataService:
             now = int(time.time()) if to_ts is None else to_ts
             span = 90 * 24 * 3600 if resolution == 'D' else 24 * 3600
             start = now - span if from_ts is None else from_ts
-            r = requests.get(url, params={
+            self._spend_quota('finnhub')
+            r = self._session.get(url, params={
                 'symbol': symbol.upper(),
                 'resolution': resolution,
                 'from': start,
@@ -839,16 +1387,9 @@ class MarketDataService:
             v = j.get('v') or []
             if not t:
                 return None
-            df = pd.DataFrame({
-                'Time': pd.to_datetime(t, unit='s', utc=True),
-                'Open': o,
-                'High': h,
-                'Low': l,
-                'Close': c,
-                'Volume': v,
-            })
-            df.set_index('Time', inplace=True)
-            return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            bars = zip(('Open', 'High', 'Low', 'Close', 'Volume'), (o, h, l, c, v))
+            return pd.DataFrame({name: np.asarray(values, dtype=np.float64) for name, values in bars},
+                                index=epoch_index(t, 's'))
         except Exception as e:
             logger.debug(f"Finnhub history failed for {symbol}: {e}")
             return None
@@ -858,97 +1399,171 @@ class MarketDataService:
         cache_key = f"{symbol}_{period}"
         
         # Check cache
-        if (cache_key in self.cache and 
-            time.time() - self.cache_timestamps.get(cache_key, 0) < Config.CACHE_DURATION):
-            return self.cache[cache_key]
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # 1) Finnhub for equities
         if MarketDataService._is_stock(symbol) and self.finnhub_key:
-            q = self._finnhub_quote(symbol)
+            with self._provider_slots['finnhub']:
+                q = self._finnhub_quote(symbol)
             if q:
-                price = q['price']
-                prev_close = q.get('prev_close') or q.get('open') or price
-                change = price - prev_close
-                change_pct = (change / prev_close * 100) if prev_close else 0.0
-                data = {
-                    'symbol': symbol,
-                    'price': price,
-                    'change': change,
-                    'change_percent': change_pct,
-                    'volume': 0,
-                    'high': q.get('high', 0.0),
-                    'low': q.get('low', 0.0),
-                    'open': q.get('open', price),
-                    'market_cap': 0,
-                    'pe_ratio': 0,
-                    'timestamp': q.get('timestamp')
-                }
-                self.cache[cache_key] = data
-                self.cache_timestamps[cache_key] = time.time()
+                data = self._quote_from_finnhub(symbol, q)
+                self._cache_put(cache_key, data)
                 return data
 
         # 2) Polygon for crypto/forex/stocks (if supported)
         poly_ticker = self._to_polygon_ticker(symbol)
         if poly_ticker:
-            poly = self._polygon_latest_minute(poly_ticker)
+            with self._provider_slots['polygon']:
+                poly = self._polygon_latest_minute(poly_ticker)
             if poly:
-                price = poly['price']
-                openp = poly.get('open', price)
-                change = price - openp
-                change_pct = (change / openp * 100) if openp else 0.0
-                data = {
-                    'symbol': symbol,
-                    'price': price,
-                    'change': change,
-                    'change_percent': change_pct,
-                    'volume': poly.get('volume', 0),
-                    'high': poly.get('high', 0.0),
-                    'low': poly.get('low', 0.0),
-                    'open': openp,
-                    'market_cap': 0,
-                    'pe_ratio': 0,
-                    'timestamp': poly.get('timestamp')
-                }
-                self.cache[cache_key] = data
-                self.cache_timestamps[cache_key] = time.time()
+                data = self._quote_from_polygon(symbol, poly)
+                self._cache_put(cache_key, data)
                 return data
 
         # 3) Fallback to yfinance (safe)
+        return self._yf_quote(symbol, period)
+
+    def _yf_quote(self, symbol: str, period: str = '1d') -> Optional[Dict[str, Any]]:
+        """yfinance step of get_stock_data (history cache first), cached under the same key"""
         yf_symbol = normalize_symbol_for_yf(symbol)
-        hist = self._safe_yf_history(yf_symbol, period=period)
+        hist = self._cached_history(yf_symbol, period)
+        if hist is None:
+            with self._provider_slots['yfinance']:
+                hist = self._safe_yf_history(yf_symbol, period=period)
         if hist is None or hist.empty:
             return None
-        latest = hist.iloc[-1]
+        data = self._quote_from_history(symbol, hist)
+        self._cache_put(f"{symbol}_{period}", data)
+        return data
+
+    @staticmethod
+    def _quote_from_finnhub(symbol: str, q: Dict[str, Any]) -> Dict[str, Any]:
+        price = q['price']
+        prev_close = q.get('prev_close') or q.get('open') or price
+        change = price - prev_close
+        change_pct = (change / prev_close * 100) if prev_close else 0.0
+        return {
+            'symbol': symbol,
+            'price': price,
+            'change': change,
+            'change_percent': change_pct,
+            'volume': 0,
+            'high': q.get('high', 0.0),
+            'low': q.get('low', 0.0),
+            'open': q.get('open', price),
+            'market_cap': 0,
+            'pe_ratio': 0,
+            'timestamp': q.get('timestamp')
+        }
+
+    @staticmethod
+    def _quote_from_polygon(symbol: str, poly: Dict[str, Any]) -> Dict[str, Any]:
+        price = poly['price']
+        openp = poly.get('open', price)
+        change = price - openp
+        change_pct = (change / openp * 100) if openp else 0.0
+        return {
+            'symbol': symbol,
+            'price': price,
+            'change': change,
+            'change_percent': change_pct,
+            'volume': poly.get('volume', 0),
+            'high': poly.get('high', 0.0),
+            'low': poly.get('low', 0.0),
+            'open': openp,
+            'market_cap': 0,
+            'pe_ratio': 0,
+            'timestamp': poly.get('timestamp')
+        }
+
+    def _uses_yfinance_quotes(self, symbol: str) -> bool:
+        """True if get_stock_data goes straight to yfinance for symbol (no Finnhub/Polygon key applies)"""
+        return not (MarketDataService._is_stock(symbol) and self.finnhub_key) and not self.polygon_key
+
+    def _cached_history(self, yf_symbol: str, period: str) -> Optional[pd.DataFrame]:
+        return self._cache_get(f"hist:{yf_symbol}:{period}")
+
+    def bulk_history(self, symbols: List[str], period: str = '3mo') -> Dict[str, pd.DataFrame]:
+        """Daily yfinance history for several symbols with one yf.download call.
+        Frames are cached for CACHE_DURATION; returns {symbol: frame} for symbols with data.
+        """
+        yf_symbols = {s: normalize_symbol_for_yf(s) for s in symbols}
+        frames: Dict[str, pd.DataFrame] = {}
+        missing = []
+        for yf_symbol in dict.fromkeys(yf_symbols.values()):
+            hist = self._cached_history(yf_symbol, period)
+            if hist is not None:
+                frames[yf_symbol] = hist
+            else:
+                missing.append(yf_symbol)
+        if missing:
+            with self._provider_slots['yfinance']:
+                fetched = self._safe_yf_download_many(missing, period=period)
+            for yf_symbol, hist in fetched.items():
+                self._cache_put(f"hist:{yf_symbol}:{period}", hist)
+            frames.update(fetched)
+        return {s: frames[t] for s, t in yf_symbols.items() if t in frames}
+
+    @staticmethod
+    def _quote_from_history(symbol: str, hist: pd.DataFrame) -> Dict[str, Any]:
+        """Quote dict (get_stock_data shape) from the last bars of a yfinance history"""
+        # Read the last two bars from one ndarray instead of per-field Series lookups
+        cols = [c for c in ('Open', 'High', 'Low', 'Close', 'Volume') if c in hist.columns]
+        arr = hist[cols].to_numpy(dtype=np.float64)
+        last = dict(zip(cols, arr[-1]))
+        close = last['Close']
+        prev_close = arr[-2, cols.index('Close')] if len(arr) > 1 else None
         # Do not access ticker.info to avoid additional HTTP calls; leave market_cap/pe_ratio as 0
         data = {
             'symbol': symbol,
-            'price': float(latest['Close']),
-            'change': float(latest['Close'] - hist.iloc[-2]['Close']) if len(hist) > 1 else 0,
-            'change_percent': float((latest['Close'] - hist.iloc[-2]['Close']) / hist.iloc[-2]['Close'] * 100) if len(hist) > 1 else 0,
-            'volume': int(latest['Volume']) if 'Volume' in latest else 0,
-            'high': float(latest['High']) if 'High' in latest else float(latest['Close']),
-            'low': float(latest['Low']) if 'Low' in latest else float(latest['Close']),
-            'open': float(latest['Open']) if 'Open' in latest else float(latest['Close']),
+            'price': float(close),
+            'change': float(close - prev_close) if prev_close is not None else 0,
+            'change_percent': float((close - prev_close) / prev_close * 100) if prev_close is not None else 0,
+            'volume': int(last['Volume']) if 'Volume' in last else 0,
+            'high': float(last.get('High', close)),
+            'low': float(last.get('Low', close)),
+            'open': float(last.get('Open', close)),
             'market_cap': 0,
             'pe_ratio': 0,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
-        self.cache[cache_key] = data
-        self.cache_timestamps[cache_key] = time.time()
         return data
     
     def get_market_scan(self, scan_type: str = 'trending', symbols_override: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get market scan data"""
-        symbols = symbols_override if symbols_override is not None else [s.strip() for s in Config.SCAN_SYMBOLS.split(',') if s.strip()]
-        results = []
-        
-        for symbol in symbols:
-            data = self.get_stock_data(symbol)
-            if data:
-                results.append(data)
-            # small per-symbol jitter to avoid burst hitting providers
-            time.sleep(0.15 + random.uniform(0, 0.2))
-                
+        symbols = symbols_override if symbols_override is not None else SCAN_SYMBOLS
+        
+        # yfinance-only symbols: one batched download warms the history cache get_stock_data reads
+        yf_only = [s for s in symbols if self._uses_yfinance_quotes(s) and self._cache_get(f"{s}_1d") is None]
+        if len(yf_only) > 1:
+            self.bulk_history(yf_only, period='1d')
+
+        if self._async_quotes is not None and (self.finnhub_key or self.polygon_key):
+            return self._rank_scan(self._async_market_scan(symbols), scan_type)
+
+        # Quotes are fetched concurrently; per-provider semaphores in get_stock_data cap the burst
+        results = [data for data in _quote_pool.map(self.get_stock_data, symbols) if data]
+        return self._rank_scan(results, scan_type)
+
+    def _async_market_scan(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Quotes for a scan with Finnhub/Polygon fetched on the async loop; the rest via yfinance"""
+        quotes = {s: self._cache_get(f"{s}_1d") for s in symbols}
+        pending = [s for s, q in quotes.items() if q is None and not self._uses_yfinance_quotes(s)]
+        builders = {'finnhub': self._quote_from_finnhub, 'polygon': self._quote_from_polygon}
+        fetched = self._async_quotes.fetch_quotes(pending, MarketDataService._is_stock, MarketDataService._to_polygon_ticker)
+        for symbol, (provider, payload) in fetched.items():
+            quotes[symbol] = builders[provider](symbol, payload)
+            self._cache_put(f"{symbol}_1d", quotes[symbol])
+        # Symbols no provider answered for fall back to yfinance, as in get_stock_data
+        missing = [s for s, q in quotes.items() if q is None]
+        for symbol, data in zip(missing, _quote_pool.map(self._yf_quote, missing)):
+            quotes[symbol] = data
+        return [quotes[s] for s in symbols if quotes[s]]
+
+    @staticmethod
+    def _rank_scan(results: List[Dict[str, Any]], scan_type: str) -> List[Dict[str, Any]]:
         # Sort by volume or change based on scan type
         if scan_type == 'volume':
             results.sort(key=lambda x: x['volume'], reverse=True)
@@ -958,241 +1573,349 @@ class MarketDataService:
         return results[:10]
 
 # Pattern Detection Service
+# Shared pool for I/O-bound per-symbol detection in detect_patterns_bulk
+_detect_pool = ThreadPoolExecutor(max_workers=int(os.getenv('PATTERN_DETECT_WORKERS', '8')),
+                                  thread_name_prefix='pattern-detect')
+# Per-symbol intraday + context detection for the live scanner
+_scan_pool = ThreadPoolExecutor(max_workers=int(os.getenv('SCAN_POOL_WORKERS', '8')), thread_name_prefix='live-scan')
+
+
 class PatternDetectionService:
+    # Upper bound on cached candle-pattern results before expired entries are swept
+    CANDLE_CACHE_MAX_ENTRIES = 2048
+
     def __init__(self, market_data_service: MarketDataService):
         self.market_data = market_data_service
         # cooldowns for pattern fetches (history) when rate-limited
         self.cooldowns = {}
-        
-    def detect_patterns(self, symbol: str) -> List[PatternDetection]:
-        """Detect technical patterns using real market data"""
+        # symbol -> (fetched_monotonic, fetched_utc_date, daily OHLCV)
+        self._history_cache: Dict[str, Tuple[float, Any, pd.DataFrame]] = {}
+        # symbol -> (monotonic deadline, detected patterns)
+        self._result_cache: Dict[str, Tuple[float, List[PatternDetection]]] = {}
+        self._result_lock = threading.Lock()
+        # symbol -> streaming indicator state over the closed daily bars
+        self._indicator_state: Dict[str, IndicatorState] = {}
+        # (symbol, timeframe, bar count, last candle values) -> (monotonic deadline, detect_all_patterns output)
+        self._candle_cache: Dict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]] = {}
+
+    def _cached_patterns(self, symbol: str) -> Optional[List[PatternDetection]]:
+        entry = self._result_cache.get(symbol)
+        if entry and entry[0] > time.monotonic():
+            return list(entry[1])
+        return None
+
+    def _candle_patterns(self, symbol: str, timeframe: str, candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """detect_all_patterns output, reused for CACHE_DURATION while the candles are unchanged.
+        Earlier bars are closed, so the count plus the live last candle identifies the window.
+        """
+        key = (symbol, timeframe, len(candles), tuple(candles[-1].values()) if candles else ())
+        now = time.monotonic()
+        entry = self._candle_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        results = detect_all_patterns(candles)
+        with self._result_lock:
+            self._candle_cache[key] = (now + Config.CACHE_DURATION, results)
+            if len(self._candle_cache) > self.CANDLE_CACHE_MAX_ENTRIES:
+                self._candle_cache = {k: v for k, v in self._candle_cache.items() if v[0] > now}
+        return results
+
+    def _remember_history(self, symbol: str, hist: pd.DataFrame) -> None:
+        self._history_cache[symbol] = (
+            time.monotonic(), datetime.utcnow().date(), hist[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+        )
+
+    def _has_fresh_history(self, symbol: str) -> bool:
+        entry = self._history_cache.get(symbol)
+        if entry is None:
+            return False
+        fetched_at, fetched_day, _ = entry
+        return (time.monotonic() - fetched_at < Config.HISTORY_REFRESH_SECONDS
+                and datetime.utcnow().date() == fetched_day)
+
+    def _incremental_history(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Cached daily history with the last bar updated from the latest quote.
+        Returns None when the cache is missing or stale (new day / refresh interval).
+        """
+        if not self._has_fresh_history(symbol):
+            return None
+        hist = self._history_cache[symbol][2].copy()
+        quote = self.market_data.get_stock_data(symbol)
+        price = (quote or {}).get('price')
+        if price:
+            price = float(price)
+            last = hist.index[-1]
+            hist.at[last, 'Close'] = price
+            hist.at[last, 'High'] = max(float(hist.at[last, 'High']), price)
+            hist.at[last, 'Low'] = min(float(hist.at[last, 'Low']), price)
+        return hist
+        
+    def _uses_direct_provider(self, symbol: str) -> bool:
+        """True if daily history for symbol is fetched from Finnhub/Polygon before yfinance"""
+        if self.market_data._is_stock(symbol) and self.market_data.finnhub_key:
+            return True
+        return bool(self.market_data.polygon_key and self.market_data._to_polygon_ticker(symbol))
+
+    def _load_daily_history(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Daily OHLCV history: Finnhub for equities, then Polygon, then yfinance"""
+        hist = None
+        if self.market_data._is_stock(symbol) and self.market_data.finnhub_key:
+            try:
+                hist = self.market_data._finnhub_history(symbol, resolution='D')
+            except Exception as e:
+                logger.debug(f"Finnhub daily history unavailable for {symbol}: {e}")
+        try:
+            poly_ticker = self.market_data._to_polygon_ticker(symbol)
+            if hist is None and poly_ticker and self.market_data.polygon_key:
+                hist = self.market_data._polygon_history_daily(poly_ticker, days=90)
+        except Exception as e:
+            logger.debug(f"Polygon daily history unavailable for {symbol}: {e}")
+
+        if hist is None:
+            # Fallback to yfinance (safe)
+            yf_symbol = normalize_symbol_for_yf(symbol)
+            hist = self.market_data._safe_yf_history(yf_symbol, period='3mo')
+        return hist
+
+    def detect_patterns_bulk(self, symbols: List[str]) -> Dict[str, List[PatternDetection]]:
+        """Detect patterns for several symbols, fetching yfinance-only histories in one batch"""
+        now = time.monotonic()
+        active = [s for s in symbols if not ((until := self.cooldowns.get(s)) and now < until)]
+        yf_symbols = [s for s in active
+                      if self._cached_patterns(s) is None
+                      and not self._uses_direct_provider(s) and not self._has_fresh_history(s)]
+        prefetched = self.market_data.bulk_history(yf_symbols, period='3mo') if yf_symbols else {}
+        results: Dict[str, List[PatternDetection]] = {}
+        pending = []
+        for symbol in symbols:
+            cached = self._cached_patterns(symbol)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                pending.append(symbol)
+        # Symbols that may still fetch history per symbol (Finnhub/Polygon) go to the I/O pool first
+        fetching = [s for s in pending if s not in prefetched]
+        fetched_results = _detect_pool.map(self.detect_patterns, fetching)
+        # Batch-fetched symbols only compute (mostly Python; the pool threads are greenlets under
+        # the gevent worker), so run them here while the fetches are in flight
+        for s in pending:
+            if s in prefetched:
+                results[s] = self.detect_patterns(s, hist=prefetched[s])
+        results.update(zip(fetching, fetched_results))
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def bulk_intraday_history(self, symbols: List[str], period: str = '1d',
+                              interval: str = '1m') -> Dict[str, pd.DataFrame]:
+        """Intraday yfinance candles for several symbols with one yf.download call.
+        Symbols served by Finnhub/Polygon are left out so detect_patterns_intraday keeps that preference.
+        """
+        yf_symbols = {s: normalize_symbol_for_yf(s) for s in symbols if not self._uses_direct_provider(s)}
+        if not yf_symbols:
+            return {}
+        with self.market_data._provider_slots['yfinance']:
+            fetched = self.market_data._safe_yf_download_many(list(yf_symbols.values()), period=period, interval=interval)
+        return {s: fetched[t] for s, t in yf_symbols.items() if t in fetched}
+
+    def bulk_insert_patterns(self, rows: List[Dict[str, Any]]) -> None:
+        """Write pattern_detections rows (symbol, pattern_type, confidence, detected_at, metadata).
+        One executemany call; psycopg 3 pipelines it, so a batch costs ~1 round trip instead of N.
+        Errors propagate to the caller.
+        """
+        if not db_available or not rows:
+            return
+        with engine.begin() as conn:
+            conn.execute(INSERT_PATTERN_DETECTION, rows)
+
+    def detect_patterns(self, symbol: str, hist: Optional[pd.DataFrame] = None) -> List[PatternDetection]:
+        """Detect technical patterns using real market data.
+        Results are reused for PATTERN_CACHE_SECONDS unless a fresh history is passed in.
+        hist: optional pre-fetched daily OHLCV (e.g. from detect_patterns_bulk).
+        """
+        if hist is None:
+            cached = self._cached_patterns(symbol)
+            if cached is not None:
+                return cached
+        patterns = self._scan_patterns(symbol, hist)
+        with self._result_lock:
+            self._result_cache[symbol] = (time.monotonic() + Config.PATTERN_CACHE_SECONDS, patterns)
+        return list(patterns)
+
+    def _scan_patterns(self, symbol: str, hist: Optional[pd.DataFrame] = None) -> List[PatternDetection]:
         try:
             # cooldown respect
             cd_until = self.cooldowns.get(symbol)
-            if cd_until and time.time() < cd_until:
+            if cd_until and time.monotonic() < cd_until:
                 return []
-            # Prefer Finnhub for equities, then Polygon, then yfinance
-            hist = None
-            if self.market_data._is_stock(symbol) and self.market_data.finnhub_key:
-                try:
-                    hist = self.market_data._finnhub_history(symbol, resolution='D')
-                except Exception as e:
-                    logger.debug(f"Finnhub daily history unavailable for {symbol}: {e}")
-            try:
-                poly_ticker = self.market_data._to_polygon_ticker(symbol)
-                if hist is None and poly_ticker and self.market_data.polygon_key:
-                    hist = self.market_data._polygon_history_daily(poly_ticker, days=90)
-            except Exception as e:
-                logger.debug(f"Polygon daily history unavailable for {symbol}: {e}")
-
             if hist is None:
-                # Fallback to yfinance (safe)
-                yf_symbol = normalize_symbol_for_yf(symbol)
-                hist = self.market_data._safe_yf_history(yf_symbol, period='3mo')
+                hist = self._incremental_history(symbol)
+            if hist is None:
+                hist = self._load_daily_history(symbol)
                 if hist is None:
                     return []
+                if not hist.empty:
+                    self._remember_history(symbol, hist)
+            elif not self._has_fresh_history(symbol) and not hist.empty:
+                self._remember_history(symbol, hist)
             
             if hist.empty or len(hist) < 20:
                 return []
                 
             patterns = []
             
-            # Calculate technical indicators
-            hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
-            hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
-            hist['RSI'] = ta.momentum.RSIIndicator(hist['Close']).rsi()
-            hist['MACD'] = ta.trend.MACD(hist['Close']).macd()
-            hist['BB_upper'] = ta.volatility.BollingerBands(hist['Close']).bollinger_hband()
-            hist['BB_lower'] = ta.volatility.BollingerBands(hist['Close']).bollinger_lband()
-            # ATR and average volume for confirmations
-            try:
-                atr_ind = ta.volatility.AverageTrueRange(high=hist['High'], low=hist['Low'], close=hist['Close'], window=14)
-                hist['ATR_14'] = atr_ind.average_true_range()
-            except Exception:
-                hist['ATR_14'] = pd.Series([np.nan] * len(hist), index=hist.index)
-            hist['VOL_MA_20'] = hist['Volume'].rolling(window=20).mean()
-            
-            latest = hist.iloc[-1]
-            prev = hist.iloc[-2] if len(hist) > 1 else latest
+            # OHLCV as one float64 block; last-bar price/volume are read from it directly
+            ohlcv = hist[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=np.float64)
+            close = ohlcv[:, 3]
+            price = float(close[-1])
+            last_volume = float(ohlcv[-1, 4])
+            volume = int(last_volume) if not np.isnan(last_volume) else 0
+
+            # Indicators from the per-symbol streaming state: closed bars are folded in once,
+            # the live last bar is applied on read
+            state = sync_state(self._indicator_state.get(symbol), ohlcv, hist.index)
+            self._indicator_state[symbol] = state
+            ind = state.live(float(ohlcv[-1, 1]), float(ohlcv[-1, 2]), price, last_volume)
+            sma20, sma20_prev = ind['sma_fast'], ind['sma_fast_prev']
+            sma50, sma50_prev = ind['sma_slow'], ind['sma_slow_prev']
+            rsi_last = ind['rsi']
+            bb_upper_last = ind['bb_upper']
+            atr14 = ind['atr']
+            # NaN average (window not filled) compares False, so no volume boost
+            vol_above_avg = bool(last_volume > ind['vol_ma'])
+            detected_at = eat_now_iso()
+
+            # Compiled scan over [previous, last] bar values; objects are built only for flagged patterns
+            flags = scan_last_bar(
+                close[-2:], np.array([sma20_prev, sma20]), np.array([sma50_prev, sma50]),
+                np.array([np.nan, rsi_last]), np.array([np.nan, bb_upper_last])
+            )
             
             # Golden Cross pattern
-            if (latest['SMA_20'] > latest['SMA_50'] and 
-                prev['SMA_20'] <= prev['SMA_50']):
+            if flags[GOLDEN_CROSS]:
                 # Confidence: base + slope/distance + volume
                 base_conf = 0.80
-                slope = float((latest['SMA_20'] - prev['SMA_20']) - (latest['SMA_50'] - prev['SMA_50']))
-                dist = float((latest['SMA_20'] - latest['SMA_50']) / max(1e-9, latest['Close']))
-                vol_boost = 0.05 if ('Volume' in latest and 'VOL_MA_20' in latest and latest['Volume'] > (latest['VOL_MA_20'] or 0)) else 0.0
+                slope = (sma20 - sma20_prev) - (sma50 - sma50_prev)
+                dist = (sma20 - sma50) / max(1e-9, price)
+                vol_boost = 0.05 if vol_above_avg else 0.0
                 conf = base_conf + min(0.1, abs(slope) * 10) + min(0.1, max(0.0, dist) * 5) + vol_boost
                 # Watchlist boost
-                if any('golden' in p.lower() for p in prioritized_patterns):
+                if PRIORITY_GOLDEN:
                     conf = min(1.0, conf + 0.05)
                 conf = float(max(0.0, min(1.0, conf)))
                 pd_item = PatternDetection(
                     symbol=symbol,
                     pattern_type='Golden Cross',
                     confidence=conf,
-                    price=float(latest['Close']),
-                    volume=int(latest['Volume']),
-                    timestamp=to_eat_iso(datetime.now()),
+                    price=price,
+                    volume=volume,
+                    timestamp=detected_at,
                     metadata={
-                        'sma_20': float(latest['SMA_20']),
-                        'sma_50': float(latest['SMA_50']),
+                        'sma_20': sma20,
+                        'sma_50': sma50,
                         'timeframe': '1D',
-                        'timestamp_eat': to_eat_iso(datetime.now()),
+                        'timestamp_eat': detected_at,
                         'explanation': '20-day SMA has crossed above 50-day SMA, indicating a bullish trend shift.',
                         'suggested_action': 'BUY',
                         'confidence_pct': round(conf * 100.0, 1),
                         'confidence_factors': {
                             'slope_diff': float(slope),
                             'sma_distance_pct': round(dist * 100.0, 3),
-                            'volume_above_avg': bool(latest['Volume'] > (latest['VOL_MA_20'] or 0))
+                            'volume_above_avg': vol_above_avg
                         },
-                        'risk_suggestions': (lambda entry, atr: {
-                            'entry': entry,
-                            'stop_loss': round(entry - 1.5 * atr, 6) if atr and not np.isnan(atr) else None,
-                            'take_profit': round(entry + (2.0 if conf >= 0.8 else 1.5) * atr, 6) if atr and not np.isnan(atr) else None,
-                            'rr': round((2.0 if conf >= 0.8 else 1.5) / 1.5, 2) if atr and not np.isnan(atr) else None
-                        })(float(latest['Close']), float(latest['ATR_14']) if 'ATR_14' in latest else None)
+                        'risk_suggestions': _risk_suggestions(price, atr14, 'BUY', conf)
                     }
                 )
                 patterns.append(pd_item)
                 logger.info(f"Pattern detected: {pd_item.pattern_type} on {symbol} @ {pd_item.price} (conf {pd_item.confidence:.2f})")
             
             # RSI Oversold/Overbought
-            if latest['RSI'] < 30:
+            if flags[RSI_OVERSOLD]:
+                conf = max(0.0, min(1.0, 0.65 + min(0.15, (30 - rsi_last) / 100.0 * 3.0)
+                                    + (0.05 if vol_above_avg else 0.0)))
+                # Watchlist boost folded in before the metadata so confidence_pct matches
+                if PRIORITY_RSI_OVERSOLD:
+                    conf = min(1.0, conf + 0.05)
                 pd_item = PatternDetection(
                     symbol=symbol,
                     pattern_type='RSI Oversold',
-                    confidence=float(max(0.0, min(1.0, 0.65 + min(0.15, (30 - float(latest['RSI'])) / 100.0 * 3.0) + (0.05 if latest['Volume'] > (latest['VOL_MA_20'] or 0) else 0.0)))),
-                    price=float(latest['Close']),
-                    volume=int(latest['Volume']),
-                    timestamp=to_eat_iso(datetime.now()),
+                    confidence=conf,
+                    price=price,
+                    volume=volume,
+                    timestamp=detected_at,
                     metadata={
-                        'rsi': float(latest['RSI']),
+                        'rsi': rsi_last,
                         'timeframe': '1D',
-                        'timestamp_eat': to_eat_iso(datetime.now()),
+                        'timestamp_eat': detected_at,
                         'explanation': 'RSI below 30 indicates oversold conditions which may precede a bullish reversal.',
                         'suggested_action': 'BUY',
-                        'confidence_pct': round(
-                            float(
-                                max(
-                                    0.0,
-                                    min(
-                                        1.0,
-                                        0.65
-                                        + min(0.15, (30 - float(latest['RSI'])) / 100.0 * 3.0)
-                                        + (0.05 if latest['Volume'] > (latest['VOL_MA_20'] or 0) else 0.0)
-                                    )
-                                )
-                            ) * 100.0,
-                            1
-                        ),
-                        'risk_suggestions': (lambda entry, atr: {
-                            'entry': entry,
-                            'stop_loss': round(entry - 1.5 * atr, 6) if atr and not np.isnan(atr) else None,
-                            'take_profit': round(entry + 1.5 * atr, 6) if atr and not np.isnan(atr) else None,
-                            'rr': 1.0 if atr and not np.isnan(atr) else None
-                        })(float(latest['Close']), float(hist['ATR_14'].iloc[-1]) if len(hist) else None)
+                        'confidence_pct': round(conf * 100.0, 1),
+                        'risk_suggestions': _risk_suggestions(price, atr14, 'BUY', 0.0)
                     }
                 )
-                if any('rsi' in p.lower() and 'oversold' in p.lower() for p in prioritized_patterns):
-                    pd_item.confidence = min(1.0, pd_item.confidence + 0.05)
                 patterns.append(pd_item)
                 logger.info(f"Pattern detected: {pd_item.pattern_type} on {symbol} @ {pd_item.price} (conf {pd_item.confidence:.2f})")
-            elif latest['RSI'] > 70:
+            elif flags[RSI_OVERBOUGHT]:
+                conf = max(0.0, min(1.0, 0.65 + min(0.15, (rsi_last - 70) / 100.0 * 3.0)
+                                    + (0.05 if vol_above_avg else 0.0)))
+                if PRIORITY_RSI_OVERBOUGHT:
+                    conf = min(1.0, conf + 0.05)
                 pd_item = PatternDetection(
                     symbol=symbol,
                     pattern_type='RSI Overbought',
-                    confidence=float(max(0.0, min(1.0, 0.65 + min(0.15, (float(latest['RSI']) - 70) / 100.0 * 3.0) + (0.05 if latest['Volume'] > (latest['VOL_MA_20'] or 0) else 0.0)))),
-                    price=float(latest['Close']),
-                    volume=int(latest['Volume']),
-                    timestamp=to_eat_iso(datetime.now()),
+                    confidence=conf,
+                    price=price,
+                    volume=volume,
+                    timestamp=detected_at,
                     metadata={
-                        'rsi': float(latest['RSI']),
+                        'rsi': rsi_last,
                         'timeframe': '1D',
-                        'timestamp_eat': to_eat_iso(datetime.now()),
+                        'timestamp_eat': detected_at,
                         'explanation': 'RSI above 70 indicates overbought conditions which may precede a bearish pullback.',
                         'suggested_action': 'SELL',
-                        'confidence_pct': round(
-                            float(
-                                max(
-                                    0.0,
-                                    min(
-                                        1.0,
-                                        0.65
-                                        + min(0.15, (float(latest['RSI']) - 70) / 100.0 * 3.0)
-                                        + (0.05 if latest['Volume'] > (latest['VOL_MA_20'] or 0) else 0.0)
-                                    )
-                                )
-                            ) * 100.0,
-                            1
-                        ),
-                        'risk_suggestions': (lambda entry, atr: {
-                            'entry': entry,
-                            'stop_loss': round(entry + 1.5 * atr, 6) if atr and not np.isnan(atr) else None,
-                            'take_profit': round(entry - 1.5 * atr, 6) if atr and not np.isnan(atr) else None,
-                            'rr': 1.0 if atr and not np.isnan(atr) else None
-                        })(float(latest['Close']), float(hist['ATR_14'].iloc[-1]) if len(hist) else None)
+                        'confidence_pct': round(conf * 100.0, 1),
+                        'risk_suggestions': _risk_suggestions(price, atr14, 'SELL', 0.0)
                     }
                 )
-                if any('rsi' in p.lower() and 'overbought' in p.lower() for p in prioritized_patterns):
-                    pd_item.confidence = min(1.0, pd_item.confidence + 0.05)
                 patterns.append(pd_item)
                 logger.info(f"Pattern detected: {pd_item.pattern_type} on {symbol} @ {pd_item.price} (conf {pd_item.confidence:.2f})")
             
             # Bollinger Band Squeeze
-            if (latest['Close'] > latest['BB_upper']):
-                mag = float((latest['Close'] - latest['BB_upper']) / max(1e-9, latest['Close']))
+            if flags[BOLLINGER_BREAKOUT]:
+                mag = float((price - bb_upper_last) / max(1e-9, price))
                 base = 0.65 + min(0.2, max(0.0, mag) * 5.0)
-                if latest['Volume'] > (latest['VOL_MA_20'] or 0):
+                if vol_above_avg:
+                    base += 0.05
+                if PRIORITY_BOLLINGER:
                     base += 0.05
                 conf = float(max(0.0, min(1.0, base)))
                 pd_item = PatternDetection(
                     symbol=symbol,
                     pattern_type='Bollinger Breakout',
                     confidence=conf,
-                    price=float(latest['Close']),
-                    volume=int(latest['Volume']),
-                    timestamp=to_eat_iso(datetime.now()),
+                    price=price,
+                    volume=volume,
+                    timestamp=detected_at,
                     metadata={
-                        'bb_upper': float(latest['BB_upper']),
+                        'bb_upper': bb_upper_last,
                         'timeframe': '1D',
-                        'timestamp_eat': to_eat_iso(datetime.now()),
+                        'timestamp_eat': detected_at,
                         'explanation': 'Price closed above the upper Bollinger Band, signaling strong bullish momentum.',
                         'suggested_action': 'BUY',
                         'confidence_pct': round(conf * 100.0, 1),
-                        'risk_suggestions': (lambda entry, atr: {
-                            'entry': entry,
-                            'stop_loss': round(entry - 1.5 * atr, 6) if atr and not np.isnan(atr) else None,
-                            'take_profit': round(entry + (2.0 if conf >= 0.8 else 1.5) * atr, 6) if atr and not np.isnan(atr) else None,
-                            'rr': round((2.0 if conf >= 0.8 else 1.5) / 1.5, 2) if atr and not np.isnan(atr) else None
-                        })(float(latest['Close']), float(hist['ATR_14'].iloc[-1]) if len(hist) else None)
+                        'risk_suggestions': _risk_suggestions(price, atr14, 'BUY', conf)
                     }
                 )
-                if any('bollinger' in p.lower() for p in prioritized_patterns):
-                    pd_item.confidence = min(1.0, pd_item.confidence + 0.05)
                 patterns.append(pd_item)
                 logger.info(f"Pattern detected: {pd_item.pattern_type} on {symbol} @ {pd_item.price} (conf {pd_item.confidence:.2f})")
 
             # Integrate modular AI pattern detection (candlestick-based)
             try:
-                candles = []
-                for ts, row in hist.iterrows():
-                    candles.append({
-                        'time': ts.isoformat() if hasattr(ts, 'isoformat') else str(ts),
-                        'open': float(row['Open']),
-                        'high': float(row['High']),
-                        'low': float(row['Low']),
-                        'close': float(row['Close']),
-                        'volume': int(row['Volume']) if not pd.isna(row['Volume']) else 0
-                    })
-                ai_results = detect_all_patterns(candles)
+                candles = candles_from_frame(hist)
+                ai_results = self._candle_patterns(symbol, '1D', candles)
                 for r in ai_results:
                     name = r.get('name', 'AI Pattern')
                     conf = r.get('confidence', 0.7) or 0.7
                     # Boost confidence for prioritized patterns
-                    if any(name.lower() in p.lower() for p in prioritized_patterns):
+                    if is_prioritized(name):
                         conf = min(1.0, conf + 0.1)
                     # Suggested action heuristic
                     low_name = (name or '').lower()
@@ -1208,16 +1931,16 @@ class PatternDetectionService:
                         symbol=symbol,
                         pattern_type=name,
                         confidence=float(conf),
-                        price=float(latest['Close']),
-                        volume=int(latest['Volume']),
-                        timestamp=to_eat_iso(datetime.now()),
+                        price=price,
+                        volume=volume,
+                        timestamp=detected_at,
                         metadata={
                             'source': 'ai_pattern_logic',
                             'index': r.get('index'),
                             'category': r.get('category'),
                             'explanation': r.get('explanation'),
                             'timeframe': '1D',
-                            'timestamp_eat': to_eat_iso(datetime.now()),
+                            'timestamp_eat': detected_at,
                             'suggested_action': action,
                             'confidence_pct': round(float(conf) * 100.0, 1)
                         }
@@ -1233,16 +1956,19 @@ class PatternDetectionService:
             logger.error(f"Pattern detection failed for {symbol}: {e}")
             return []
 
-    def detect_patterns_intraday(self, symbol: str, period: str = '1d', interval: str = '1m') -> List[PatternDetection]:
-        """Detect candlestick patterns using intraday candles for real-time scanning"""
+    # Single source of truth for intraday detection (Finnhub -> Polygon -> yfinance candles)
+    def detect_patterns_intraday(self, symbol: str, period: str = '1d', interval: str = '1m',
+                                 hist: Optional[pd.DataFrame] = None) -> List[PatternDetection]:
+        """Detect candlestick patterns using intraday candles for real-time scanning.
+        hist: optional pre-fetched intraday OHLCV (e.g. from bulk_intraday_history).
+        """
         try:
             # cooldown respect
             cd_until = self.cooldowns.get(symbol)
-            if cd_until and time.time() < cd_until:
+            if cd_until and time.monotonic() < cd_until:
                 return []
             # Prefer Finnhub intraday for equities, then Polygon, then yfinance
-            hist = None
-            if self.market_data._is_stock(symbol) and self.market_data.finnhub_key:
+            if hist is None and self.market_data._is_stock(symbol) and self.market_data.finnhub_key:
                 try:
                     hist = self.market_data._finnhub_history(symbol, resolution='1')
                 except Exception as e:
@@ -1266,33 +1992,27 @@ class PatternDetectionService:
 
             patterns: List[PatternDetection] = []
 
-            candles = []
-            for ts, row in hist.iterrows():
-                candles.append({
-                    'time': ts.isoformat() if hasattr(ts, 'isoformat') else str(ts),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume']) if not pd.isna(row['Volume']) else 0
-                })
+            candles = candles_from_frame(hist)
 
-            latest = hist.iloc[-1]
+            # Last-bar close/volume as scalars (positional access, no row Series)
+            price = float(hist['Close'].iat[-1])
+            volume = int(hist['Volume'].iat[-1]) if 'Volume' in hist.columns else 0
+            # One timestamp for the whole detection pass
+            detected_at = eat_now_iso()
 
             try:
                 # ATR on intraday if enough candles
                 atr_val = None
                 try:
                     if len(hist) >= 15:
-                        atr_ind = ta.volatility.AverageTrueRange(high=hist['High'], low=hist['Low'], close=hist['Close'], window=14)
-                        atr_val = float(atr_ind.average_true_range().iloc[-1])
+                        atr_val = frame_atr_last(hist, 14)
                 except Exception:
                     atr_val = None
-                ai_results = detect_all_patterns(candles)
+                ai_results = self._candle_patterns(symbol, interval, candles)
                 for r in ai_results:
                     name = r.get('name', 'AI Pattern')
                     conf = r.get('confidence', 0.7) or 0.7
-                    if any(name.lower() in p.lower() for p in prioritized_patterns):
+                    if is_prioritized(name):
                         conf = min(1.0, conf + 0.1)
                     low_name = (name or '').lower()
                     if 'bear' in low_name:
@@ -1307,17 +2027,18 @@ class PatternDetectionService:
                         symbol=symbol,
                         pattern_type=name,
                         confidence=float(conf),
-                        price=float(latest['Close']),
-                        volume=int(latest['Volume']) if 'Volume' in latest else 0,
-                        timestamp=to_eat_iso(datetime.now()),
+                        price=price,
+                        volume=volume,
+                        timestamp=detected_at,
                         metadata={
                             'source': 'intraday', 'interval': interval, 'period': period,
                             'timeframe': interval,
-                            'timestamp_eat': to_eat_iso(datetime.now()),
+                            'timestamp_eat': detected_at,
                             'explanation': r.get('explanation'),
                             'suggested_action': action,
                             'confidence_pct': round(float(conf) * 100.0, 1),
-                            'atr_14': atr_val
+                            'atr_14': atr_val,
+                            'risk_suggestions': _intraday_risk_suggestions(price, atr_val, action)
                         }
                     ))
             except Exception as _e:
@@ -1331,10 +2052,14 @@ class PatternDetectionService:
 # --------------------------------------
 # Risk confirmation token helpers
 # --------------------------------------
+# Keyed once; each signature copies the initialized HMAC state instead of re-deriving the key pads
+_TOKEN_HMAC = hmac.new((Config.SECRET_KEY or 'dev-secret-key-change-in-production').encode('utf-8'),
+                       digestmod=hashlib.sha256)
+
 def _sign_token(payload: str) -> str:
-    secret = (Config.SECRET_KEY or 'dev-secret-key-change-in-production').encode('utf-8')
-    sig = hmac.new(secret, payload.encode('utf-8'), hashlib.sha256).digest()
-    return base64.urlsafe_b64encode(sig).decode('utf-8').rstrip('=')
+    h = _TOKEN_HMAC.copy()
+    h.update(payload.encode('utf-8'))
+    return base64.urlsafe_b64encode(h.digest()).decode('utf-8').rstrip('=')
 
 def _gen_risk_token(symbol: str, side: str, entry: float, stop_loss: float, take_profit: float, qty: float, ttl_seconds: int = 300) -> str:
     exp = int(time.time()) + max(60, min(1800, ttl_seconds))
@@ -1364,7 +2089,7 @@ def _verify_risk_token(token: str, expected: Dict[str, Any]) -> bool:
         padding = '=' * (-len(p64) % 4)
         payload_bytes = base64.urlsafe_b64decode(p64 + padding)
         payload = payload_bytes.decode('utf-8')
-        if _sign_token(payload) != sig:
+        if not hmac.compare_digest(_sign_token(payload), sig):
             return False
         data = json.loads(payload)
         if int(data.get('exp', 0)) < int(time.time()):
@@ -1379,111 +2104,52 @@ def _verify_risk_token(token: str, expected: Dict[str, Any]) -> bool:
             try:
                 a = float(a or 0); b = float(b or 0)
                 if b == 0: return True
-                return abs(a - b) / max(1e-9, abs(b)) <= tol
-            except Exception:
-                return True
-        if not _within(data.get('entry'), expected.get('entry')):
-            return False
-        if not _within(data.get('sl'), expected.get('stop_loss')):
-            return False
-        if not _within(data.get('tp'), expected.get('take_profit')):
-            return False
-        return True
-    except Exception:
-        return False
-
-    def detect_patterns_intraday(self, symbol: str, period: str = '1d', interval: str = '1m') -> List[PatternDetection]:
-        """Detect candlestick patterns using intraday candles for real-time scanning"""
-        try:
-            yf_symbol = normalize_symbol_for_yf(symbol)
-            hist = self.market_data._safe_yf_history(yf_symbol, period=period, interval=interval)
-
-            if hist is None or hist.empty or len(hist) < 5:
-                return []
-
-            patterns: List[PatternDetection] = []
-
-            candles = []
-            for ts, row in hist.iterrows():
-                candles.append({
-                    'time': ts.isoformat() if hasattr(ts, 'isoformat') else str(ts),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume']) if not pd.isna(row['Volume']) else 0
-                })
-
-            latest = hist.iloc[-1]
-
-            try:
-                # ATR on intraday if enough candles
-                atr_val = None
-                try:
-                    if len(hist) >= 15:
-                        atr_ind = ta.volatility.AverageTrueRange(high=hist['High'], low=hist['Low'], close=hist['Close'], window=14)
-                        atr_val = float(atr_ind.average_true_range().iloc[-1])
-                except Exception:
-                    atr_val = None
-                ai_results = detect_all_patterns(candles)
-                for r in ai_results:
-                    name = r.get('name', 'AI Pattern')
-                    conf = r.get('confidence', 0.7) or 0.7
-                    if any(name.lower() in p.lower() for p in prioritized_patterns):
-                        conf = min(1.0, conf + 0.1)
-                    low_name = (name or '').lower()
-                    if 'bear' in low_name:
-                        action = 'SELL'
-                    elif 'bull' in low_name:
-                        action = 'BUY'
-                    elif name in {'Doji', 'Spinning Top'}:
-                        action = 'CONTINUATION'
-                    else:
-                        action = 'CONTINUATION'
-                    patterns.append(PatternDetection(
-                        symbol=symbol,
-                        pattern_type=name,
-                        confidence=float(conf),
-                        price=float(latest['Close']),
-                        volume=int(latest['Volume']) if 'Volume' in latest else 0,
-                        timestamp=to_eat_iso(datetime.now()),
-                        metadata={
-                            'source': 'intraday', 'interval': interval, 'period': period,
-                            'timeframe': interval,
-                            'timestamp_eat': to_eat_iso(datetime.now()),
-                            'explanation': r.get('explanation'),
-                            'suggested_action': action,
-                            'confidence_pct': round(float(conf) * 100.0, 1),
-                            'risk_suggestions': (lambda entry, atr: None if atr is None else {
-                                'entry': entry,
-                                'stop_loss': round(entry - 1.0 * atr, 6) if action == 'BUY' else round(entry + 1.0 * atr, 6),
-                                'take_profit': round(entry + 1.5 * atr, 6) if action == 'BUY' else round(entry - 1.5 * atr, 6),
-                                'rr': 1.5
-                            })(float(latest['Close']), atr_val)
-                        }
-                    ))
-            except Exception as _e:
-                logger.debug(f"AI pattern detection (intraday) skipped for {symbol}: {_e}")
+                return abs(a - b) / max(1e-9, abs(b)) <= tol
+            except Exception:
+                return True
+        if not _within(data.get('entry'), expected.get('entry')):
+            return False
+        if not _within(data.get('sl'), expected.get('stop_loss')):
+            return False
+        if not _within(data.get('tp'), expected.get('take_profit')):
+            return False
+        return True
+    except Exception:
+        return False
 
-            return patterns
-        except Exception as e:
-            logger.error(f"Intraday pattern detection failed for {symbol}: {e}")
-            return []
+def _load_headline_scorer():
+    """Polarity scorer for short headlines: VADER compound score, TextBlob if VADER is missing"""
+    try:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        analyzer = SentimentIntensityAnalyzer()
+        return lambda text: analyzer.polarity_scores(text)['compound']
+    except ImportError:
+        from textblob import TextBlob
+        return lambda text: TextBlob(text).sentiment.polarity
 
 # Sentiment Analysis Service
 class SentimentAnalysisService:
+    # Loaded on first use; shared across instances
+    _headline_scorer = None
+
+    @classmethod
+    def _headline_polarity(cls, text: str) -> float:
+        if cls._headline_scorer is None:
+            cls._headline_scorer = staticmethod(_load_headline_scorer())
+        return cls._headline_scorer(text)
+
     def __init__(self):
-        self.cache = {}
-        self.cache_timestamps = {}
+        # cache_key -> (monotonic deadline, result)
+        self.cache: Dict[str, Tuple[float, Any]] = {}
         
     def analyze_sentiment(self, symbol: str) -> Dict[str, Any]:
         """Analyze sentiment using news and social data"""
         cache_key = f"sentiment_{symbol}"
         
         # Check cache
-        if (cache_key in self.cache and 
-            time.time() - self.cache_timestamps.get(cache_key, 0) < Config.CACHE_DURATION * 5):
-            return self.cache[cache_key]
+        entry = self.cache.get(cache_key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
         
         try:
             # Get news data
@@ -1496,17 +2162,26 @@ class SentimentAnalysisService:
             
             # Analyze sentiment of news headlines
             sentiments = []
-            keywords = []
+            # First 10 distinct long words in headline order (dict keeps insertion order)
+            keywords: Dict[str, None] = {}
+            # Per-article polarity (0 for untitled), reused for news_impact below
+            article_polarity = []
             
             for article in news[:10]:  # Analyze top 10 articles
                 title = article.get('title', '')
+                polarity = 0.0
                 if title:
-                    blob = TextBlob(title)
-                    sentiments.append(blob.sentiment.polarity)
+                    polarity = self._headline_polarity(title)
+                    sentiments.append(polarity)
                     
                     # Extract keywords
-                    words = title.lower().split()
-                    keywords.extend([word for word in words if len(word) > 4])
+                    if len(keywords) < 10:
+                        for word in title.lower().split():
+                            if len(word) > 4:
+                                keywords.setdefault(word)
+                                if len(keywords) == 10:
+                                    break
+                article_polarity.append(polarity)
             
             avg_sentiment = np.mean(sentiments) if sentiments else 0
             
@@ -1529,16 +2204,15 @@ class SentimentAnalysisService:
                     {'platform': 'news', 'score': sentiment_score, 'volume': len(news)}
                 ],
                 'news_impact': [
-                    {'headline': article.get('title', ''), 'impact': abs(blob.sentiment.polarity) * 100}
-                    for article in news[:5]
+                    {'headline': article.get('title', ''), 'impact': abs(polarity) * 100}
+                    for article, polarity in zip(news[:5], article_polarity)
                 ],
-                'keywords': list(set(keywords))[:10],
-                'timestamp': datetime.now().isoformat()
+                'keywords': list(keywords),
+                'timestamp': now_iso()
             }
             
             # Cache the result
-            self.cache[cache_key] = result
-            self.cache_timestamps[cache_key] = time.time()
+            self.cache[cache_key] = (time.monotonic() + Config.CACHE_DURATION * 5, result)
             
             return result
             
@@ -1557,54 +2231,110 @@ class SentimentAnalysisService:
             ],
             'news_impact': [],
             'keywords': [],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
 
 # Paper Trading Service
 class PaperTradingService:
     def __init__(self, market_data_service: MarketDataService):
         self.market_data = market_data_service
-        self.positions = {}
-        self.trades_history = []
+        # In-memory positions stored column-wise: row i of each array belongs to _symbols[i]
+        self._symbols: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._qty = np.zeros(0)
+        self._avg_entry = np.zeros(0)
+        self._pnl = np.zeros(0)
+        self._position_meta: List[Dict[str, Any]] = []
+        # Bounded in-process trade log; ids come from a counter so eviction never reuses them
+        self.trades_history: deque = deque(maxlen=10000)
+        self._trade_ids = itertools.count(1)
+
+    @property
+    def positions(self) -> Dict[str, Dict[str, Any]]:
+        """In-memory positions as symbol -> dict (materialized for API responses)"""
+        return {
+            symbol: {
+                'quantity': float(qty),
+                'avg_entry': float(avg_entry),
+                'pnl': float(pnl),
+                **meta
+            }
+            for symbol, qty, avg_entry, pnl, meta in zip(
+                self._symbols, self._qty, self._avg_entry, self._pnl, self._position_meta
+            )
+        }
+
+    def _add_position(self, symbol: str, price: float, pattern: str, confidence: float,
+                      executed_at: str) -> int:
+        """Append a new zero-quantity position row and return its index"""
+        row = len(self._symbols)
+        self._symbols.append(symbol)
+        self._rows[symbol] = row
+        self._qty = np.append(self._qty, 0.0)
+        self._avg_entry = np.append(self._avg_entry, float(price))
+        self._pnl = np.append(self._pnl, 0.0)
+        self._position_meta.append({
+            'pattern': pattern,
+            'confidence': confidence,
+            'last_update': executed_at
+        })
+        return row
+
+    def _remove_position(self, symbol: str) -> None:
+        """Drop a position row, moving the last row into its slot"""
+        row = self._rows.pop(symbol)
+        last = len(self._symbols) - 1
+        if row != last:
+            moved = self._symbols[last]
+            self._symbols[row] = moved
+            self._rows[moved] = row
+            self._qty[row] = self._qty[last]
+            self._avg_entry[row] = self._avg_entry[last]
+            self._pnl[row] = self._pnl[last]
+            self._position_meta[row] = self._position_meta[last]
+        self._symbols.pop()
+        self._position_meta.pop()
+        self._qty = self._qty[:last]
+        self._avg_entry = self._avg_entry[:last]
+        self._pnl = self._pnl[:last]
         
     def get_portfolio(self) -> Dict[str, Any]:
         """Get current paper trading portfolio"""
         try:
             if db_available:
                 with Session() as session:
-                    trades = session.execute(text("""
-                        SELECT symbol, side, quantity, price, executed_at, status, pnl, pattern, confidence
-                        FROM paper_trades WHERE status = 'open'
-                    """)).fetchall()
-                    
-                    positions = {}
-                    for trade in trades:
-                        symbol = trade.symbol
-                        if symbol not in positions:
-                            positions[symbol] = {
-                                'quantity': 0,
-                                'avg_entry': 0,
-                                'pnl': 0,
-                                'pattern': trade.pattern,
-                                'confidence': trade.confidence,
-                                'last_update': trade.executed_at
-                            }
-                        
-                        qty = trade.quantity if trade.side == 'BUY' else -trade.quantity
-                        positions[symbol]['quantity'] += qty
-                        positions[symbol]['pnl'] += trade.pnl
-                        
-                        # Calculate average entry price
-                        if positions[symbol]['quantity'] != 0:
-                            positions[symbol]['avg_entry'] = trade.price
+                    # Aggregate per symbol in Postgres: signed quantity, volume-weighted
+                    # average entry and summed PnL (first trade's pattern/confidence kept)
+                    rows = session.execute(SELECT_PORTFOLIO).fetchall()
+
+                    positions = {
+                        row.symbol: {
+                            'quantity': row.quantity or 0,
+                            'avg_entry': row.avg_entry or 0,
+                            'pnl': row.pnl or 0,
+                            'pattern': row.pattern,
+                            'confidence': row.confidence,
+                            'last_update': row.last_update
+                        }
+                        for row in rows
+                    }
+                # Totals over column arrays, same as the in-memory book below
+                n = len(rows)
+                qty = np.fromiter((float(row.quantity or 0) for row in rows), dtype=np.float64, count=n)
+                avg_entry = np.fromiter((float(row.avg_entry or 0) for row in rows), dtype=np.float64, count=n)
+                pnl = np.fromiter((float(row.pnl or 0) for row in rows), dtype=np.float64, count=n)
+                total_pnl = float(pnl.sum())
+                total_value = float(np.abs(qty) @ avg_entry)
             else:
                 positions = self.positions
-                
+                total_pnl = float(self._pnl.sum())
+                total_value = float(np.abs(self._qty) @ self._avg_entry)
+
             return {
                 'positions': positions,
-                'total_pnl': sum(pos['pnl'] for pos in positions.values()),
-                'total_value': sum(abs(pos['quantity']) * pos['avg_entry'] for pos in positions.values()),
-                'timestamp': datetime.now().isoformat()
+                'total_pnl': total_pnl,
+                'total_value': total_value,
+                'timestamp': now_iso()
             }
             
         except Exception as e:
@@ -1622,17 +2352,14 @@ class PaperTradingService:
                     return {'success': False, 'error': 'Unable to get market price'}
                 price = market_data['price']
             
-            trade_id = len(self.trades_history) + 1
+            trade_id = next(self._trade_ids)
             executed_at = datetime.now().isoformat()
             
             # Store in database if available
             if db_available:
                 try:
                     with Session() as session:
-                        session.execute(text("""
-                            INSERT INTO tx.paper_trades (symbol, side, quantity, entry_price, executed_at, pattern_type, confidence, status)
-                            VALUES (:symbol, :side, :quantity, :price, :executed_at, :pattern, :confidence, 'OPEN')
-                        """), {
+                        session.execute(INSERT_TRADE, {
                             'symbol': symbol,
                             'side': side,
                             'quantity': quantity,
@@ -1646,19 +2373,13 @@ class PaperTradingService:
                     logger.error(f"Failed to store trade in database: {e}")
             
             # Update in-memory positions
-            if symbol not in self.positions:
-                self.positions[symbol] = {
-                    'quantity': 0,
-                    'avg_entry': price,
-                    'pnl': 0,
-                    'pattern': pattern,
-                    'confidence': confidence,
-                    'last_update': executed_at
-                }
-            
+            row = self._rows.get(symbol)
+            if row is None:
+                row = self._add_position(symbol, price, pattern, confidence, executed_at)
+
             qty_change = quantity if side == 'BUY' else -quantity
-            self.positions[symbol]['quantity'] += qty_change
-            self.positions[symbol]['last_update'] = executed_at
+            self._qty[row] += qty_change
+            self._position_meta[row]['last_update'] = executed_at
             
             # Add to trades history
             trade = {
@@ -1687,15 +2408,16 @@ class PaperTradingService:
         """Close a paper trading position"""
         try:
             if symbol:
-                if symbol in self.positions and self.positions[symbol]['quantity'] != 0:
+                row = self._rows.get(symbol)
+                if row is not None and self._qty[row] != 0:
                     current_price = self.market_data.get_stock_data(symbol)
                     if current_price:
                         price = current_price['price']
-                        quantity = abs(self.positions[symbol]['quantity'])
-                        side = 'SELL' if self.positions[symbol]['quantity'] > 0 else 'BUY'
+                        quantity = float(abs(self._qty[row]))
+                        side = 'SELL' if self._qty[row] > 0 else 'BUY'
                         
                         # Calculate PnL
-                        entry_price = self.positions[symbol]['avg_entry']
+                        entry_price = float(self._avg_entry[row])
                         if side == 'SELL':
                             pnl = (price - entry_price) * quantity
                         else:
@@ -1705,30 +2427,15 @@ class PaperTradingService:
                         if db_available:
                             with Session() as session:
                                 # Get trade details before closing
-                                trade_details = session.execute(text("""
-                                    SELECT symbol, entry_price, executed_at, pattern_type
-                                    FROM tx.paper_trades 
-                                    WHERE symbol = :symbol AND status = 'OPEN'
-                                    LIMIT 1
-                                """), {'symbol': symbol}).fetchone()
+                                trade_details = session.execute(SELECT_OPEN_TRADE, {'symbol': symbol}).fetchone()
                                 
                                 # Close the trade
-                                session.execute(text("""
-                                    UPDATE tx.paper_trades 
-                                    SET status = 'CLOSED', pnl = :pnl, exit_price = :price, closed_at = NOW()
-                                    WHERE symbol = :symbol AND status = 'OPEN'
-                                """), {'symbol': symbol, 'pnl': pnl, 'price': price})
+                                session.execute(CLOSE_TRADE, {'symbol': symbol, 'pnl': pnl, 'price': price})
                                 
                                 # Auto-log to trade_outcomes for ML training
                                 if trade_details:
                                     try:
-                                        session.execute(text("""
-                                            INSERT INTO trade_outcomes 
-                                            (symbol, pattern, entry_price, exit_price, pnl, quantity, 
-                                             timeframe, opened_at, closed_at, metadata)
-                                            VALUES (:symbol, :pattern, :entry_price, :exit_price, :pnl, :quantity,
-                                                    :timeframe, :opened_at, NOW(), :metadata)
-                                        """), {
+                                        session.execute(INSERT_TRADE_OUTCOME, {
                                             'symbol': symbol,
                                             'pattern': trade_details.pattern_type or 'Unknown',
                                             'entry_price': trade_details.entry_price,
@@ -1746,7 +2453,7 @@ class PaperTradingService:
                                 session.commit()
                         
                         # Remove from positions
-                        del self.positions[symbol]
+                        self._remove_position(symbol)
                         
                         return {
                             'success': True,
@@ -1764,251 +2471,248 @@ class PaperTradingService:
 class AlertService:
     def __init__(self, pattern_service: PatternDetectionService):
         self.pattern_service = pattern_service
-        self.active_alerts = []
-        # In-memory dedupe cache: key -> last_emit_ts
-        self.recent_alerts = {}
+        # Bounded in-memory fallback when the DB is unavailable (oldest alerts evicted first)
+        self.active_alerts: deque = deque(maxlen=Config.ACTIVE_ALERTS_MAX)
+        self._alert_ids = itertools.count(1)
+        # In-memory dedupe cache: (symbol, pattern) -> last emit (monotonic), least recently emitted first
+        self.recent_alerts: OrderedDict = OrderedDict()
         # Cooldown minutes before re-emitting same (symbol, pattern)
         self.dedupe_minutes = int(os.getenv('ALERT_DEDUPE_MINUTES', '10'))
+        self.cooldown_sec = self.dedupe_minutes * 60
+        # Scanner threads and generate_alerts share the dedupe cache
+        self._dedupe_lock = threading.Lock()
+        # (loaded_monotonic, alerts) served to readers for SNAPSHOT_SECONDS
+        self._snapshot: Optional[Tuple[float, Tuple[Alert, ...]]] = None
+        self._snapshot_lock = threading.RLock()
+
+    # Seconds an active-alerts snapshot is served before it is reloaded
+    SNAPSHOT_SECONDS = 5.0
 
-    def _now_iso(self):
-        return datetime.now().isoformat()
+    # Dedupe entries kept before the least recently emitted are evicted
+    RECENT_ALERTS_MAX = 1000
 
     def _should_emit(self, symbol: str, pattern_type: str) -> bool:
         """Return True if we should emit an alert for (symbol, pattern_type)."""
-        try:
-            key = f"{symbol}:{pattern_type}"
-            now = datetime.now()
-            last_iso = self.recent_alerts.get(key)
-            if last_iso:
-                try:
-                    last = datetime.fromisoformat(last_iso)
-                except Exception:
-                    last = now
-                if (now - last) < timedelta(minutes=self.dedupe_minutes):
-                    return False
-            # Update cache and opportunistically prune old entries
-            self.recent_alerts[key] = self._now_iso()
-            if len(self.recent_alerts) > 1000:
-                cutoff = now - timedelta(minutes=self.dedupe_minutes * 3)
-                self.recent_alerts = {k: v for k, v in self.recent_alerts.items() if datetime.fromisoformat(v) >= cutoff}
-            return True
-        except Exception:
-            # Fail-open to avoid blocking alerts
-            return True
+        key = (symbol, pattern_type)
+        now = time.monotonic()
+        with self._dedupe_lock:
+            last = self.recent_alerts.get(key)
+            if last is not None and now - last < self.cooldown_sec:
+                return False
+            self.recent_alerts[key] = now
+            self.recent_alerts.move_to_end(key)
+            while len(self.recent_alerts) > self.RECENT_ALERTS_MAX:
+                self.recent_alerts.popitem(last=False)
+        return True
         
     def generate_alerts(self, symbols: Optional[List[str]] = None) -> List[Alert]:
         """Generate alerts based on pattern detection. If symbols provided, only process that subset."""
         try:
-            symbols = symbols if symbols is not None else [s.strip() for s in Config.SCAN_SYMBOLS.split(',') if s.strip()]
+            symbols = symbols if symbols is not None else SCAN_SYMBOLS
             new_alerts = []
-            
-            for symbol in symbols:
-                patterns = self.pattern_service.detect_patterns(symbol)
-                
-                for pattern in patterns:
-                    if pattern.confidence >= Config.ALERT_CONFIDENCE_THRESHOLD:
-                        # Dedupe: skip same (symbol, pattern) within cooldown
-                        if not self._should_emit(pattern.symbol, pattern.pattern_type):
-                            logger.debug(f"Deduped alert for {pattern.symbol} / {pattern.pattern_type}")
-                            continue
+            pending_rows: List[Dict[str, Any]] = []
+
+            by_symbol = self.pattern_service.detect_patterns_bulk(symbols)
+            all_patterns = [p for symbol in symbols for p in by_symbol.get(symbol, ())]
+            confidences = np.fromiter((p.confidence for p in all_patterns), dtype=float, count=len(all_patterns))
+
+            # Threshold every detected pattern in one pass; only flagged ones enter the ML pipeline
+            for idx in np.flatnonzero(confidences >= Config.ALERT_CONFIDENCE_THRESHOLD):
+                pattern = all_patterns[idx]
+                # Dedupe: skip same (symbol, pattern) within cooldown
+                if not self._should_emit(pattern.symbol, pattern.pattern_type):
+                    logger.debug(f"Deduped alert for {pattern.symbol} / {pattern.pattern_type}")
+                    continue
 
-                        alert = Alert(
-                            id=len(self.active_alerts) + len(new_alerts) + 1,
-                            symbol=pattern.symbol,
-                            alert_type=pattern.pattern_type,
-                            message=f"{pattern.pattern_type} detected for {pattern.symbol} with {pattern.confidence:.1%} confidence",
-                            confidence=pattern.confidence,
-                            timestamp=pattern.timestamp,
-                            metadata=pattern.metadata or {}
-                        )
-                        new_alerts.append(alert)
+                alert = Alert(
+                    id=next(self._alert_ids),
+                    symbol=pattern.symbol,
+                    alert_type=pattern.pattern_type,
+                    message=f"{pattern.pattern_type} detected for {pattern.symbol} with {pattern.confidence:.1%} confidence",
+                    confidence=pattern.confidence,
+                    timestamp=pattern.timestamp,
+                    metadata=pattern.metadata or {}
+                )
+                new_alerts.append(alert)
+                
+                # ============================================
+                # ENHANCED ML PIPELINE: Multi-TF + Deep Learning + Sentiment
+                # ============================================
+                ml_info = {}
+                tf_score = None
+                
+                try:
+                    # Extract timeframe from pattern metadata
+                    _md = alert.metadata if isinstance(alert.metadata, dict) else (pattern.metadata or {})
+                    if isinstance(_md, dict):
+                        tf_score = _md.get('timeframe') or _md.get('tf') or _md.get('interval')
+                    tf_score = str(tf_score or '1h')
+                    
+                    # 1. DEEP LEARNING PATTERN DETECTION
+                    deep_patterns = None
+                    try:
+                        deep_res = detect_patterns_deep(alert.symbol, tf_score)
+                        if deep_res.get('success'):
+                            deep_patterns = deep_res.get('patterns', [])
+                            ml_info['deep_learning'] = {
+                                'detector': 'cnn_lstm',
+                                'patterns_detected': len(deep_patterns),
+                                'patterns': deep_patterns[:3]  # Top 3
+                            }
+                            logger.info(f"Deep learning detected {len(deep_patterns)} patterns for {alert.symbol}")
+                    except Exception as de:
+                        logger.debug(f"Deep detection failed: {de}")
+                        ml_info['deep_learning'] = {'error': str(de), 'available': False}
+                    
+                    # 2. MULTI-TIMEFRAME FUSION SCORING
+                    multi_tf_result = None
+                    try:
+                        # Determine market regime (can be enhanced with regime detector)
+                        regime = 'default'  # Can be: trending, ranging, volatile
+                        multi_tf_result = score_multi_timeframe(alert.symbol, score_symbol, regime)
                         
-                        # ============================================
-                        # ENHANCED ML PIPELINE: Multi-TF + Deep Learning + Sentiment
-                        # ============================================
-                        ml_info = {}
-                        tf_score = None
+                        if multi_tf_result.get('success'):
+                            ml_info['multi_timeframe'] = {
+                                'fused_score': multi_tf_result['fused_score'],
+                                'confidence': multi_tf_result['confidence'],
+                                'recommendation': multi_tf_result['recommendation'],
+                                'timeframe_breakdown': multi_tf_result['timeframe_breakdown'],
+                                'alignment_score': multi_tf_result['metadata'].get('alignment_score'),
+                                'divergence_detected': multi_tf_result['metadata'].get('divergence_detected')
+                            }
+                            logger.info(f"Multi-TF score for {alert.symbol}: {multi_tf_result['fused_score']:.2f} ({multi_tf_result['recommendation']})")
+                    except Exception as mte:
+                        logger.debug(f"Multi-TF fusion failed: {mte}")
+                        ml_info['multi_timeframe'] = {'error': str(mte)}
+                    
+                    # 3. SINGLE TIMEFRAME ML SCORE (existing)
+                    single_tf_ml = None
+                    try:
+                        ml_res = score_symbol(alert.symbol, timeframe=tf_score)
+                        single_tf_ml = ml_res
+                        ml_info['single_timeframe'] = ml_res
                         
-                        try:
-                            # Extract timeframe from pattern metadata
-                            _md = alert.metadata if isinstance(alert.metadata, dict) else (pattern.metadata or {})
-                            if isinstance(_md, dict):
-                                tf_score = _md.get('timeframe') or _md.get('tf') or _md.get('interval')
-                            tf_score = str(tf_score or '1h')
-                            
-                            # 1. DEEP LEARNING PATTERN DETECTION
-                            deep_patterns = None
-                            try:
-                                deep_res = detect_patterns_deep(alert.symbol, tf_score)
-                                if deep_res.get('success'):
-                                    deep_patterns = deep_res.get('patterns', [])
-                                    ml_info['deep_learning'] = {
-                                        'detector': 'cnn_lstm',
-                                        'patterns_detected': len(deep_patterns),
-                                        'patterns': deep_patterns[:3]  # Top 3
-                                    }
-                                    logger.info(f"Deep learning detected {len(deep_patterns)} patterns for {alert.symbol}")
-                            except Exception as de:
-                                logger.debug(f"Deep detection failed: {de}")
-                                ml_info['deep_learning'] = {'error': str(de), 'available': False}
-                            
-                            # 2. MULTI-TIMEFRAME FUSION SCORING
-                            multi_tf_result = None
-                            try:
-                                # Determine market regime (can be enhanced with regime detector)
-                                regime = 'default'  # Can be: trending, ranging, volatile
-                                multi_tf_result = score_multi_timeframe(alert.symbol, score_symbol, regime)
-                                
-                                if multi_tf_result.get('success'):
-                                    ml_info['multi_timeframe'] = {
-                                        'fused_score': multi_tf_result['fused_score'],
-                                        'confidence': multi_tf_result['confidence'],
-                                        'recommendation': multi_tf_result['recommendation'],
-                                        'timeframe_breakdown': multi_tf_result['timeframe_breakdown'],
-                                        'alignment_score': multi_tf_result['metadata'].get('alignment_score'),
-                                        'divergence_detected': multi_tf_result['metadata'].get('divergence_detected')
-                                    }
-                                    logger.info(f"Multi-TF score for {alert.symbol}: {multi_tf_result['fused_score']:.2f} ({multi_tf_result['recommendation']})")
-                            except Exception as mte:
-                                logger.debug(f"Multi-TF fusion failed: {mte}")
-                                ml_info['multi_timeframe'] = {'error': str(mte)}
-                            
-                            # 3. SINGLE TIMEFRAME ML SCORE (existing)
-                            single_tf_ml = None
-                            try:
-                                ml_res = score_symbol(alert.symbol, timeframe=tf_score)
-                                single_tf_ml = ml_res
-                                ml_info['single_timeframe'] = ml_res
-                                
-                                # Persist prediction if available
-                                pred = ml_res.get('prediction') or ml_res.get('score') or ml_res.get('prob') or ml_res.get('probability')
-                                if db_available and pred is not None:
-                                    try:
-                                        with engine.begin() as conn:
-                                            conn.execute(text(
-                                                """
-                                                INSERT INTO model_predictions (symbol, prediction)
-                                                VALUES (:symbol, :prediction)
-                                                """
-                                            ), { 'symbol': alert.symbol, 'prediction': float(pred) })
-                                    except Exception as pe:
-                                        logger.debug(f"model_predictions insert failed: {pe}")
-                            except Exception as me:
-                                logger.debug(f"Single TF ML score failed: {me}")
-                                ml_info['single_timeframe'] = {'error': str(me)}
-                            
-                            # 4. SENTIMENT INTEGRATION (if available)
+                        # Persist prediction if available
+                        pred = ml_res.get('prediction') or ml_res.get('score') or ml_res.get('prob') or ml_res.get('probability')
+                        if db_available and pred is not None:
                             try:
-                                from services.sentiment_analyzer import TXSentimentAnalyzer
-                                sentiment_analyzer = TXSentimentAnalyzer()
-                                sentiment = sentiment_analyzer.analyze_symbol_sentiment(alert.symbol)
-                                if sentiment:
-                                    ml_info['sentiment'] = {
-                                        'score': sentiment.overall_sentiment,
-                                        'confidence': sentiment.confidence,
-                                        'label': sentiment._get_sentiment_label(),
-                                        'volume': sentiment.volume,
-                                        'trending': sentiment.trending_score
-                                    }
-                            except Exception as se:
-                                logger.debug(f"Sentiment extraction failed: {se}")
-                            
-                            # 5. COMPOSITE QUALITY SCORE
-                            # Combine all signals into a single quality metric
-                            quality_score = pattern.confidence  # Start with pattern confidence
-                            quality_factors = []
-                            
-                            # Factor in multi-TF if available
-                            if multi_tf_result and multi_tf_result.get('success'):
-                                mtf_score = multi_tf_result['fused_score']
-                                quality_score = (quality_score * 0.4) + (mtf_score * 0.6)  # Weight multi-TF higher
-                                quality_factors.append(f"multi_tf={mtf_score:.2f}")
-                            
-                            # Factor in deep learning confirmation
-                            if deep_patterns:
-                                # Check if deep learning confirms the pattern
-                                deep_confirms = any(dp['pattern_type'] == pattern.pattern_type for dp in deep_patterns)
-                                if deep_confirms:
-                                    quality_score *= 1.15  # 15% boost for confirmation
-                                    quality_factors.append("deep_confirm=yes")
-                            
-                            # Factor in sentiment alignment
-                            if 'sentiment' in ml_info:
-                                sent_score = ml_info['sentiment']['score']
-                                # Bullish pattern + bullish sentiment = boost
-                                # Bearish pattern + bearish sentiment = boost
-                                pattern_bullish = 'BULL' in pattern.pattern_type.upper() or 'BOTTOM' in pattern.pattern_type.upper()
-                                pattern_bearish = 'BEAR' in pattern.pattern_type.upper() or 'TOP' in pattern.pattern_type.upper()
-                                
-                                if (pattern_bullish and sent_score > 0.2) or (pattern_bearish and sent_score < -0.2):
-                                    quality_score *= 1.10  # 10% boost for sentiment alignment
-                                    quality_factors.append(f"sentiment_aligned={sent_score:.2f}")
-                            
-                            # Cap at 1.0
-                            quality_score = min(1.0, quality_score)
-                            
-                            ml_info['composite_quality'] = {
-                                'score': quality_score,
-                                'factors': quality_factors,
-                                'original_confidence': pattern.confidence
+                                with engine.begin() as conn:
+                                    conn.execute(INSERT_MODEL_PREDICTION, { 'symbol': alert.symbol, 'prediction': float(pred) })
+                            except Exception as pe:
+                                logger.debug(f"model_predictions insert failed: {pe}")
+                    except Exception as me:
+                        logger.debug(f"Single TF ML score failed: {me}")
+                        ml_info['single_timeframe'] = {'error': str(me)}
+                    
+                    # 4. SENTIMENT INTEGRATION (if available)
+                    try:
+                        from services.sentiment_analyzer import TXSentimentAnalyzer
+                        sentiment_analyzer = TXSentimentAnalyzer()
+                        sentiment = sentiment_analyzer.analyze_symbol_sentiment(alert.symbol)
+                        if sentiment:
+                            ml_info['sentiment'] = {
+                                'score': sentiment.overall_sentiment,
+                                'confidence': sentiment.confidence,
+                                'label': sentiment._get_sentiment_label(),
+                                'volume': sentiment.volume,
+                                'trending': sentiment.trending_score
                             }
-                            
-                            # Update alert confidence with composite score
-                            alert.confidence = quality_score
-                            
-                            logger.info(f"Alert quality for {alert.symbol}: {quality_score:.2f} (factors: {', '.join(quality_factors)})")
-                            
-                        except Exception as pipeline_error:
-                            logger.error(f"ML pipeline error for {alert.symbol}: {pipeline_error}")
-                            ml_info['pipeline_error'] = str(pipeline_error)
+                    except Exception as se:
+                        logger.debug(f"Sentiment extraction failed: {se}")
+                    
+                    # 5. COMPOSITE QUALITY SCORE
+                    # Combine all signals into a single quality metric
+                    quality_score = pattern.confidence  # Start with pattern confidence
+                    quality_factors = []
+                    
+                    # Factor in multi-TF if available
+                    if multi_tf_result and multi_tf_result.get('success'):
+                        mtf_score = multi_tf_result['fused_score']
+                        quality_score = (quality_score * 0.4) + (mtf_score * 0.6)  # Weight multi-TF higher
+                        quality_factors.append(f"multi_tf={mtf_score:.2f}")
+                    
+                    # Factor in deep learning confirmation
+                    if deep_patterns:
+                        # Check if deep learning confirms the pattern
+                        deep_confirms = any(dp['pattern_type'] == pattern.pattern_type for dp in deep_patterns)
+                        if deep_confirms:
+                            quality_score *= 1.15  # 15% boost for confirmation
+                            quality_factors.append("deep_confirm=yes")
+                    
+                    # Factor in sentiment alignment
+                    if 'sentiment' in ml_info:
+                        sent_score = ml_info['sentiment']['score']
+                        # Bullish pattern + bullish sentiment = boost
+                        # Bearish pattern + bearish sentiment = boost
+                        pattern_bullish = 'BULL' in pattern.pattern_type.upper() or 'BOTTOM' in pattern.pattern_type.upper()
+                        pattern_bearish = 'BEAR' in pattern.pattern_type.upper() or 'TOP' in pattern.pattern_type.upper()
+                        
+                        if (pattern_bullish and sent_score > 0.2) or (pattern_bearish and sent_score < -0.2):
+                            quality_score *= 1.10  # 10% boost for sentiment alignment
+                            quality_factors.append(f"sentiment_aligned={sent_score:.2f}")
+                    
+                    # Cap at 1.0
+                    quality_score = min(1.0, quality_score)
+                    
+                    ml_info['composite_quality'] = {
+                        'score': quality_score,
+                        'factors': quality_factors,
+                        'original_confidence': pattern.confidence
+                    }
+                    
+                    # Update alert confidence with composite score
+                    alert.confidence = quality_score
+                    
+                    logger.info(f"Alert quality for {alert.symbol}: {quality_score:.2f} (factors: {', '.join(quality_factors)})")
+                    
+                except Exception as pipeline_error:
+                    logger.error(f"ML pipeline error for {alert.symbol}: {pipeline_error}")
+                    ml_info['pipeline_error'] = str(pipeline_error)
+
+                # Queue the DB row; all alerts of this pass are inserted together below
+                if db_available:
+                    # Merge enhanced ML info into metadata before insert
+                    _meta = pattern.metadata or {}
+                    meta_to_store = dict(_meta) if isinstance(_meta, dict) else {}
+
+                    # Add all ML enrichment data
+                    if ml_info:
+                        try:
+                            meta_to_store['ml_enhanced'] = ml_info
+                            # Add quality badge for frontend
+                            quality = ml_info.get('composite_quality', {}).get('score', pattern.confidence)
+                            if quality >= 0.85:
+                                meta_to_store['quality_badge'] = 'ELITE'
+                            elif quality >= 0.75:
+                                meta_to_store['quality_badge'] = 'HIGH'
+                            elif quality >= 0.65:
+                                meta_to_store['quality_badge'] = 'GOOD'
+                            else:
+                                meta_to_store['quality_badge'] = 'MODERATE'
+                        except Exception:
+                            pass
+                    try:
+                        pending_rows.append({
+                            'symbol': alert.symbol,
+                            'alert_type': alert.alert_type,
+                            'message': alert.message,
+                            'confidence': alert.confidence,
+                            'created_at': alert.timestamp,
+                            'metadata': json_codec.dumps(meta_to_store)
+                        })
+                    except Exception as e:
+                        logger.debug(f"Alert row skipped for {alert.symbol}: {e}")
+
+            # One executemany in one transaction (psycopg 3 pipelines it) instead of a commit per alert
+            if pending_rows:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(INSERT_ALERT, pending_rows)
+                except Exception as e:
+                    # PgBouncer in transaction pooling can still surface prepared-statement conflicts.
+                    # Do not spam logs at error level; alerts are emitted regardless.
+                    logger.debug(f"Alert DB insert skipped: {e}")
 
-                        # Store in database
-                        if db_available:
-                            try:
-                                with Session() as session:
-                                    # Merge enhanced ML info into metadata before insert
-                                    _meta = pattern.metadata or {}
-                                    try:
-                                        if isinstance(_meta, dict):
-                                            meta_to_store = dict(_meta)
-                                        else:
-                                            meta_to_store = {}
-                                    except Exception:
-                                        meta_to_store = {}
-                                    
-                                    # Add all ML enrichment data
-                                    if ml_info:
-                                        try:
-                                            meta_to_store['ml_enhanced'] = ml_info
-                                            # Add quality badge for frontend
-                                            quality = ml_info.get('composite_quality', {}).get('score', pattern.confidence)
-                                            if quality >= 0.85:
-                                                meta_to_store['quality_badge'] = 'ELITE'
-                                            elif quality >= 0.75:
-                                                meta_to_store['quality_badge'] = 'HIGH'
-                                            elif quality >= 0.65:
-                                                meta_to_store['quality_badge'] = 'GOOD'
-                                            else:
-                                                meta_to_store['quality_badge'] = 'MODERATE'
-                                        except Exception:
-                                            pass
-                                    session.execute(text("""
-                                        INSERT INTO alerts (symbol, alert_type, message, confidence, created_at, metadata)
-                                        VALUES (:symbol, :alert_type, :message, :confidence, :created_at, :metadata)
-                                    """), {
-                                        'symbol': alert.symbol,
-                                        'alert_type': alert.alert_type,
-                                        'message': alert.message,
-                                        'confidence': alert.confidence,
-                                        'created_at': alert.timestamp,
-                                        'metadata': json.dumps(meta_to_store)
-                                    })
-                                    session.commit()
-                            except Exception as e:
-                                # PgBouncer in transaction pooling can still surface prepared-statement conflicts.
-                                # Do not spam logs at error level; alerts are emitted regardless.
-                                logger.debug(f"Alert DB insert skipped: {e}")
-            
             self.active_alerts.extend(new_alerts)
             return new_alerts
             
@@ -2017,36 +2721,58 @@ class AlertService:
             return []
     
     def get_active_alerts(self) -> List[Alert]:
-        """Get all active alerts"""
+        """Get all active alerts (from the snapshot while it is fresh)"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot[0] < self.SNAPSHOT_SECONDS:
+            return list(snapshot[1])
+        return list(self.refresh_snapshot(force=False))
+
+    def refresh_snapshot(self, force: bool = True) -> Tuple[Alert, ...]:
+        """Reload active alerts and publish them as the current snapshot.
+        Without force, a snapshot another reader loaded while this one waited for the lock is reused,
+        so concurrent readers of a stale snapshot cause one query instead of one each.
+        """
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if not force and snapshot is not None and time.monotonic() - snapshot[0] < self.SNAPSHOT_SECONDS:
+                return snapshot[1]
+            alerts = tuple(self._load_active_alerts())
+            self._snapshot = (time.monotonic(), alerts)
+            return alerts
+
+    def invalidate_snapshot(self) -> None:
+        self._snapshot = None
+
+    def _load_active_alerts(self) -> List[Alert]:
         try:
             if db_available:
                 with Session() as session:
-                    alerts = session.execute(text("""
-                        SELECT id, symbol, alert_type, message, confidence, created_at, metadata
-                        FROM alerts WHERE is_active = true
-                        ORDER BY created_at DESC LIMIT 50
-                    """)).fetchall()
+                    # Served by the alerts_active_created_idx partial index: no sort, 50 rows read
+                    rows = session.execute(SELECT_ACTIVE_ALERTS).mappings().fetchmany(50)
                     
                     result = []
-                    for row in alerts:
+                    for row in rows:
+                        raw = row['metadata']
                         try:
-                            metadata = row.metadata if isinstance(row.metadata, dict) else json.loads(row.metadata) if row.metadata else {}
+                            metadata = raw if isinstance(raw, dict) else json_codec.loads(raw) if raw else {}
                         except Exception:
                             metadata = {}
+                        created_at = row['created_at']
                         alert = Alert(
-                            id=row.id,
-                            symbol=row.symbol,
-                            alert_type=row.alert_type,
-                            message=row.message,
-                            confidence=row.confidence,
-                            timestamp=row.created_at.isoformat() if hasattr(row.created_at, 'isoformat') else str(row.created_at)
+                            id=row['id'],
+                            symbol=row['symbol'],
+                            alert_type=row['alert_type'],
+                            message=row['message'],
+                            confidence=row['confidence'],
+                            timestamp=created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
                         )
                         if metadata:
                             alert.metadata = metadata
                         result.append(alert)
                     return result
             else:
-                return self.active_alerts[-50:]  # Return last 50 alerts
+                # Return last 50 alerts
+                return list(itertools.islice(self.active_alerts, max(0, len(self.active_alerts) - 50), None))
                 
         except Exception as e:
             logger.error(f"Failed to get active alerts: {e}")
@@ -2071,43 +2797,50 @@ paper_trading_service = PaperTradingService(market_data_service)
 alert_service = AlertService(pattern_service)
 
 # Background worker for scanning and alerts (with batching/rotation)
-background_scan_offset = 0
-def background_scanner():
-    """Background worker for continuous market scanning"""
+# Rotation over the scan universe; each tick takes the next batch from it
+_SCAN_CYCLE = itertools.cycle(SCAN_SYMBOLS)
+def background_scanner(emitter: Optional[SocketIO] = None):
+    """Background worker for continuous market scanning
+
+    emitter: Socket.IO instance used for events; worker.py passes a
+    message-queue-only instance when scanning outside the web process.
+    """
+    sio = emitter or socketio
+    # Config is read once at import; the batch size never changes while the worker runs
+    all_symbols = SCAN_SYMBOLS
+    batch_size = min(max(1, Config.SCAN_BATCH_SIZE), len(all_symbols))
     while True:
         try:
             logger.info("Running background market scan...")
-            # Determine batch
-            all_symbols = [s.strip() for s in Config.SCAN_SYMBOLS.split(',') if s.strip()]
-            batch_size = max(1, int(Config.SCAN_BATCH_SIZE))
             if not all_symbols:
                 time.sleep(Config.BACKEND_SCAN_INTERVAL)
                 continue
-            global background_scan_offset
-            start = background_scan_offset
-            end = start + batch_size
-            if end <= len(all_symbols):
-                batch = all_symbols[start:end]
-            else:
-                batch = all_symbols[start:] + all_symbols[:(end % len(all_symbols))]
-            background_scan_offset = (end) % len(all_symbols)
+            batch = list(itertools.islice(_SCAN_CYCLE, batch_size))
 
             logger.info(f"Background scan batch: {batch} (size {len(batch)}/{len(all_symbols)})")
 
             # Generate new alerts for this batch
             new_alerts = alert_service.generate_alerts(batch)
-            
+            alert_payloads = [alert.to_dict() for alert in new_alerts]
             if new_alerts:
                 logger.info(f"Generated {len(new_alerts)} new alerts")
-                
-                # Emit alerts via WebSocket
-                for alert in new_alerts:
-                    socketio.emit('new_alert', asdict(alert))
-            
+                alert_service.refresh_snapshot()
+
             # Update market scan data
             scan_data = market_data_service.get_market_scan(symbols_override=batch)
-            if scan_data:
-                socketio.emit('market_scan_update', {'data': scan_data})
+
+            # One frame per tick carrying both the alerts batch and the scan snapshot
+            if alert_payloads or scan_data:
+                sio.emit('scan_tick', {
+                    'alerts': alert_payloads,
+                    'market_scan': scan_data or [],
+                    'timestamp': now_iso()
+                }, to=[ALERTS_ROOM, SCAN_RESULTS_ROOM])
+            if Config.EMIT_LEGACY_SOCKET_EVENTS:
+                for payload in alert_payloads:
+                    sio.emit('new_alert', payload, to=ALERTS_ROOM)
+                if scan_data:
+                    sio.emit('market_scan_update', {'data': scan_data}, to=SCAN_RESULTS_ROOM)
             
             time.sleep(Config.BACKEND_SCAN_INTERVAL)
             
@@ -2115,11 +2848,46 @@ def background_scanner():
             logger.error(f"Background scanner error: {e}")
             time.sleep(60)  # Wait 1 minute before retrying
 
+_pattern_stats_lock = threading.Lock()
+# Monotonic time of this process's last pattern_stats_24h refresh
+_pattern_stats_refreshed = 0.0
+
+def refresh_pattern_stats_view(max_age: float = 0.0) -> None:
+    """Refresh pattern_stats_24h unless this process refreshed it within max_age seconds
+    (or another thread is refreshing it right now)
+    """
+    global _pattern_stats_refreshed
+    if not _pattern_stats_lock.acquire(blocking=False):
+        return
+    try:
+        if max_age and time.monotonic() - _pattern_stats_refreshed < max_age:
+            return
+        with Session() as session:
+            session.execute(REFRESH_PATTERN_STATS)
+            session.commit()
+        _pattern_stats_refreshed = time.monotonic()
+    finally:
+        _pattern_stats_lock.release()
+
+def refresh_pattern_stats():
+    """Periodically refresh the pattern_stats_24h materialized view"""
+    while True:
+        try:
+            if db_available:
+                refresh_pattern_stats_view()
+        except Exception as e:
+            logger.error(f"Pattern stats refresh error: {e}")
+        time.sleep(Config.PATTERN_STATS_REFRESH_SECONDS)
+
 # Start background worker if enabled
 if Config.ENABLE_BACKGROUND_WORKERS:
-    scanner_thread = threading.Thread(target=background_scanner, daemon=True)
-    scanner_thread.start()
-    logger.info("Background scanner started")
+    if Config.RUN_SCANNER:
+        scanner_thread = threading.Thread(target=background_scanner, daemon=True)
+        scanner_thread.start()
+        threading.Thread(target=refresh_pattern_stats, daemon=True).start()
+        logger.info("Background scanner started")
+    else:
+        logger.info("Background scanner disabled in this process (RUN_SCANNER=false)")
 
     # Start auto-label worker if enabled
     if Config.AUTO_LABEL_FROM_ALERTS:
@@ -2318,7 +3086,7 @@ if Config.ENABLE_BACKGROUND_WORKERS:
                                         # mark alert as processed
                                         try:
                                             with engine.begin() as conn:
-                                                conn.execute(text("UPDATE alerts SET processed=true WHERE id=:id"), { 'id': r.id })
+                                                conn.execute(MARK_ALERT_PROCESSED, { 'id': r.id })
                                         except Exception as ue:
                                             logger.debug(f"Mark processed failed: {ue}")
                                         logger.info(f"Auto-labeled outcome for {symbol} {alert_type} at {created_at} -> {hit_reason} pnl {pnl:.4f}")
@@ -2411,7 +3179,7 @@ if Config.ENABLE_OPENAPI:
 @app.route('/health')
 @limiter.exempt
 def health():
-    return jsonify({'status': 'ok', 'timestamp': datetime.now().isoformat()})
+    return jsonify({'status': 'ok', 'timestamp': now_iso()})
 
 @app.route('/api/provider-health')
 @limiter.limit("20 per minute")
@@ -2444,7 +3212,7 @@ def provider_health():
             checks['polygon'] = {'ok': False, 'error': 'no_api_key'}
     except Exception as e:
         checks['polygon'] = {'ok': False, 'error': str(e)}
-    return jsonify({'success': True, 'data': checks, 'timestamp': datetime.now().isoformat()})
+    return jsonify({'success': True, 'data': checks, 'timestamp': now_iso()})
 
 @app.route('/api/workers/health')
 @limiter.limit("30 per minute")
@@ -2455,7 +3223,7 @@ def workers_health():
         'live_scanner_active': scanning_flag,
         'scanning_status': status,
         'background_workers_enabled': bool(Config.ENABLE_BACKGROUND_WORKERS)
-    }, 'timestamp': datetime.now().isoformat()})
+    }, 'timestamp': now_iso()})
 
 @app.route('/api/pattern-performance')
 @limiter.limit("20 per minute")
@@ -2479,7 +3247,7 @@ def pattern_performance():
                 results['by_pattern'] = [{'pattern': r.pattern_type, 'detections': int(r.detections or 0), 'avg_confidence': float(r.avg_conf or 0)} for r in rows]
                 rows2 = session.execute(text(f"SELECT symbol, COUNT(*) detections, AVG(confidence) avg_conf FROM pattern_detections WHERE {base_where} GROUP BY symbol ORDER BY detections DESC LIMIT 25"), params).fetchall()
                 results['by_symbol'] = [{'symbol': r.symbol, 'detections': int(r.detections or 0), 'avg_confidence': float(r.avg_conf or 0)} for r in rows2]
-        return jsonify({'success': True, 'data': results, 'meta': {'window_days': window_days, 'pattern': pattern, 'symbol': symbol}, 'timestamp': datetime.now().isoformat()})
+        return jsonify({'success': True, 'data': results, 'meta': {'window_days': window_days, 'pattern': pattern, 'symbol': symbol}, 'timestamp': now_iso()})
     except Exception as e:
         logger.error(f"pattern_performance error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2553,7 +3321,7 @@ def pattern_performance_summary():
                 'outcomes': outcomes
             },
             'meta': {'window_days': q.window, 'pattern': q.pattern, 'symbol': q.symbol},
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     except Exception as e:
         logger.error(f"pattern_performance_summary error: {e}")
@@ -2854,7 +3622,7 @@ def index():
         'service': 'TX Trade Whisperer Backend',
         'version': '2.0.0',
         'database': 'connected' if db_available else 'demo_mode',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     })
 
 @app.route('/health')
@@ -2866,7 +3634,7 @@ def health_check():
         'service': 'TX Trade Whisperer Backend',
         'version': '2.0.0',
         'database': 'connected' if db_available else 'demo_mode',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     })
 
 @app.route('/health/detailed')
@@ -2879,7 +3647,7 @@ def health_detailed():
         'status': 'healthy',
         'service': 'TX Trade Whisperer Backend',
         'version': '2.0.0',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso(),
         'components': {}
     }
     
@@ -2999,42 +3767,36 @@ def health_detailed():
 # --------------------------------------
 # Production Error Handlers
 # --------------------------------------
+# Error bodies are constant: serialize once, build only the Response per request
+# (a fresh Response each time, since after_request hooks/CORS mutate its headers)
+def _error_body(error: str, message: str) -> bytes:
+    return app.json.dumps({'success': False, 'error': error, 'message': message}).encode('utf-8')
+
+_ERR_404_BODY = _error_body('Endpoint not found', 'The requested endpoint does not exist')
+_ERR_405_BODY = _error_body('Method not allowed', 'The HTTP method is not allowed for this endpoint')
+_ERR_429_BODY = _error_body('Rate limit exceeded', 'Too many requests. Please try again later.')
+_ERR_500_BODY = _error_body('Internal server error', 'An unexpected error occurred. Please try again later.')
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({
-        'success': False,
-        'error': 'Endpoint not found',
-        'message': 'The requested endpoint does not exist'
-    }), 404
+    return Response(_ERR_404_BODY, status=404, mimetype='application/json')
 
 @app.errorhandler(405)
 def method_not_allowed(error):
     """Handle 405 errors"""
-    return jsonify({
-        'success': False,
-        'error': 'Method not allowed',
-        'message': 'The HTTP method is not allowed for this endpoint'
-    }), 405
+    return Response(_ERR_405_BODY, status=405, mimetype='application/json')
 
 @app.errorhandler(429)
 def rate_limit_exceeded(error):
     """Handle rate limit errors"""
-    return jsonify({
-        'success': False,
-        'error': 'Rate limit exceeded',
-        'message': 'Too many requests. Please try again later.'
-    }), 429
+    return Response(_ERR_429_BODY, status=429, mimetype='application/json')
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
     logger.error(f"Internal server error: {error}")
-    return jsonify({
-        'success': False,
-        'error': 'Internal server error',
-        'message': 'An unexpected error occurred. Please try again later.'
-    }), 500
+    return Response(_ERR_500_BODY, status=500, mimetype='application/json')
 
 @app.errorhandler(Exception)
 def handle_exception(error):
@@ -3049,40 +3811,49 @@ def handle_exception(error):
             'type': type(error).__name__
         }), 500
     else:
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error',
-            'message': 'An unexpected error occurred. Please try again later.'
-        }), 500
+        return Response(_ERR_500_BODY, status=500, mimetype='application/json')
 
 # --------------------------------------
 # Security Headers Middleware
 # --------------------------------------
-@app.after_request
-def add_security_headers(response):
-    """Add security headers to all responses"""
+# Header values are fixed for the process lifetime; built once instead of per response
+_SECURITY_HEADERS: Tuple[Tuple[str, str], ...] = (
     # Prevent clickjacking
-    response.headers['X-Frame-Options'] = 'DENY'
+    ('X-Frame-Options', 'DENY'),
     # Prevent MIME type sniffing
-    response.headers['X-Content-Type-Options'] = 'nosniff'
+    ('X-Content-Type-Options', 'nosniff'),
     # Enable XSS protection
-    response.headers['X-XSS-Protection'] = '1; mode=block'
+    ('X-XSS-Protection', '1; mode=block'),
     # Referrer policy
-    response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-    # Content Security Policy (adjust as needed)
-    if not Config.DEBUG:
-        response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
+    ('Referrer-Policy', 'strict-origin-when-cross-origin'),
+) + ((
+    ('Strict-Transport-Security', 'max-age=31536000; includeSubDomains'),
+) if not Config.DEBUG else ())
+
+@app.after_request
+def add_security_headers(response):
+    """Add security headers to all responses"""
+    headers = response.headers
+    for name, value in _SECURITY_HEADERS:
+        headers[name] = value
     return response
 
 # Market Data Endpoints
+def _market_scan_response(scan_type: str) -> Response:
+    """Scan results are stale-tolerant: share them across requests/workers for 10s"""
+    return _cached_json_response(
+        f"market_scan:{scan_type[:32]}", 10,
+        lambda: {'success': True, 'data': market_data_service.get_market_scan(scan_type)},
+        max_age=10
+    )
+
 @app.route('/api/market-scan')
 @limiter.limit("30 per minute")
 def market_scan():
     """Get market scan data"""
     try:
         scan_type = request.args.get('type', 'trending')
-        data = market_data_service.get_market_scan(scan_type)
-        return jsonify({'success': True, 'data': data})
+        return _market_scan_response(scan_type)
     except Exception as e:
         logger.exception("Market scan failed")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -3117,8 +3888,7 @@ def market_scan_alt():
     """Alternative market scan endpoint"""
     try:
         scan_type = request.args.get('type', 'trending')
-        data = market_data_service.get_market_scan(scan_type)
-        return jsonify({'success': True, 'data': data})
+        return _market_scan_response(scan_type)
     except Exception as e:
         logger.error(f"Market scan error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -3154,17 +3924,8 @@ def get_candles():
         if hist is None or hist.empty:
             return jsonify({'success': False, 'error': 'No data found for symbol'}), 404
         
-        # Convert to candlestick format
-        candles = []
-        for timestamp, row in hist.iterrows():
-            candles.append({
-                'timestamp': timestamp.isoformat(),
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
+        # Convert to candlestick format from column arrays
+        candles = candles_from_frame(hist, time_key='timestamp')
         
         return jsonify({
             'success': True,
@@ -3196,116 +3957,135 @@ def start_live_scanning():
         
         def live_scanner():
             global scanning_status
-            # rotating index for batching
-            idx = 0
+            # rotation for batching; the batch size is fixed for the life of the scan
+            rotation = itertools.cycle(symbols)
+            batch_size = max(1, Config.SCAN_BATCH_SIZE)
+            whole_batch = batch_size >= len(symbols)
+
+            def _scan_one(symbol: str, hist: Optional[pd.DataFrame]) -> Tuple[List[PatternDetection], List[PatternDetection]]:
+                """(intraday, context) detections for one symbol; runs on _scan_pool"""
+                # Intraday 1m candles for real-time candlestick detections
+                intraday = pattern_service.detect_patterns_intraday(symbol, period='1d', interval='1m', hist=hist)
+                # 3-month context window for technical indicators and confirmation
+                return intraday, pattern_service.detect_patterns(symbol)
+
             while scanning_active:
                 try:
                     if not symbols:
                         time.sleep(scan_interval)
                         continue
-                    batch_size = max(1, int(Config.SCAN_BATCH_SIZE))
-                    if batch_size >= len(symbols):
+                    if whole_batch:
                         batch = symbols
                     else:
-                        end = idx + batch_size
-                        if end <= len(symbols):
-                            batch = symbols[idx:end]
-                        else:
-                            batch = symbols[idx:] + symbols[:(end % len(symbols))]
-                        idx = end % len(symbols)
+                        batch = list(itertools.islice(rotation, batch_size))
 
                     logger.info(f"Live scanner tick: scanning {len(batch)}/{len(symbols)} symbols every {scan_interval}s")
                     patterns_found = 0
+                    # One timestamp for every frame and status update of this tick
+                    tick_iso = now_iso()
+                    # yfinance-served intraday candles for the whole batch in one request
+                    intraday_hist = pattern_service.bulk_intraday_history(batch, period='1d', interval='1m')
+                    futures = {}
                     for symbol in batch:
-                        if not scanning_active:
-                            break
                         # Skip symbols under cooldown (from market data fetches)
                         cd_until = market_data_service.cooldowns.get(symbol)
-                        if cd_until and time.time() < cd_until:
-                            logger.debug(f"Skipping {symbol} due to cooldown until {datetime.fromtimestamp(cd_until).isoformat()}")
+                        if cd_until and time.monotonic() < cd_until:
+                            logger.debug(f"Skipping {symbol} due to cooldown ({cd_until - time.monotonic():.0f}s left)")
+                            continue
+                        futures[_scan_pool.submit(_scan_one, symbol, intraday_hist.get(symbol))] = symbol
+                    # Symbols are detected concurrently; results are emitted/persisted here as each one finishes
+                    for fut in as_completed(futures):
+                        if not scanning_active:
+                            # The pool is shared across scans, so drop the queued work instead of shutting it down
+                            for pending in futures:
+                                pending.cancel()
+                            break
+                        symbol = futures[fut]
+                        try:
+                            intraday_patterns, context_patterns = fut.result()
+                        except Exception as scan_e:
+                            logger.warning(f"Live scan failed for {symbol}: {scan_e}")
                             continue
-                        # Intraday 1m candles for real-time candlestick detections
-                        intraday_patterns = pattern_service.detect_patterns_intraday(symbol, period='1d', interval='1m')
-                        # 3-month context window for technical indicators and confirmation
-                        context_patterns = pattern_service.detect_patterns(symbol)
 
                         patterns_found += len(intraday_patterns) + len(context_patterns)
 
-                        # per-symbol jitter to avoid burst traffic
-                        time.sleep(0.15 + random.uniform(0, 0.2))
-
                         # Emit real-time updates with both intraday and context results
                         if intraday_patterns or context_patterns:
-                            def _with_pct(ps):
-                                out = []
-                                for _p in ps:
-                                    d = asdict(_p)
-                                    d['confidence_pct'] = round(float(d.get('confidence', 0)) * 100.0, 1)
-                                    out.append(d)
-                                return out
-
                             socketio.emit('scan_update', {
                                 'symbol': symbol,
-                                'intraday_patterns': _with_pct(intraday_patterns),
-                                'context_patterns': _with_pct(context_patterns),
-                                'timestamp': datetime.now().isoformat()
-                            })
+                                'intraday_patterns': [with_confidence_pct(p) for p in intraday_patterns],
+                                'context_patterns': [with_confidence_pct(p) for p in context_patterns],
+                                'timestamp': tick_iso
+                            }, to=SCAN_RESULTS_ROOM)
 
                         # Auto-emit alerts for high-confidence detections
                         if auto_alerts:
-                            def _emit_alert(pat: PatternDetection):
+                            def _build_alert(pat: PatternDetection) -> Optional[Dict[str, Any]]:
+                                """Alert payload for pat, or None below the threshold / within the dedupe cooldown"""
                                 try:
-                                    if float(pat.confidence) >= Config.ALERT_CONFIDENCE_THRESHOLD:
-                                        # Dedupe: skip same (symbol, pattern) within cooldown
-                                        if not alert_service._should_emit(pat.symbol, pat.pattern_type):
-                                            logger.debug(f"Deduped live alert for {pat.symbol} / {pat.pattern_type}")
-                                            return
-                                        payload = {
-                                            'symbol': pat.symbol,
-                                            'alert_type': pat.pattern_type,
-                                            'confidence': float(pat.confidence),
-                                            'confidence_pct': round(float(pat.confidence) * 100.0, 1),
-                                            'price': float(pat.price),
-                                            'timestamp': pat.timestamp,
-                                            'source': (pat.metadata or {}).get('source', 'scanner'),
-                                            'explanation': (pat.metadata or {}).get('explanation'),
-                                            'interval': (pat.metadata or {}).get('interval'),
-                                            'period': (pat.metadata or {}).get('period')
-                                        }
-                                        socketio.emit('pattern_alert', payload)
-                                        # Optional: persist alert if DB available
-                                        if db_available:
-                                            try:
-                                                with engine.begin() as conn:
-                                                    conn.execute(text("""
-                                                        INSERT INTO alerts (symbol, alert_type, confidence, is_active, created_at, metadata)
-                                                        VALUES (:symbol, :atype, :conf, true, NOW(), :metadata::jsonb)
-                                                    """), {
-                                                        'symbol': pat.symbol,
-                                                        'atype': pat.pattern_type,
-                                                        'conf': float(pat.confidence),
-                                                        'metadata': json.dumps({
-                                                            'source': payload.get('source'),
-                                                            'explanation': payload.get('explanation'),
-                                                            'interval': payload.get('interval'),
-                                                            'period': payload.get('period'),
-                                                            'scanner_sentiment': tx_sentiment_analyzer.analyze_symbol_sentiment(pat.symbol.lower()).to_dict()
-                                                        })
-                                                    })
-                                            except Exception as db_e:
-                                                logger.debug(f"Alert DB insert skipped: {db_e}")
+                                    if float(pat.confidence) < Config.ALERT_CONFIDENCE_THRESHOLD:
+                                        return None
+                                    # Dedupe: skip same (symbol, pattern) within cooldown
+                                    if not alert_service._should_emit(pat.symbol, pat.pattern_type):
+                                        logger.debug(f"Deduped live alert for {pat.symbol} / {pat.pattern_type}")
+                                        return None
+                                    meta = pat.metadata or {}
+                                    return {
+                                        'symbol': pat.symbol,
+                                        'alert_type': pat.pattern_type,
+                                        'confidence': float(pat.confidence),
+                                        'confidence_pct': round(float(pat.confidence) * 100.0, 1),
+                                        'price': float(pat.price),
+                                        'timestamp': pat.timestamp,
+                                        'source': meta.get('source', 'scanner'),
+                                        'explanation': meta.get('explanation'),
+                                        'interval': meta.get('interval'),
+                                        'period': meta.get('period')
+                                    }
                                 except Exception as ee:
                                     logger.debug(f"Emit alert error: {ee}")
-
-                            for pat in intraday_patterns:
-                                _emit_alert(pat)
-                            for pat in context_patterns:
-                                _emit_alert(pat)
+                                    return None
+
+                            alert_payloads = [
+                                payload for payload in map(_build_alert, itertools.chain(intraday_patterns, context_patterns))
+                                if payload
+                            ]
+                            # One frame per symbol carrying all of its new alerts
+                            if alert_payloads:
+                                socketio.emit('pattern_alerts', {
+                                    'symbol': symbol,
+                                    'alerts': alert_payloads,
+                                    'timestamp': tick_iso
+                                }, to=ALERTS_ROOM)
+                                if Config.EMIT_LEGACY_SOCKET_EVENTS:
+                                    for payload in alert_payloads:
+                                        socketio.emit('pattern_alert', payload, to=ALERTS_ROOM)
+                            # Optional: persist alerts if DB available; sentiment is looked up once per symbol
+                            # and all rows go in one executemany/transaction
+                            if alert_payloads and db_available:
+                                try:
+                                    sentiment_doc = tx_sentiment_analyzer.analyze_symbol_sentiment(symbol.lower()).to_dict()
+                                    rows = [{
+                                        'symbol': payload['symbol'],
+                                        'atype': payload['alert_type'],
+                                        'conf': payload['confidence'],
+                                        'metadata': json_codec.dumps({
+                                            'source': payload['source'],
+                                            'explanation': payload['explanation'],
+                                            'interval': payload['interval'],
+                                            'period': payload['period'],
+                                            'scanner_sentiment': sentiment_doc
+                                        })
+                                    } for payload in alert_payloads]
+                                    with engine.begin() as conn:
+                                        conn.execute(INSERT_SCANNER_ALERT, rows)
+                                except Exception as db_e:
+                                    logger.debug(f"Alert DB insert skipped: {db_e}")
                     
                     scanning_status.update({
                         'symbols_scanned': len(batch),
                         'patterns_found': patterns_found,
-                        'last_scan': datetime.now().isoformat()
+                        'last_scan': tick_iso
                     })
                     
                     # Stagger next cycle with small jitter to avoid bursts
@@ -3391,7 +4171,7 @@ def get_scan_config():
                 'defaults': SCAN_DEFAULTS,
                 'status': scanning_status
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     except Exception as e:
         logger.error(f"Get scan config error: {e}")
@@ -3424,7 +4204,7 @@ def set_scan_config():
             'message': 'Scan defaults updated',
             'updated': updated,
             'defaults': SCAN_DEFAULTS,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     except Exception as e:
         logger.error(f"Set scan config error: {e}")
@@ -3452,7 +4232,7 @@ def detect_patterns_endpoint():
                 'symbol': symbol,
                 'patterns': patterns,
                 'count': len(patterns),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
         })
         
@@ -3460,38 +4240,57 @@ def detect_patterns_endpoint():
         logger.error(f"Pattern detection error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _cached_json_response(key: str, ttl: int, build, max_age: Optional[int] = None) -> Response:
+    """Serve build()'s JSON payload from the shared response cache, refreshing it every ttl seconds.
+    With max_age the response is also cacheable by clients (ETag + Cache-Control, 304 on match).
+    """
+    body = response_cache.get(key)
+    if body is None:
+        body = app.json.dumps(build()).encode('utf-8')
+        response_cache.set(key, body, ttl)
+    response = Response(body, mimetype='application/json')
+    if max_age is not None:
+        response.set_etag(hashlib.md5(body).hexdigest())
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response = response.make_conditional(request)
+    return response
+
 @app.route('/api/pattern-stats')
 @limiter.limit("10 per minute")
 def pattern_stats():
     """Get pattern detection statistics"""
     try:
         if db_available:
-            with Session() as session:
-                stats = session.execute(text("""
-                    SELECT pattern_type, COUNT(*) as count, AVG(confidence) as avg_confidence
-                    FROM pattern_detections 
-                    WHERE detected_at > NOW() - INTERVAL '24 hours'
-                    GROUP BY pattern_type
-                """)).fetchall()
-                
-                pattern_stats = [
-                    {
-                        'pattern': stat.pattern_type,
-                        'count': stat.count,
-                        'avg_confidence': float(stat.avg_confidence)
-                    }
-                    for stat in stats
-                ]
-        else:
-            # No database available: return empty list (no mock data)
-            pattern_stats = []
-        
-        return jsonify({'success': True, 'data': pattern_stats})
+            return _cached_json_response('pattern_stats:24h', 45, _pattern_stats_payload)
+        # No database available: return empty list (no mock data)
+        return jsonify({'success': True, 'data': []})
         
     except Exception as e:
         logger.error(f"Pattern stats error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _pattern_stats_payload() -> Dict[str, Any]:
+    # Refresh on read when no refresher in this process has run within the interval
+    # (scanner disabled or running in worker.py); a failed refresh serves the view as is
+    try:
+        refresh_pattern_stats_view(Config.PATTERN_STATS_REFRESH_SECONDS)
+    except Exception as e:
+        logger.warning(f"Pattern stats refresh on read failed: {e}")
+    with Session() as session:
+        # Pre-aggregated by refresh_pattern_stats; one row per pattern type
+        stats = session.execute(SELECT_PATTERN_STATS).fetchall()
+
+    pattern_stats = [
+        {
+            'pattern': stat.pattern_type,
+            'count': stat.count,
+            'avg_confidence': float(stat.avg_confidence)
+        }
+        for stat in stats
+    ]
+    return {'success': True, 'data': pattern_stats}
+
 @app.route('/api/detect/enhanced', methods=['POST'])
 @limiter.limit("20 per minute")
 def detect_enhanced_alt():
@@ -3630,7 +4429,7 @@ def explain_pattern(pattern_name):
             return jsonify({'success': False, 'error': 'Pattern not found'}), 404
         
         explanation = pattern_explanations[pattern_key]
-        explanation['timestamp'] = datetime.now().isoformat()
+        explanation['timestamp'] = now_iso()
         
         return jsonify({'success': True, 'data': explanation})
         
@@ -3687,7 +4486,7 @@ def explain_alert():
                 'volume_confirmation': 0.68,
                 'market_alignment': 0.72
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         if alert_details:
@@ -3743,7 +4542,7 @@ def enhance_sentiment_confidence():
                 'enhanced_confidence': enhanced_confidence,
                 'sentiment': sentiment_score.to_dict(),
                 'enhancement_factor': float(enhanced_confidence) - float(base_confidence),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
         })
         
@@ -3847,7 +4646,7 @@ def get_entry_exit_signals():
                         'pnl_percent': pnl_percent,
                         'quantity': abs(position['quantity']),
                         'urgency': 'high' if 'stop loss' in exit_reason.lower() else 'medium',
-                        'timestamp': datetime.now().isoformat(),
+                        'timestamp': now_iso(),
                         'sentiment': sentiment_adv.to_dict()
                     }
                     signals.append(exit_signal)
@@ -3867,7 +4666,7 @@ def get_entry_exit_signals():
                     'sentiment_overall': sentiment_adv.overall_sentiment,
                     'volume': market_data['volume']
                 },
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
         })
         
@@ -3935,7 +4734,7 @@ def generate_entry_exit_signals():
                     'total_signals': sum(len(d['signals']) for d in all_signals.values()),
                     'min_confidence_threshold': min_confidence
                 },
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
         })
     except Exception as e:
@@ -3950,33 +4749,49 @@ def get_active_alerts():
     """Get active alerts"""
     try:
         alerts = alert_service.get_active_alerts()
-        alert_data = []
-        for a in alerts:
-            d = asdict(a)
-            d['confidence_pct'] = round(float(d.get('confidence', 0)) * 100.0, 1)
-            alert_data.append(d)
+        alert_data = [with_confidence_pct(a) for a in alerts]
         return jsonify({'success': True, 'alerts': alert_data})
     except Exception as e:
         logger.error(f"Get alerts error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _dismiss_alerts(ids: List[int]) -> None:
+    """Deactivate alerts in one UPDATE / transaction and tell clients to drop them"""
+    if db_available and ids:
+        with Session() as session:
+            session.execute(DISMISS_ALERTS, {'ids': ids})
+            session.commit()
+    alert_service.invalidate_snapshot()
+    if ids:
+        socketio.emit('alerts_update', {'dismissed': ids, 'timestamp': now_iso()}, to=ALERTS_ROOM)
+
 @app.route('/api/alerts/dismiss/<int:alert_id>', methods=['POST'])
 @limiter.limit("10 per minute")
 def dismiss_alert(alert_id):
     """Dismiss an alert"""
     try:
-        if db_available:
-            with Session() as session:
-                session.execute(text("""
-                    UPDATE alerts SET is_active = false WHERE id = :alert_id
-                """), {'alert_id': alert_id})
-                session.commit()
-        
+        _dismiss_alerts([alert_id])
         return jsonify({'success': True, 'message': 'Alert dismissed'})
     except Exception as e:
         logger.error(f"Dismiss alert error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/alerts/dismiss', methods=['POST'])
+@limiter.limit("10 per minute")
+def dismiss_alerts():
+    """Dismiss several alerts at once: {"ids": [1, 2, ...]}"""
+    try:
+        ids = (request.get_json(silent=True) or {}).get('ids', [])
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return jsonify({'success': False, 'error': 'ids must be a list of integers'}), 400
+        if len(ids) > 1000:
+            return jsonify({'success': False, 'error': 'At most 1000 ids per request'}), 400
+        _dismiss_alerts(ids)
+        return jsonify({'success': True, 'message': f'{len(ids)} alerts dismissed', 'dismissed': len(ids)})
+    except Exception as e:
+        logger.error(f"Dismiss alerts error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/handle_alert_response', methods=['POST'])
 @limiter.limit("20 per minute")
 def handle_alert_response():
@@ -3995,7 +4810,7 @@ def handle_alert_response():
             'alert_id': alert_id,
             'response': response,
             'user_action': user_action,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         if db_available:
@@ -4056,7 +4871,7 @@ def get_latest_detection_id():
         return jsonify({
             'success': True, 
             'latest_detection_id': latest_id,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -4080,6 +4895,7 @@ def log_outcome():
         if not symbol or not pattern or not outcome:
             return jsonify({'success': False, 'error': 'symbol, pattern, and outcome are required'}), 400
         
+        logged_at = datetime.now()
         outcome_data = {
             'symbol': symbol,
             'pattern': pattern,
@@ -4087,21 +4903,16 @@ def log_outcome():
             'pnl': float(pnl),
             'confidence': float(confidence) if confidence else None,
             'trade_duration': int(trade_duration) if trade_duration else None,
-            'logged_at': datetime.now().isoformat()
+            'logged_at': logged_at.isoformat()
         }
         
-        if db_available:
-            with Session() as session:
-                session.execute(text("""
-                    INSERT INTO pattern_detections (symbol, pattern_type, confidence, detected_at, metadata)
-                    VALUES (:symbol, :pattern, :confidence, NOW(), :metadata)
-                """), {
-                    'symbol': symbol,
-                    'pattern': f"{pattern}_outcome",
-                    'confidence': confidence or 0.5,
-                    'metadata': json.dumps(outcome_data)
-                })
-                session.commit()
+        pattern_service.bulk_insert_patterns([{
+            'symbol': symbol,
+            'pattern_type': f"{pattern}_outcome",
+            'confidence': confidence or 0.5,
+            'detected_at': logged_at,
+            'metadata': json_codec.dumps(outcome_data)
+        }])
         
         return jsonify({
             'success': True,
@@ -4130,28 +4941,18 @@ def get_paper_trades():
 def execute_paper_trade():
     """Execute a paper trade"""
     try:
-        data = request.get_json()
-        
-        symbol = data.get('symbol', '').upper()
-        side = data.get('side', '').upper()
-        quantity = float(data.get('quantity', 0))
-        price = data.get('price')
-        pattern = data.get('pattern')
-        confidence = data.get('confidence')
-        
-        if not symbol or not side or quantity <= 0:
-            return jsonify({'success': False, 'error': 'Invalid trade parameters'}), 400
-        
-        if side not in ['BUY', 'SELL']:
-            return jsonify({'success': False, 'error': 'Side must be BUY or SELL'}), 400
+        try:
+            trade = TradeRequest.from_json(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         result = paper_trading_service.execute_trade(
-            symbol=symbol,
-            side=side,
-            quantity=quantity,
-            price=price,
-            pattern=pattern,
-            confidence=confidence
+            symbol=trade.symbol,
+            side=trade.side,
+            quantity=trade.quantity,
+            price=trade.price,
+            pattern=trade.pattern,
+            confidence=trade.confidence
         )
         
         return jsonify(result)
@@ -4165,8 +4966,10 @@ def execute_paper_trade():
 def close_paper_position():
     """Close a paper trading position"""
     try:
-        data = request.get_json()
-        symbol = data.get('symbol', '').upper() if data.get('symbol') else None
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'JSON object body required'}), 400
+        symbol = str(data['symbol']).upper() if data.get('symbol') else None
         trade_id = data.get('trade_id')
         
         if not symbol and not trade_id:
@@ -4180,35 +4983,55 @@ def close_paper_position():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # Backtesting Endpoints
+STRATEGIES = [
+    {
+        'id': 1,
+        'name': 'Golden Cross Strategy',
+        'description': 'Buy when 20-day SMA crosses above 50-day SMA',
+        'type': 'trend_following',
+        'parameters': {'short_period': 20, 'long_period': 50}
+    },
+    {
+        'id': 2,
+        'name': 'RSI Mean Reversion',
+        'description': 'Buy oversold, sell overbought based on RSI',
+        'type': 'mean_reversion',
+        'parameters': {'oversold': 30, 'overbought': 70}
+    },
+    {
+        'id': 3,
+        'name': 'Bollinger Band Breakout',
+        'description': 'Trade breakouts from Bollinger Bands',
+        'type': 'breakout',
+        'parameters': {'period': 20, 'std_dev': 2}
+    }
+]
+# The strategy list never changes at runtime: serialize it once
+_STRATEGIES_BYTES = json_codec.dumps({'success': True, 'data': STRATEGIES}).encode('utf-8')
+_STRATEGIES_ETAG = hashlib.md5(_STRATEGIES_BYTES).hexdigest()
+# Pre-compressed variants, picked by Accept-Encoding
+_STRATEGIES_ENCODED = {'gzip': gzip.compress(_STRATEGIES_BYTES, 6)}
+if brotli is not None:
+    _STRATEGIES_ENCODED['br'] = brotli.compress(_STRATEGIES_BYTES)
+
 @app.route('/api/strategies')
 @limiter.limit("20 per minute")
 def get_strategies():
     """Get available trading strategies"""
     try:
-        strategies = [
-            {
-                'id': 1,
-                'name': 'Golden Cross Strategy',
-                'description': 'Buy when 20-day SMA crosses above 50-day SMA',
-                'type': 'trend_following',
-                'parameters': {'short_period': 20, 'long_period': 50}
-            },
-            {
-                'id': 2,
-                'name': 'RSI Mean Reversion',
-                'description': 'Buy oversold, sell overbought based on RSI',
-                'type': 'mean_reversion',
-                'parameters': {'oversold': 30, 'overbought': 70}
-            },
-            {
-                'id': 3,
-                'name': 'Bollinger Band Breakout',
-                'description': 'Trade breakouts from Bollinger Bands',
-                'type': 'breakout',
-                'parameters': {'period': 20, 'std_dev': 2}
-            }
-        ]
-        return jsonify({'success': True, 'data': strategies})
+        encoding = request.accept_encodings.best_match(list(_STRATEGIES_ENCODED))
+        if encoding:
+            response = Response(_STRATEGIES_ENCODED[encoding], mimetype='application/json')
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{_STRATEGIES_ETAG}-{encoding}")
+        else:
+            response = Response(_STRATEGIES_BYTES, mimetype='application/json')
+            response.set_etag(_STRATEGIES_ETAG)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        # Answers If-None-Match with an empty 304
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Get strategies error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -4236,8 +5059,10 @@ def run_backtest():
         # Strategy definitions
         if strategy_id == 1:
             # Golden Cross 20/50 SMA
-            df['SMA20'] = df['Close'].rolling(20).mean()
-            df['SMA50'] = df['Close'].rolling(50).mean()
+            # ravel: yf.download can return Close as a one-column frame
+            close = df['Close'].to_numpy(dtype=np.float64).ravel()
+            df['SMA20'] = rolling_mean(close, 20)
+            df['SMA50'] = rolling_mean(close, 50)
             df['Signal'] = (df['SMA20'] > df['SMA50']).astype(int)
             df['Cross'] = df['Signal'].diff().fillna(0)
         elif strategy_id == 2:
@@ -4317,16 +5142,9 @@ def run_backtest():
         if strategy_id == 1:
             pos_series = (df['Signal'] > 0).astype(int).shift(1).fillna(0)
         else:
-            pos = 0
-            pos_vals = []
-            for _, r in df.iterrows():
-                s = int(r['Signal'])
-                if s == 1:
-                    pos = 1
-                elif s == -1:
-                    pos = 0
-                pos_vals.append(pos)
-            pos_series = pd.Series(pos_vals, index=df.index).shift(1).fillna(0)
+            # Entry (1) / exit (-1) signals hold their state until the next signal
+            held = df['Signal'].where(df['Signal'] != 0).replace(-1, 0).ffill().fillna(0)
+            pos_series = held.shift(1).fillna(0)
 
         strat_daily = (pos_series * df['Return']).fillna(0)
         avg = strat_daily.mean()
@@ -4352,7 +5170,7 @@ def run_backtest():
             'profitable_trades': profitable,
             'avg_trade_return': round(float(np.mean(pnl_list)) if pnl_list else 0.0, 2),
             'volatility': round(float(std) * (252 ** 0.5) * 100 if std else 0.0, 2),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso(),
             'trades': trades
         }
 
@@ -4508,7 +5326,7 @@ def backtest_pattern():
             'volatility': round(statistics.stdev(returns_list), 2) if len(returns_list) > 1 else 0,
             'final_equity': round(equity_curve[-1], 2),
             'trades': trades[:10],  # Return first 10 trades
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso(),
             'data_source': 'real_historical_yfinance'
         }
         
@@ -4611,7 +5429,7 @@ def backtest_strategy():
                 'total_pnl': round(total_profit + total_loss, 2)
             },
             'sample_trades': portfolio_trades[:50],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
 
         return jsonify({'success': True, 'data': results})
@@ -4625,33 +5443,35 @@ def backtest_strategy():
 def analytics_summary():
     """Get analytics summary"""
     try:
-        # Generate real-time analytics based on current market data
-        symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA']
-        total_patterns = 0
-        total_alerts = len(alert_service.get_active_alerts())
-        
-        for symbol in symbols:
-            patterns = pattern_service.detect_patterns(symbol)
-            total_patterns += len(patterns)
-        
-        summary = {
-            'total_patterns_detected': total_patterns,
-            'active_alerts': total_alerts,
-            'market_sentiment': 'bullish' if total_patterns > 5 else 'neutral',
-            'top_performing_patterns': [
-                {'name': 'Golden Cross', 'success_rate': 78.5},
-                {'name': 'RSI Oversold', 'success_rate': 65.2},
-                {'name': 'Bollinger Breakout', 'success_rate': 71.8}
-            ],
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        return jsonify({'success': True, 'data': summary})
+        return _cached_json_response('analytics:summary:v1', 30, _analytics_summary_payload)
         
     except Exception as e:
         logger.error(f"Analytics summary error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _analytics_summary_payload() -> Dict[str, Any]:
+    # Generate real-time analytics based on current market data
+    symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA']
+    total_alerts = len(alert_service.get_active_alerts())
+    
+    # One batched history fetch instead of a detect_patterns call per symbol
+    results = pattern_service.detect_patterns_bulk(symbols)
+    total_patterns = sum(len(v) for v in results.values())
+    
+    summary = {
+        'total_patterns_detected': total_patterns,
+        'active_alerts': total_alerts,
+        'market_sentiment': 'bullish' if total_patterns > 5 else 'neutral',
+        'top_performing_patterns': [
+            {'name': 'Golden Cross', 'success_rate': 78.5},
+            {'name': 'RSI Oversold', 'success_rate': 65.2},
+            {'name': 'Bollinger Breakout', 'success_rate': 71.8}
+        ],
+        'timestamp': now_iso()
+    }
+    
+    return {'success': True, 'data': summary}
+
 @app.route('/api/trading-stats')
 @limiter.limit("20 per minute")
 def get_trading_stats():
@@ -4724,7 +5544,7 @@ def get_trading_stats():
                 ]
             }
         
-        stats['timestamp'] = datetime.now().isoformat()
+        stats['timestamp'] = now_iso()
         return jsonify({'success': True, 'data': stats})
         
     except Exception as e:
@@ -4796,7 +5616,7 @@ def get_detection_stats():
                 ]
             }
         
-        stats['timestamp'] = datetime.now().isoformat()
+        stats['timestamp'] = now_iso()
         return jsonify({'success': True, 'data': stats})
         
     except Exception as e:
@@ -5089,7 +5909,7 @@ def get_complete_recommendation():
             'stop_loss': stop_loss_price if action == 'BUY' else take_profit_price,
             'position_size': min(risk_amount / abs(current_price - stop_loss_price), risk_settings['max_position_size']),
             'risk_reward_ratio': risk_settings['take_profit_percentage'] / risk_settings['stop_loss_percentage'],
-            'patterns_detected': [asdict(p) for p in patterns_list],
+            'patterns_detected': [p.to_dict() for p in patterns_list],
             'sentiment': {
                 'score': sentiment_score,
                 'label': 'Positive' if sentiment_score > 0.1 else 'Negative' if sentiment_score < -0.1 else 'Neutral'
@@ -5099,7 +5919,7 @@ def get_complete_recommendation():
                 'max_gain': risk_amount * (risk_settings['take_profit_percentage'] / risk_settings['stop_loss_percentage']),
                 'probability_success': combined_score
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         return jsonify({'success': True, 'data': recommendation})
@@ -5327,12 +6147,15 @@ def handle_disconnect():
 @socketio.on('subscribe_alerts')
 def handle_subscribe_alerts():
     """Subscribe client to alert notifications"""
+    join_room(ALERTS_ROOM)
     logger.info(f"Client {request.sid} subscribed to alerts")
     emit('subscription_status', {'type': 'alerts', 'status': 'subscribed'})
 
 @socketio.on('subscribe_scan_results')
+@socketio.on('subscribe_market_scan')  # name emitted by the existing frontend
 def handle_subscribe_scan_results():
-    """Subscribe client to scan result notifications"""
+    """Subscribe client to scan result notifications (scan_tick, market_scan_update, scan_update)"""
+    join_room(SCAN_RESULTS_ROOM)
     logger.info(f"Client {request.sid} subscribed to scan results")
     emit('subscription_status', {'type': 'scan_results', 'status': 'subscribed'})
 
@@ -5370,13 +6193,11 @@ def pre_trade_check():
         if hist_d is None or hist_d.empty:
             return jsonify({'success': False, 'error': 'No market data'}), 404
 
-        latest_row = hist_d.iloc[-1]
-        current_price = float(latest_row['Close'])
+        current_price = float(hist_d['Close'].iat[-1])
 
         # ATR (14)
         try:
-            atr_ind = ta.volatility.AverageTrueRange(high=hist_d['High'], low=hist_d['Low'], close=hist_d['Close'], window=14)
-            atr = float(atr_ind.average_true_range().iloc[-1])
+            atr = frame_atr_last(hist_d, 14)
         except Exception:
             atr = None
 
@@ -5501,7 +6322,7 @@ def pre_trade_check():
             'warnings': warnings,
             'recommendation_level': level,
             'risk_confirmation_token': token,
-            'timestamp_eat': to_eat_iso(datetime.now())
+            'timestamp_eat': eat_now_iso()
         }})
     except Exception as e:
         logger.error(f"Pre-trade check error: {e}")
@@ -5761,7 +6582,7 @@ def ml_learning_status():
                         metrics = row.metrics if isinstance(row.metrics, dict) else {}
                         accuracy = metrics.get('accuracy', 0)
                         recent_updates.append({
-                            'timestamp': row.created_at.isoformat() if row.created_at else datetime.utcnow().isoformat(),
+                            'timestamp': row.created_at.isoformat() if row.created_at else utcnow_iso(),
                             'model': row.model_namespace or 'Unknown',
                             'metric': 'accuracy',
                             'old_value': 0,
@@ -5864,7 +6685,7 @@ def model_performance():
                             'name': model_row.model_namespace or 'Unknown Model',
                             'version': model_row.version_tag or 'v1.0',
                             'status': 'active',
-                            'last_updated': model_row.created_at.isoformat() if model_row.created_at else datetime.utcnow().isoformat(),
+                            'last_updated': model_row.created_at.isoformat() if model_row.created_at else utcnow_iso(),
                             'metrics': {
                                 'accuracy': float(model_metrics.get('accuracy', 0)),
                                 'precision': float(model_metrics.get('precision', 0)),
@@ -5883,7 +6704,7 @@ def model_performance():
                 'name': 'Pattern Detector',
                 'version': 'v1.0',
                 'status': 'active',
-                'last_updated': datetime.utcnow().isoformat(),
+                'last_updated': utcnow_iso(),
                 'metrics': {'accuracy': 0, 'precision': 0, 'recall': 0, 'f1_score': 0},
                 'accuracy_history': [],
                 'recent_predictions': []
@@ -5893,7 +6714,7 @@ def model_performance():
             'success': True,
             'data': {
                 'models': models,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': utcnow_iso()
             }
         })
         
@@ -6127,7 +6948,7 @@ def predictive_forecast():
         return jsonify({
             'success': True,
             'data': forecast,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -6285,7 +7106,7 @@ def get_achievements():
         return jsonify({
             'success': True,
             'data': achievements,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -6374,7 +7195,7 @@ def get_streak():
         return jsonify({
             'success': True,
             'data': streak_data,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -6439,7 +7260,7 @@ def user_preferences():
                 return jsonify({
                     'success': True,
                     'preferences': preferences,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso()
                 })
         
         else:  # POST
@@ -6473,7 +7294,7 @@ def user_preferences():
             return jsonify({
                 'success': True,
                 'message': 'Preferences updated successfully',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
     
     except Exception as e:
@@ -6559,7 +7380,7 @@ def manage_watchlists():
                     'success': True,
                     'watchlists': watchlists,
                     'count': len(watchlists),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso()
                 })
         
         else:  # POST - Create new watchlist
@@ -6587,7 +7408,7 @@ def manage_watchlists():
                 'success': True,
                 'watchlist_id': watchlist_id,
                 'message': f'Watchlist "{name}" created successfully',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
     
     except Exception as e:
@@ -6724,7 +7545,7 @@ def smart_watchlist_recommendations():
                 'profitable_trades': len(profitable_symbols),
                 'analysis_type': 'correlation_and_momentum'
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     
     except Exception as e:
@@ -6794,7 +7615,7 @@ def get_journal():
                 'success': True,
                 'entries': entries,
                 'count': len(entries),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
     
     except Exception as e:
@@ -6845,7 +7666,7 @@ def add_journal_entry():
             'success': True,
             'entry_id': entry_id,
             'ai_insight': ai_insight,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     
     except Exception as e:
@@ -6930,13 +7751,13 @@ def community_feed():
                     'message': f"{stats_row[1]} traders made money today",
                     'total_trades': stats_row[0],
                     'win_rate': (stats_row[1] / stats_row[0] * 100) if stats_row[0] > 0 else 0,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso()
                 })
         
         return jsonify({
             'success': True,
             'feed': wins[:15],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     
     except Exception as e:
@@ -6975,7 +7796,7 @@ def community_stats():
         return jsonify({
             'success': True,
             'stats': stats,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     
     except Exception as e:
@@ -7012,7 +7833,7 @@ def notification_settings():
             return jsonify({
                 'success': True,
                 'settings': settings,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
         
         else:  # POST
@@ -7153,7 +7974,7 @@ def timemachine_date(date):
             'date': date,
             'patterns_detected': patterns[:10],
             'summary': summary,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     
     except Exception as e:
@@ -7647,10 +8468,11 @@ def world_class_market_scan():
 def handle_portfolio_subscription():
     """Subscribe to real-time portfolio updates"""
     try:
+        join_room(PORTFOLIO_ROOM)
         logger.info("Client subscribed to portfolio updates")
         emit('subscription_status', {
             'portfolio': True,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     except Exception as e:
         logger.error(f"Portfolio subscription error: {e}")
@@ -7659,17 +8481,18 @@ def handle_portfolio_subscription():
 def handle_positions_subscription():
     """Subscribe to real-time position updates"""
     try:
+        join_room(POSITIONS_ROOM)
         logger.info("Client subscribed to position updates")
         emit('subscription_status', {
             'positions': True,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
     except Exception as e:
         logger.error(f"Positions subscription error: {e}")
 
 # Helper function to emit portfolio updates (call this when portfolio changes)
 def emit_portfolio_update():
-    """Emit real-time portfolio update to all connected clients"""
+    """Emit real-time portfolio update to portfolio subscribers"""
     try:
         # Get current portfolio data
         with get_db_session() as session:
@@ -7755,14 +8578,14 @@ def emit_portfolio_update():
             today_row = today_result.fetchone()
             today_pnl_pct = (today_row[0] * 100) if today_row[0] else 0
         
-        # Emit to all connected clients
+        # Emit to portfolio subscribers
         socketio.emit('portfolio_update', {
             'total_value': total_value,
             'today_pnl_pct': today_pnl_pct,
             'positions_count': len(positions),
             'positions': positions,
-            'timestamp': datetime.now().isoformat()
-        })
+            'timestamp': now_iso()
+        }, to=PORTFOLIO_ROOM)
         
     except Exception as e:
         logger.error(f"Portfolio update emit error: {e}")
@@ -7776,8 +8599,8 @@ def emit_trade_executed(trade_data):
             'side': trade_data.get('side'),
             'quantity': trade_data.get('quantity'),
             'price': trade_data.get('price'),
-            'timestamp': datetime.now().isoformat()
-        })
+            'timestamp': now_iso()
+        }, to=[PORTFOLIO_ROOM, POSITIONS_ROOM])
     except Exception as e:
         logger.error(f"Trade executed emit error: {e}")
 
@@ -7813,7 +8636,7 @@ def get_detection_modes():
         return jsonify({
             'success': True,
             'data': modes_info,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -7890,7 +8713,7 @@ def detect_patterns_dual_mode():
                 'timeframe': timeframe,
                 'patterns': formatted_results,
                 'count': len(formatted_results),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
         })
         
@@ -7998,7 +8821,7 @@ def get_mode_info(mode: str):
         return jsonify({
             'success': True,
             'data': mode_info,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -8049,7 +8872,7 @@ def set_user_detection_mode():
                 'mode': mode.value,
                 'message': f'Detection mode set to {mode.value}'
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -8112,7 +8935,7 @@ def analyze_asset_correlations():
         return jsonify({
             'success': True,
             'data': result,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -8152,7 +8975,7 @@ def analyze_order_flow(symbol: str):
         return jsonify({
             'success': True,
             'data': result,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -8192,7 +9015,7 @@ def analyze_market_microstructure(symbol: str):
         return jsonify({
             'success': True,
             'data': result,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -8232,7 +9055,7 @@ def detect_market_regime(symbol: str):
         return jsonify({
             'success': True,
             'data': result,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -8269,7 +9092,7 @@ def comprehensive_analysis(symbol: str):
                 'analysis_type': 'comprehensive_raw_data_analysis',
                 'competitive_advantage': 'TX processes raw OHLCV data with institutional-grade analysis'
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -1,5 +1,6 @@
 import time
 import random
+import threading
 from typing import Callable, Optional, Type, Tuple
 
 import httpx
@@ -44,6 +45,46 @@ class CircuitBreaker:
             self._opened_at = time.time()
 
 
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+    - refills at `rate` tokens per second up to `capacity`
+    - callers only wait when the bucket is empty
+    - a rate <= 0 disables limiting
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take one token and return the seconds to wait before using it.
+        Returns None (nothing taken) if the wait would exceed `max_wait`.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            # May go negative: later callers queue behind the tokens already promised
+            self._tokens -= 1.0
+            return wait
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Block until a token is available; False if that would take longer than `max_wait`"""
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
 def retry_with_jitter(
     func: Callable[[], any],
     retries: int = 3,
@@ -0,0 +1,83 @@
+"""
+JSON encoding for Flask responses and Socket.IO packets.
+
+Uses orjson (C implementation) when installed and falls back to the
+standard library otherwise. Datetimes are passed through to Flask's
+default handler so the wire format matches stdlib jsonify; NumPy
+scalars and arrays are encoded natively instead of raising TypeError.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _BASE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+    _BASE_OPTIONS = 0
+
+# Keyword arguments orjson output already satisfies (compact separators)
+_COMPATIBLE_KWARGS = {'separators'}
+
+
+def _fallback_default(obj: Any) -> Any:
+    # Only reached by orjson for non-contiguous/unsupported arrays, always by stdlib json
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return DefaultJSONProvider.default(obj)
+
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """json.dumps-compatible encoder used for Socket.IO packets"""
+    if not ORJSON_AVAILABLE or set(kwargs) - _COMPATIBLE_KWARGS:
+        kwargs.setdefault('default', _fallback_default)
+        return json.dumps(obj, **kwargs)
+    return orjson.dumps(obj, default=_fallback_default, option=_BASE_OPTIONS).decode('utf-8')
+
+
+def loads(s: Any, **kwargs: Any) -> Any:
+    """json.loads-compatible decoder used for Socket.IO packets"""
+    if not ORJSON_AVAILABLE or kwargs:
+        return json.loads(s, **kwargs)
+    return orjson.loads(s)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson when available"""
+
+    default = staticmethod(_fallback_default)
+
+    def _options(self, pretty: bool = False) -> int:
+        option = _BASE_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not ORJSON_AVAILABLE or set(kwargs) - _COMPATIBLE_KWARGS:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if not ORJSON_AVAILABLE or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(pretty) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,151 @@
+"""
+Async provider quotes for market scans.
+
+Fans Finnhub/Polygon quote requests for a whole scan batch out on one
+asyncio event loop with a shared httpx.AsyncClient connection pool, instead
+of holding a pool thread per in-flight request. The loop runs in its own
+daemon thread so Flask and the scanner stay synchronous; callers block on
+fetch_quotes() for the batch. Enabled with ASYNC_PROVIDERS=true.
+
+Responses are parsed by services/provider_quotes, the same functions
+MarketDataService._finnhub_quote / _polygon_latest_minute use, so the same
+quote builders apply to both paths.
+
+The loop needs a real OS thread: under gevent/eventlet monkey patching the
+thread becomes a greenlet and the loop would block the hub, so the web app
+only creates the fetcher in 'threading' mode (see MarketDataService).
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from services.http_resilience import TokenBucket
+from services.provider_quotes import finnhub_quote_from_json, polygon_quote_from_agg, polygon_results
+
+logger = logging.getLogger(__name__)
+
+FINNHUB_QUOTE_URL = 'https://finnhub.io/api/v1/quote'
+POLYGON_BASE_URL = 'https://api.polygon.io'
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0).isoformat()
+
+
+class AsyncQuoteFetcher:
+    """Batch quote fetcher running on a private event loop thread"""
+
+    def __init__(self, finnhub_key: Optional[str], polygon_key: Optional[str],
+                 provider_limits: Dict[str, int], rate_limits: Optional[Dict[str, TokenBucket]] = None,
+                 rate_limit_max_wait: float = 2.0, max_connections: int = 64):
+        self.finnhub_key = finnhub_key
+        self.polygon_key = polygon_key
+        self._provider_limits = provider_limits
+        # Buckets are shared with the synchronous MarketDataService paths
+        self._rate_limits = rate_limits or {}
+        self._rate_limit_max_wait = rate_limit_max_wait
+        self._max_connections = max_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='async-quotes', daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    async def _setup(self) -> None:
+        # Client and semaphores must be created on the loop that uses them
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self._max_connections, max_keepalive_connections=16)
+            self._client = httpx.AsyncClient(limits=limits, timeout=8.0)
+            self._slots = {name: asyncio.Semaphore(limit) for name, limit in self._provider_limits.items()}
+
+    async def _get_json(self, provider: str, url: str, params: Dict[str, Any]) -> Any:
+        bucket = self._rate_limits.get(provider)
+        if bucket is not None:
+            wait = bucket.reserve(self._rate_limit_max_wait)
+            if wait is None:
+                raise Exception('Too Many Requests')
+            if wait > 0:
+                await asyncio.sleep(wait)
+        async with self._slots[provider]:
+            r = await self._client.get(url, params=params)
+        if r.status_code == 429:
+            raise Exception('Too Many Requests')
+        r.raise_for_status()
+        return r.json()
+
+    async def _finnhub_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        try:
+            j = await self._get_json('finnhub', FINNHUB_QUOTE_URL,
+                                     {'symbol': symbol.upper(), 'token': self.finnhub_key})
+            return finnhub_quote_from_json(j, _utc_timestamp())
+        except Exception as e:
+            logger.debug(f"Async Finnhub quote failed for {symbol}: {e}")
+            return None
+
+    async def _polygon_latest_minute(self, poly_ticker: str) -> Optional[Dict[str, Any]]:
+        try:
+            today = datetime.now(timezone.utc).date()
+            j = await self._get_json('polygon', f"{POLYGON_BASE_URL}/v2/aggs/ticker/{poly_ticker}/range/1/minute/{today}/{today}",
+                                     {'adjusted': 'true', 'sort': 'asc', 'limit': 50000, 'apiKey': self.polygon_key})
+            results = polygon_results(j)
+            if not results:
+                # fallback to previous close
+                pj = await self._get_json('polygon', f"{POLYGON_BASE_URL}/v2/aggs/ticker/{poly_ticker}/prev",
+                                          {'adjusted': 'true', 'apiKey': self.polygon_key})
+                results = polygon_results(pj)
+                if not results:
+                    return None
+                agg = results[0]
+            else:
+                agg = results[-1]
+            return polygon_quote_from_agg(agg, _utc_timestamp())
+        except Exception as e:
+            logger.debug(f"Async Polygon latest minute failed for {poly_ticker}: {e}")
+            return None
+
+    async def _quote(self, symbol: str, use_finnhub: bool,
+                     poly_ticker: Optional[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        # Same provider order as MarketDataService.get_stock_data
+        if use_finnhub and self.finnhub_key:
+            q = await self._finnhub_quote(symbol)
+            if q:
+                return 'finnhub', q
+        if poly_ticker and self.polygon_key:
+            poly = await self._polygon_latest_minute(poly_ticker)
+            if poly:
+                return 'polygon', poly
+        return None
+
+    async def _gather(self, plans: List[Tuple[str, bool, Optional[str]]]) -> List[Any]:
+        await self._setup()
+        return await asyncio.gather(*(self._quote(*plan) for plan in plans))
+
+    def fetch_quotes(self, symbols: List[str], is_stock: Callable[[str], bool],
+                     to_polygon_ticker: Callable[[str], Optional[str]],
+                     timeout: float = 30.0) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Fetch provider quotes for all symbols concurrently.
+        Returns {symbol: (provider, payload)}; symbols no provider answered for are omitted.
+        """
+        if not symbols:
+            return {}
+        plans = [(s, is_stock(s), to_polygon_ticker(s)) for s in symbols]
+        future = asyncio.run_coroutine_threadsafe(self._gather(plans), self._ensure_loop())
+        try:
+            results = future.result(timeout)
+        except Exception as e:
+            future.cancel()
+            logger.warning(f"Async quote batch failed: {e}")
+            return {}
+        return {s: r for s, r in zip(symbols, results) if r}
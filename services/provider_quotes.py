@@ -0,0 +1,40 @@
+"""
+Provider quote parsing shared by the synchronous MarketDataService and the
+async batch fetcher (services/market_data_async.py).
+
+Pure functions from decoded provider JSON to the quote payload the quote
+builders consume, so both transport paths stay in step.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def finnhub_quote_from_json(j: Optional[Dict[str, Any]], timestamp: str) -> Optional[Dict[str, Any]]:
+    """Quote payload from a Finnhub /quote response; None when it carries no price"""
+    if not j or j.get('c') in (None, 0):
+        return None
+    return {
+        'price': float(j.get('c', 0.0)),
+        'open': float(j.get('o', 0.0) or 0.0),
+        'high': float(j.get('h', 0.0) or 0.0),
+        'low': float(j.get('l', 0.0) or 0.0),
+        'prev_close': float(j.get('pc', 0.0) or 0.0),
+        'timestamp': timestamp
+    }
+
+
+def polygon_results(j: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The `results` list of a Polygon aggregates response (empty when missing)"""
+    return (j or {}).get('results') or []
+
+
+def polygon_quote_from_agg(agg: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+    """Quote payload from one Polygon aggregate bar (latest minute or previous close)"""
+    return {
+        'price': float(agg.get('c', 0.0)),
+        'open': float(agg.get('o', 0.0)),
+        'high': float(agg.get('h', 0.0)),
+        'low': float(agg.get('l', 0.0)),
+        'volume': int(agg.get('v', 0) or 0),
+        'timestamp': timestamp
+    }
@@ -7,10 +7,24 @@ import logging
 import requests
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from textblob import TextBlob
 import yfinance as yf
 import os
 
+# Headline polarity: VADER's lexicon lookup is ~10x cheaper than TextBlob's pattern analyzer
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    _vader = SentimentIntensityAnalyzer()
+
+    def score_text(text: str) -> float:
+        """Polarity in [-1, 1] (VADER compound score)"""
+        return _vader.polarity_scores(text)['compound']
+except ImportError:
+    from textblob import TextBlob
+
+    def score_text(text: str) -> float:
+        """Polarity in [-1, 1] (TextBlob fallback)"""
+        return TextBlob(text).sentiment.polarity
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,9 +183,7 @@ class RealtimeSentimentService:
                 text = f"{title}. {summary}"
                 
                 if text.strip():
-                    blob = TextBlob(text)
-                    sentiment = blob.sentiment.polarity  # -1 to 1
-                    sentiments.append(sentiment)
+                    sentiments.append(score_text(text))  # -1 to 1
                     sources.append(article.get('source', 'Unknown'))
             
             # Calculate average sentiment
@@ -0,0 +1,76 @@
+"""
+Short-lived cache for serialized API responses.
+
+Shared through Redis when REDIS_URL is configured, so every worker serves
+the same cached payload; otherwise (or while Redis is unreachable) an
+in-process TTL map is used.
+"""
+
+import os
+import time
+import logging
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Key -> bytes cache with per-entry TTL"""
+
+    # Seconds to stop trying Redis after a connection error
+    REDIS_RETRY_AFTER = 30.0
+    # Prune expired local entries once the map grows past this size
+    LOCAL_PRUNE_SIZE = 256
+
+    def __init__(self, url: Optional[str] = None, prefix: str = 'tx:resp:'):
+        self.prefix = prefix
+        self._local: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+        if url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+            except Exception as e:
+                logger.warning(f"Response cache: Redis unavailable ({e}); using in-process cache")
+
+    def _redis_usable(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.REDIS_RETRY_AFTER
+        logger.debug(f"Response cache: Redis error ({e}); falling back for {self.REDIS_RETRY_AFTER:.0f}s")
+
+    def get(self, key: str) -> Optional[bytes]:
+        if self._redis_usable():
+            try:
+                return self._redis.get(self.prefix + key)
+            except Exception as e:
+                self._redis_failed(e)
+        entry = self._local.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        if self._redis_usable():
+            try:
+                self._redis.setex(self.prefix + key, ttl, value)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        now = time.monotonic()
+        with self._lock:
+            self._local[key] = (now + ttl, value)
+            if len(self._local) > self.LOCAL_PRUNE_SIZE:
+                self._local = {k: v for k, v in self._local.items() if v[0] > now}
+
+
+# Global response cache
+response_cache = ResponseCache(os.getenv('REDIS_URL'))
@@ -0,0 +1,65 @@
+"""
+Tests for the in-memory paper trading portfolio
+"""
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import PaperTradingService, TradeRequest
+
+
+class FixedPriceMarketData:
+    """Market data source that always quotes the same price"""
+
+    def __init__(self, price):
+        self.price = price
+
+    def get_stock_data(self, symbol, period='1d'):
+        return {'symbol': symbol, 'price': self.price}
+
+
+@pytest.fixture
+def service():
+    """Create a paper trading service with a fixed quote"""
+    return PaperTradingService(FixedPriceMarketData(110.0))
+
+
+def test_portfolio_totals(service, monkeypatch):
+    """Test portfolio aggregates over in-memory positions"""
+    monkeypatch.setattr('main.db_available', False)
+    service.execute_trade('AAPL', 'BUY', 10, price=100.0)
+    service.execute_trade('MSFT', 'SELL', 5, price=200.0)
+
+    portfolio = service.get_portfolio()
+    assert portfolio['positions']['AAPL']['quantity'] == 10
+    assert portfolio['positions']['MSFT']['quantity'] == -5
+    assert portfolio['total_value'] == pytest.approx(10 * 100.0 + 5 * 200.0)
+
+
+def test_close_position_removes_row(service, monkeypatch):
+    """Test closing a position computes PnL and keeps other rows intact"""
+    monkeypatch.setattr('main.db_available', False)
+    service.execute_trade('AAPL', 'BUY', 10, price=100.0)
+    service.execute_trade('MSFT', 'BUY', 2, price=50.0)
+
+    result = service.close_position(symbol='AAPL')
+    assert result['success'] is True
+    assert result['pnl'] == pytest.approx(100.0)
+
+    positions = service.get_portfolio()['positions']
+    assert list(positions) == ['MSFT']
+    assert positions['MSFT']['avg_entry'] == 50.0
+
+
+def test_trade_request_validation():
+    """Test trade bodies are normalized and rejected with a client message"""
+    trade = TradeRequest.from_json({'symbol': ' aapl', 'side': 'buy', 'quantity': '3', 'price': 101})
+    assert (trade.symbol, trade.side, trade.quantity, trade.price) == ('AAPL', 'BUY', 3.0, 101.0)
+
+    with pytest.raises(ValueError, match='Side must be BUY or SELL'):
+        TradeRequest.from_json({'symbol': 'AAPL', 'side': 'HOLD', 'quantity': 1})
+    with pytest.raises(ValueError, match='Invalid trade parameters'):
+        TradeRequest.from_json({'symbol': 'AAPL', 'side': 'BUY', 'quantity': 'ten'})
@@ -0,0 +1,73 @@
+"""
+Tests for the compiled indicator kernels and streaming indicator state used by pattern detection
+"""
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import ta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from detectors._pattern_njit import rolling_mean, atr_last
+from detectors._indicator_state import sync_state
+
+
+def _closes():
+    rng = np.random.default_rng(7)
+    return pd.Series(100 + np.cumsum(rng.normal(size=120)))
+
+
+def _ohlcv(close):
+    high, low = close + 1.5, close - 1.5
+    volume = np.linspace(1000.0, 2000.0, close.shape[0])
+    return np.column_stack([close, high, low, close, volume])
+
+
+def test_kernels_match_ta():
+    """Test SMA and final Wilder ATR kernels reproduce the pandas and ta values"""
+    close = _closes()
+    arr = close.to_numpy(dtype=np.float64)
+    high, low = close + 1.5, close - 1.5
+    atr = ta.volatility.AverageTrueRange(high, low, close, 14).average_true_range()
+
+    assert np.allclose(rolling_mean(arr, 20), close.rolling(20).mean(), equal_nan=True)
+    assert np.isclose(atr_last(high.to_numpy(), low.to_numpy(), arr, 14), atr.iloc[-1])
+
+
+def test_indicator_state_matches_ta():
+    """Test the streaming indicator state reproduces the ta/pandas values on the last bar"""
+    series = _closes()
+    close = series.to_numpy()
+    ohlcv = _ohlcv(close)
+    index = np.arange(close.shape[0])
+
+    # Bootstrap one bar short, then advance by one closed bar
+    state = sync_state(None, ohlcv[:-1], index[:-1])
+    state = sync_state(state, ohlcv, index)
+    assert state.key == index[-2]
+    ind = state.live(ohlcv[-1, 1], ohlcv[-1, 2], close[-1], ohlcv[-1, 4])
+    atr = ta.volatility.AverageTrueRange(series + 1.5, series - 1.5, series, 14).average_true_range()
+
+    assert np.isclose(ind['sma_fast'], series.rolling(20).mean().iloc[-1])
+    assert np.isclose(ind['sma_slow_prev'], series.rolling(50).mean().iloc[-2])
+    assert np.isclose(ind['rsi'], ta.momentum.RSIIndicator(series).rsi().iloc[-1])
+    assert np.isclose(ind['bb_upper'], ta.volatility.BollingerBands(series).bollinger_hband().iloc[-1])
+    assert np.isclose(ind['atr'], atr.iloc[-1])
+    assert np.isclose(ind['vol_ma'], ohlcv[-20:, 4].mean())
+
+
+def test_indicator_state_rebuilds_on_revised_bars():
+    """Test a refetch with adjusted closes under the same labels does not reuse the old state"""
+    close = _closes().to_numpy()
+    index = np.arange(close.shape[0])
+    state = sync_state(None, _ohlcv(close), index)
+
+    adjusted = _ohlcv(close / 2.0)
+    rebuilt = sync_state(state, adjusted, index)
+    assert rebuilt is not state
+    assert sync_state(rebuilt, adjusted, index) is rebuilt
+    ind = rebuilt.live(adjusted[-1, 1], adjusted[-1, 2], adjusted[-1, 3], adjusted[-1, 4])
+    assert np.isclose(ind['sma_fast'], adjusted[-20:, 3].mean())
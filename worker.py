@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Standalone market scanner process.
+
+Runs the background scanner outside the web workers and publishes its
+Socket.IO events through the Redis message queue, so one process calls
+the market data providers and every web worker forwards the events to
+its connected clients.
+
+Usage: set RUN_SCANNER=false on the web service and run `python worker.py`
+with SOCKETIO_MESSAGE_QUEUE pointing at the same Redis on both.
+"""
+import os
+import sys
+import threading
+
+# Importing main must not start a second scanner thread
+os.environ['RUN_SCANNER'] = 'false'
+
+from flask_socketio import SocketIO
+
+import main
+
+
+def run():
+    queue = main.Config.SOCKETIO_MESSAGE_QUEUE
+    if not queue:
+        sys.stderr.write("SOCKETIO_MESSAGE_QUEUE is required to publish scanner events\n")
+        sys.exit(1)
+
+    # Write-only Socket.IO instance: emits go to the queue, web workers deliver them
+    emitter = SocketIO(message_queue=queue)
+    threading.Thread(target=main.refresh_pattern_stats, daemon=True).start()
+    main.logger.info("Standalone market scanner started")
+    main.background_scanner(emitter)
+
+
+if __name__ == '__main__':
+    run()